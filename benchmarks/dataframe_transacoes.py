@@ -0,0 +1,125 @@
+"""
+Benchmark de ledger.criar_dataframe_transacoes contra a montagem linha a linha
+anterior (criar_dataframe_linha_a_linha, mantida aqui como referência; os
+testes a usam para conferir a equivalência das saídas).
+
+Uso (na raiz do repositório): python -m benchmarks.dataframe_transacoes [--completo]
+Sem --completo a versão linha a linha não é medida com 1.000.000 de linhas
+(leva cerca de 20 s).
+"""
+import calendar
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from tripledger import moeda
+from tripledger.ledger import criar_dataframe_transacoes
+
+PERFIS = ["Café da Manhã", "Almoço", "Janta", "Outros Serviços", "Saída de Caixa", "Entrada de Caixa"]
+TAMANHOS = [10_000, 100_000, 1_000_000]
+
+# Montagem anterior, uma linha por vez (antes das operações colunares)
+def criar_dataframe_linha_a_linha(transacoes):
+    df_data = []
+    for t in transacoes:
+        valor_centavos = t.get('valor_centavos') or 0
+        valor_num = moeda.centavos_para_reais(valor_centavos)
+        valor_display = f"{valor_num:.2f}"
+        perfil_display = t.get('perfil', '-')
+        descricao_display = t.get('descricao', '-')
+        data_display = t.get('data', '-')
+        id_transacao = t.get('id_transacao', '')
+        caminho_foto = t.get('caminho_foto', '')
+        # Tenta converter a data para formato brasileiro se possível
+        try:
+            if len(data_display) >= 10:
+                if data_display[4] == '-':
+                    data_obj = datetime.strptime(data_display[:10], '%Y-%m-%d')
+                    hora_parte = data_display[10:19] if len(data_display) > 10 else ""
+                    data_display = data_obj.strftime('%d/%m/%Y') + hora_parte
+        except:
+            pass
+        simbolo = "+" if perfil_display == "Entrada de Caixa" else "-"
+        cor = "green" if perfil_display == "Entrada de Caixa" else "red"
+        # Exibir data e hora
+        try:
+            if ' ' in data_display:
+                data_ordenacao = data_display.split(' ')[0]
+                hora_ordenacao = data_display.split(' ')[1][:5]
+            else:
+                data_ordenacao = data_display
+                hora_ordenacao = "00:00"
+        except:
+            data_ordenacao = data_display
+            hora_ordenacao = "00:00"
+        df_data.append({
+            "Data": data_display,
+            "Data_ts": t.get('data_ts'),
+            "Hora": hora_ordenacao,
+            "Data_Ordenacao": data_ordenacao,
+            "Perfil": perfil_display,
+            "Valor": valor_num,
+            "Valor_Centavos": valor_centavos,
+            "Valor_Display": valor_display.replace(".", ","),
+            "Símbolo": simbolo,
+            "Cor": cor,
+            "Descrição": descricao_display,
+            "ID": id_transacao,
+            "Tipo": "Entrada" if perfil_display == "Entrada de Caixa" else "Saída",
+            "Foto": caminho_foto
+        })
+    df = pd.DataFrame(df_data)
+    return df.sort_values(by="Data_ts", ascending=False, kind="stable")
+
+# Função para gerar `quantidade` transações sintéticas no formato de
+# ledger.obter_transacoes (datas em ~2 anos, valores até R$ 5.000,00, um terço
+# com foto registrada)
+def gerar_transacoes(quantidade, semente=1):
+    aleatorio = random.Random(semente)
+    inicio = datetime(2024, 1, 1)
+    transacoes = []
+    for i in range(quantidade):
+        data = inicio + timedelta(seconds=aleatorio.randint(0, 86400 * 700))
+        centavos = aleatorio.randint(1, 500000)
+        com_foto = i % 3 == 0
+        transacoes.append({
+            "id_transacao": str(i),
+            "usuario": "ana.souza",
+            "tipo": "saida",
+            "valor": centavos / 100,
+            "valor_centavos": centavos,
+            "descricao": f"transação {i}",
+            "perfil": aleatorio.choice(PERFIS),
+            "data": data.strftime('%Y-%m-%d %H:%M:%S'),
+            "data_ts": calendar.timegm(data.timetuple()),
+            "caminho_foto": f"fotos/{i}.webp" if com_foto else None,
+            "origem_saldo": "colaborador",
+            "status_foto": "pronta" if com_foto else None,
+            "arquivo_foto": "ok" if com_foto else None,
+            "caminho_previa": None,
+            "caminho_miniatura": None,
+        })
+    return transacoes
+
+def _medir(funcao, argumento):
+    inicio = time.perf_counter()
+    funcao(argumento)
+    return time.perf_counter() - inicio
+
+if __name__ == "__main__":
+    completo = "--completo" in sys.argv
+    print(f"{'linhas':>9}  {'linha a linha':>13}  {'colunar (dicts)':>15}  {'colunar (DataFrame)':>19}")
+    for quantidade in TAMANHOS:
+        transacoes = gerar_transacoes(quantidade)
+        quadro = pd.DataFrame.from_records(transacoes)
+        colunar = _medir(criar_dataframe_transacoes, transacoes)
+        colunar_quadro = _medir(criar_dataframe_transacoes, quadro)
+        if quantidade < 1_000_000 or completo:
+            antigo = _medir(criar_dataframe_linha_a_linha, transacoes)
+            print(f"{quantidade:>9}  {antigo:>12.2f}s  {colunar:>7.2f}s x{antigo / colunar:>5.1f}"
+                  f"  {colunar_quadro:>11.2f}s x{antigo / colunar_quadro:>5.1f}")
+        else:
+            print(f"{quantidade:>9}  {'-':>13}  {colunar:>14.2f}s  {colunar_quadro:>18.2f}s")
@@ -0,0 +1,103 @@
+"""
+Benchmark de photos.ingerir_foto com JPEGs sintéticos no tamanho das fotos de
+celular (12 MP paisagem e retrato, e a foto reduzida de 1600x1200 que o
+WhatsApp envia), contra a gravação anterior à ingestão única
+(gravar_foto_antiga, mantida aqui como referência).
+
+As colunas não fazem o mesmo trabalho: a gravação anterior codifica um JPEG
+95 na resolução da câmera; ingerir_foto reduz a foto, codifica no formato de
+PERFIL_COMPROVANTE (WEBP por padrão, o que domina o tempo), gera a prévia e a
+miniatura e registra o arquivo na tabela fotos. O ganho da ingestão única é a
+validação e o tamanho gravado; desde o processamento em segundo plano o tempo
+não fica na requisição.
+
+A ingestão roda sobre um banco novo em um diretório temporário. Entre as
+repetições a foto é liberada (liberar_foto): senão o reenvio dos mesmos bytes
+reaproveitaria o arquivo gravado, o que é medido à parte na coluna "reenvio".
+
+Uso (na raiz do repositório): python -m benchmarks.ingestao_fotos [--repeticoes N]
+"""
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+
+from PIL import Image
+
+from tripledger import photos, storage
+from tripledger.migracoes import aplicar_migracoes
+
+# Fotos medidas: nome -> (largura, altura)
+FOTOS = {
+    "12MP paisagem": (4032, 3024),
+    "12MP retrato": (3024, 4032),
+    "WhatsApp": (1600, 1200),
+}
+
+# Função para gerar um JPEG sintético de largura x altura com textura de foto
+# (gradientes com ruído: comprime como uma foto de câmera, ~4,7 MB em 12 MP)
+def gerar_jpeg(largura, altura, qualidade=92):
+    canais = [
+        Image.linear_gradient("L").resize((largura, altura)),
+        Image.effect_noise((largura, altura), 14),
+        Image.radial_gradient("L").resize((largura, altura)),
+    ]
+    saida = io.BytesIO()
+    Image.merge("RGB", canais).save(saida, "JPEG", quality=qualidade)
+    return saida.getvalue()
+
+# Gravação anterior (caminho principal de _gravar_foto_nova): abre para validar,
+# converte, gira para retrato, codifica em JPEG 95 e reabre o arquivo gravado
+def gravar_foto_antiga(diretorio, nome, foto_bytes):
+    Image.open(io.BytesIO(foto_bytes))
+    imagem = Image.open(io.BytesIO(foto_bytes))
+    if imagem.mode != "RGB":
+        imagem = imagem.convert("RGB")
+    if imagem.width > imagem.height:
+        imagem = imagem.rotate(-90, expand=True)
+    buffer = io.BytesIO()
+    imagem.save(buffer, format="JPEG", quality=95)
+    caminho_foto = os.path.join(diretorio, f"{nome}.jpg")
+    with open(caminho_foto, "wb") as f:
+        f.write(buffer.getvalue())
+    with Image.open(caminho_foto) as img:
+        img.size
+    return caminho_foto
+
+# Função para medir a mediana, em ms, de `repeticoes` chamadas de `funcao`;
+# `depois` roda após cada chamada, fora da medição
+def _medir(funcao, repeticoes, depois=None):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        if depois:
+            depois(resultado)
+    return statistics.median(tempos)
+
+def _ingerir(foto_bytes):
+    with photos.ingerir_foto(foto_bytes) as caminho_foto:
+        return caminho_foto
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    argumentos.add_argument("--repeticoes", type=int, default=5)
+    repeticoes = argumentos.parse_args().repeticoes
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        storage.DB_PATH = os.path.join(diretorio, "dados.db")
+        aplicar_migracoes()
+        print(f"{'foto':<14} {'enviada':>9} {'gravada':>9} {'anterior':>9} {'ingerir_foto':>12} {'reenvio':>8}")
+        for nome, (largura, altura) in FOTOS.items():
+            foto_bytes = gerar_jpeg(largura, altura)
+            antiga = _medir(lambda: gravar_foto_antiga(diretorio, nome, foto_bytes), repeticoes)
+            atual = _medir(lambda: _ingerir(foto_bytes), repeticoes, photos.liberar_foto)
+            caminho_foto = _ingerir(foto_bytes)
+            reenvio = _medir(lambda: _ingerir(foto_bytes), repeticoes)
+            print(f"{nome:<14} {len(foto_bytes) / 1e6:>7.1f}MB {os.path.getsize(caminho_foto) / 1e6:>7.2f}MB"
+                  f" {antiga:>7.0f}ms {atual:>10.0f}ms {reenvio:>6.1f}ms")
+            photos.liberar_foto(caminho_foto)
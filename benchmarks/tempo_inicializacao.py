@@ -0,0 +1,83 @@
+"""
+Benchmark da partida a frio do app: um interpretador novo executa a primeira
+renderização da página de Login (AppTest do Streamlit), e o tempo da execução
+é medido junto com os módulos pesados que o app carregou (plotly.express só
+deve vir com a página do supervisor, e o Pillow só com a primeira foto). Um
+módulo que o próprio Streamlit já importa aparece como "carregado pelo
+Streamlit": o app não pode evitá-lo.
+
+Cada execução usa uma cópia do dados.db em um diretório temporário, com as
+migrações já aplicadas por uma execução preparatória (não medida): o banco do
+repositório não é alterado.
+
+Uso (na raiz do repositório): python -m benchmarks.tempo_inicializacao [--execucoes N] [--raiz CAMINHO]
+Para comparar com outra revisão, meça uma cópia dela com --raiz (ex.: criada
+com git worktree add /tmp/antes <revisão>).
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULOS_PESADOS = ["plotly.express", "PIL"]
+
+# Situação de cada módulo pesado após a execução
+NAO_CARREGADO, CARREGADO_PELO_APP, CARREGADO_PELO_STREAMLIT = "0", "1", "2"
+
+# Código executado em cada interpretador novo: a importação do Streamlit não é
+# medida (custo do framework, igual em qualquer revisão); o app sim
+_EXECUCAO = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+do_streamlit = {m for m in sys.argv[2:] if m in sys.modules}
+inicio = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+decorrido = time.perf_counter() - inicio
+print(decorrido, len(at.exception), *("2" if m in do_streamlit else str(int(m in sys.modules)) for m in sys.argv[2:]))
+"""
+
+# Função para executar a primeira renderização do app em `raiz` com o
+# diretório de trabalho `diretorio`. Devolve (segundos, exceções, situação de
+# cada módulo pesado).
+def _executar(raiz, diretorio):
+    ambiente = dict(os.environ, PYTHONPATH=raiz)
+    saida = subprocess.run(
+        [sys.executable, "-c", _EXECUCAO, os.path.join(raiz, "app.py"), *MODULOS_PESADOS],
+        cwd=diretorio, env=ambiente, capture_output=True, text=True, check=True,
+    ).stdout.split()[-2 - len(MODULOS_PESADOS):]
+    return float(saida[0]), int(saida[1]), dict(zip(MODULOS_PESADOS, saida[2:]))
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    argumentos.add_argument("--execucoes", type=int, default=15)
+    argumentos.add_argument("--raiz", default=RAIZ, help="árvore do app a medir (padrão: este repositório)")
+    opcoes = argumentos.parse_args()
+    raiz = os.path.abspath(opcoes.raiz)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        if os.path.exists(os.path.join(raiz, "dados.db")):
+            shutil.copyfile(os.path.join(raiz, "dados.db"), os.path.join(diretorio, "dados.db"))
+        # Execução preparatória: migrações e fotos antigas ficam fora da medição
+        _executar(raiz, diretorio)
+        tempos, situacoes = [], {}
+        for _ in range(opcoes.execucoes):
+            segundos, excecoes, modulos = _executar(raiz, diretorio)
+            if excecoes:
+                sys.exit(f"A página de Login terminou com {excecoes} exceção(ões)")
+            tempos.append(segundos * 1000)
+            situacoes.update(modulos)
+
+    print(f"{raiz}: {opcoes.execucoes} execuções")
+    print(f"  mediana {statistics.median(tempos):.0f} ms (mín. {min(tempos):.0f} ms, máx. {max(tempos):.0f} ms)")
+    descricoes = {
+        NAO_CARREGADO: "não carregado",
+        CARREGADO_PELO_APP: "carregado pelo app",
+        CARREGADO_PELO_STREAMLIT: "carregado pelo Streamlit",
+    }
+    for modulo in MODULOS_PESADOS:
+        print(f"  {modulo}: {descricoes[situacoes[modulo]]}")
@@ -0,0 +1,188 @@
+"""
+Componentes de interface compartilhados pelas páginas do TripLedger.
+
+A lógica de negócio (banco, transações, saldos, caixa, fotos, exportação) fica
+no pacote tripledger, que não depende do Streamlit; as páginas importam de lá
+o que usam. Este módulo reúne o que é de interface: formatação de valores,
+rodapé, grade de transações, seções em fragmento e a exibição na página das
+mensagens de erro registradas pelo núcleo.
+"""
+import functools
+import locale
+import logging
+import re
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from tripledger import moeda
+from tripledger.estaticos import HOSTS_LOCAIS, SERVIDOR_FOTOS, iniciar_servidor_fotos, servidor_somente_local, url_foto
+from tripledger.photos import FOTO_ERRO, FOTO_PENDENTE, RENDICOES
+
+# Configure o locale para o Brasil
+try:
+    locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
+except:
+    try:
+        locale.setlocale(locale.LC_ALL, 'Portuguese_Brazil.1252')
+    except:
+        pass  # Se não conseguir configurar o locale, usará o padrão
+
+# Função para converter string para float aceitando vírgula ou ponto
+# (formatos BR e US; ver moeda.para_centavos). O resultado é arredondado a centavos.
+def converter_para_float(valor_str):
+    return moeda.centavos_para_reais(moeda.para_centavos(valor_str))
+
+# Função para formatar valores para exibição no formato brasileiro (R$ 1.234,56)
+def formatar_valor(valor):
+    return moeda.formatar_centavos(moeda.para_centavos(valor))
+
+# Rodapé
+def adicionar_rodape():
+    st.markdown(
+        '<div class="footer">© 2025 • Aguinir Pretti</div>',
+        unsafe_allow_html=True
+    )
+
+# Erros e avisos registrados pelo núcleo (logger "tripledger") são exibidos na
+# página como st.error/st.warning. Fora de uma execução do Streamlit (threads
+# auxiliares, scripts de lote) o registro é ignorado por este handler.
+class _MensagensNaPagina(logging.Handler):
+    def emit(self, record):
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return
+        exibir = st.error if record.levelno >= logging.ERROR else st.warning
+        exibir(record.getMessage())
+
+# Instalar o handler uma única vez, mesmo se o módulo for recarregado
+_logger_nucleo = logging.getLogger("tripledger")
+if not any(h.get_name() == "mensagens_na_pagina" for h in _logger_nucleo.handlers):
+    _handler = _MensagensNaPagina(level=logging.WARNING)
+    _handler.set_name("mensagens_na_pagina")
+    _logger_nucleo.addHandler(_handler)
+
+# Paginação da lista "Minhas Transações"
+TAMANHOS_PAGINA_TRANSACOES = [10, 20, 50, 100]
+TAMANHO_PAGINA_PADRAO = 20
+
+# Exibição das tabelas de transações: grade única com seleção de linha ou lista com botões por linha
+MODOS_EXIBICAO_TRANSACOES = ["Tabela", "Lista"]
+
+# Função para exibir transações em uma única grade (st.dataframe) com seleção de
+# linha, em vez de colunas e botões por linha. Devolve a linha selecionada de `df`
+# (ou None); as ações sobre ela (editar, ver foto) ficam com quem chama.
+def exibir_grade_transacoes(df, chave, mostrar_tipo=False):
+    grade = pd.DataFrame({
+        "Data": df["Data_Ordenacao"],
+        "Hora": df["Hora"],
+        "Perfil": df["Perfil"],
+        "Valor": df["Símbolo"] + " R$ " + df["Valor_Display"],
+        "Descrição": df["Descrição"],
+    })
+    if mostrar_tipo:
+        grade["Tipo"] = df["Tipo"]
+    # Foto pronta, ainda em processamento (ver tripledger.photos) ou com erro
+    grade["Foto"] = np.select(
+        [df["Foto"] != "", df["Status_Foto"] == FOTO_PENDENTE, df["Status_Foto"] == FOTO_ERRO],
+        ["📷", "⏳", "⚠️"], default="",
+    )
+    grade = grade.reset_index(drop=True)
+    # Cor do valor (+ verde, - vermelho) aplicada à coluna inteira de uma vez
+    cores = np.where(df["Símbolo"].to_numpy() == "+", "color: green", "color: red")
+    evento = st.dataframe(
+        grade.style.apply(lambda _: cores, subset=["Valor"]),
+        key=chave,
+        on_select="rerun",
+        selection_mode="single-row",
+        hide_index=True,
+        use_container_width=True,
+    )
+    linhas = evento.selection.rows
+    if linhas and linhas[0] < len(df):
+        return df.iloc[linhas[0]]
+    return None
+
+# Coluna do DataFrame de transações com o caminho de cada versão reduzida
+COLUNAS_RENDICOES = {"previa": "Foto_Previa", "miniatura": "Foto_Miniatura"}
+
+# Função para obter o endereço do servidor de fotos visto pelo navegador (ver
+# tripledger.estaticos). Sem url_base configurada, usa o host pelo qual o app
+# foi aberto quando o acesso é direto (http, com porta); atrás de um proxy
+# (https ou sem porta), ou com o servidor só na interface local e o app aberto
+# de outra máquina, devolve None e as fotos são lidas pelo Streamlit.
+def url_base_fotos():
+    porta = iniciar_servidor_fotos()
+    if porta is None:
+        return None
+    if SERVIDOR_FOTOS["url_base"]:
+        return SERVIDOR_FOTOS["url_base"]
+    cabecalhos = st.context.headers
+    host = cabecalhos.get("Host", "")
+    if cabecalhos.get("X-Forwarded-Proto", "http") != "http" or not re.fullmatch(r"(.+):\d+", host):
+        return None
+    nome = host.rsplit(':', 1)[0]
+    if servidor_somente_local() and nome not in HOSTS_LOCAIS:
+        # Servidor só na interface local: o navegador está em outra máquina
+        return None
+    return f"http://{nome}:{porta}"
+
+# Função para exibir a foto de uma transação pela versão reduzida: miniatura nas
+# listas, prévia no detalhe da linha selecionada. A foto original (vários MB)
+# só é enviada ao navegador quando pedida pelo botão. `linha` é a linha do
+# DataFrame de transações: os caminhos vêm da tabela fotos, sem consultar o disco.
+# Com o servidor de fotos ativo, st.image recebe a URL da foto e o navegador a
+# guarda em cache; sem ele, recebe o caminho e o Streamlit lê o arquivo.
+def exibir_foto_transacao(linha, chave, rendicao="miniatura"):
+    url_base = url_base_fotos()
+
+    def fonte(caminho):
+        return (url_base and url_foto(caminho, url_base)) or caminho
+
+    caminho_foto = linha["Foto"]
+    caminho_reduzido = linha[COLUNAS_RENDICOES[rendicao]]
+    if not caminho_reduzido:
+        # Foto ainda sem versões reduzidas (ver gerar_rendicoes_faltantes)
+        st.image(fonte(caminho_foto), caption="Foto da transação", use_container_width=True)
+        return
+    if rendicao == "miniatura":
+        st.image(fonte(caminho_reduzido), caption="Foto da transação", width=RENDICOES["miniatura"][1])
+    else:
+        st.image(fonte(caminho_reduzido), caption="Foto da transação", use_container_width=True)
+    chave_original = f"foto_original_{chave}"
+    if st.button("🔍 Ver original", key=f"botao_{chave_original}"):
+        st.session_state[chave_original] = not st.session_state.get(chave_original, False)
+        reexecutar_secao()
+    if st.session_state.get(chave_original, False):
+        st.image(fonte(caminho_foto), caption="Foto original", use_container_width=True)
+
+# Seções da interface. Cada uma é um fragmento (st.fragment): uma interação em
+# um widget da seção reexecuta só a seção, não o app inteiro. Ações que alteram
+# dados (incluir, editar, excluir) continuam chamando st.rerun() para o app todo,
+# já que saldos e listas de outras seções mudam junto.
+
+# Função para reexecutar apenas a seção (fragmento) atual. Fora de uma
+# reexecução de fragmento o Streamlit não aceita scope="fragment"; nesse caso
+# o app inteiro é reexecutado, como antes.
+def reexecutar_secao():
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+# Decorador que transforma a função em fragmento e registra o tempo da última
+# execução da seção em st.session_state["tempos_secoes"] (exibido em Manutenção)
+def secao_interface(nome):
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        def executar(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                st.session_state.setdefault("tempos_secoes", {})[nome] = (time.perf_counter() - inicio) * 1000
+        return st.fragment(executar)
+    return decorar
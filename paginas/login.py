@@ -0,0 +1,447 @@
+"""
+Página de login e área do colaborador: nova transação, lista de transações
+(com edição) e saldos.
+"""
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from nucleo import (
+    MODOS_EXIBICAO_TRANSACOES, TAMANHO_PAGINA_PADRAO, TAMANHOS_PAGINA_TRANSACOES,
+    converter_para_float, exibir_foto_transacao, exibir_grade_transacoes, formatar_valor,
+    reexecutar_secao, secao_interface,
+)
+from tripledger.ledger import (
+    adicionar_transacao, atualizar_transacao, contar_transacoes, excluir_transacao,
+    obter_anos_transacoes, obter_pagina_transacoes_usuario, obter_perfis_usuario,
+    obter_saldo, obter_saldos_separados, obter_transacao, verificar_usuario,
+)
+from tripledger.photos import FOTO_PENDENTE
+
+@secao_interface("Nova transação")
+def secao_nova_transacao():
+    # Formulário para adicionar nova transação
+    st.subheader("Adicionar Nova Transação")
+    with st.form(key="adicionar_transacao"):
+        perfil = st.selectbox("Perfil da Transação", ["Café da Manhã", "Almoço", "Janta", "Outros Serviços", "Saída de Caixa" , "Entrada de Caixa"])
+        origem_saldo = st.radio(
+            "Origem do Saldo:",
+            ["colaborador", "emprestado"],
+            horizontal=True,
+            help="Escolha se esta transação usa seu saldo próprio ou saldo emprestado"
+        )
+        valor_str = st.text_input("Valor", value="0,00", help="Digite o valor usando vírgula ou ponto como separador decimal (exemplo: 25,70 ou 25.70)")
+        try:
+            valor = converter_para_float(valor_str)
+        except Exception as e:
+            st.error(f"Erro ao converter valor: {str(e)}")
+            valor = 0.0
+        descricao = st.text_input("Descrição (opcional)")
+        st.subheader("Data e Hora da Transação")
+        col1, col2 = st.columns(2)
+        with col1:
+            data = st.date_input("Data", value=datetime.today(), format="DD/MM/YYYY")
+        with col2:
+            st.write("Hora")
+            hora_col, min_col = st.columns(2)
+            with hora_col:
+                hora_valor = st.slider("Hora", 0, 23, int(datetime.now().hour))
+            with min_col:
+                minuto_valor = st.slider("Minuto", 0, 59, int(datetime.now().minute), step=5)
+            hora = datetime.now().time().replace(hour=hora_valor, minute=minuto_valor)
+            st.write(f"Horário selecionado: {hora_valor:02d}:{minuto_valor:02d}")
+        # Interface de foto consistente com o formulário de edição
+        if "mostrar_camera" not in st.session_state:
+            st.session_state.mostrar_camera = False
+
+        if not st.session_state.mostrar_camera:
+            camera_button = st.form_submit_button("📷 Adicionar Foto (opcional)")
+            if camera_button:
+                st.session_state.mostrar_camera = True
+                reexecutar_secao()
+        else:
+            # Upload de arquivo aceitando todos os formatos de foto comuns
+            foto = st.file_uploader("Escolher foto", 
+                type=['png', 'jpg', 'jpeg', 'bmp', 'gif', 'tiff', 'webp', 'heic', 'heif'],
+                accept_multiple_files=False, 
+                key="file_uploader",
+                help="Tire a foto o mais próximo possível da nota fiscal. Segure o celular na vertical.")
+            cancelar_foto = st.form_submit_button("❌ Cancelar")
+
+            # Sem preview
+            if cancelar_foto:
+                st.session_state.mostrar_camera = False
+                st.session_state.foto_capturada = None
+                reexecutar_secao()
+
+            # Armazena a foto na sessão
+            if foto is not None:
+                st.session_state.foto_capturada = foto
+                st.success("Foto anexada com sucesso!")
+
+        submeter = st.form_submit_button("Adicionar Transação")            # Lógica para processar o formulário após submissão
+    if submeter:
+        # Combina data e hora
+        data_hora = datetime.combine(data, hora).strftime('%d/%m/%Y %H:%M:%S')
+
+        # Define o tipo de transação com base no perfil
+        tipo_transacao = "entrada" if perfil == "Entrada de Caixa" else "saida"
+
+        # Obter foto da sessão se existir
+        foto_para_salvar = st.session_state.get("foto_capturada", None)
+
+        if valor > 0:  # Descrição agora é opcional
+            if adicionar_transacao(st.session_state["usuario"], tipo_transacao, valor, descricao, perfil, data_hora, foto_para_salvar, origem_saldo):
+                # A foto é processada em segundo plano; o aviso (toast) continua visível após o rerun
+                if foto_para_salvar is not None:
+                    st.toast("Transação adicionada com sucesso! A foto está sendo processada.", icon="⏳")
+                else:
+                    st.toast("Transação adicionada com sucesso!", icon="✅")
+                # Limpar os campos do formulário e estado da sessão
+                for key in ["valor_input", "descricao_input", "file_uploader", "foto_capturada", "mostrar_camera"]:
+                    if key in st.session_state:
+                        del st.session_state[key]
+                st.rerun()
+            else:
+                st.error("Erro ao adicionar transação. Tente novamente.")
+        else:
+            st.warning("Por favor, informe um valor maior que zero!")
+
+@secao_interface("Minhas transações")
+def secao_minhas_transacoes():
+    # Exibir transações do usuário com ícones de edição
+    st.subheader("Minhas Transações")
+    total_usuario = contar_transacoes(usuario=st.session_state["usuario"])
+
+    # Verificar se temos transações para exibir
+    if not total_usuario:
+        st.info("Você ainda não possui transações registradas.")
+    else:
+        # Se temos uma transação selecionada para editar, mostrar o formulário de edição
+        if "transacao_editando" in st.session_state:
+            transacao_id = st.session_state["transacao_editando"]
+
+            # Buscar a transação pelo ID (pode estar fora das páginas carregadas)
+            transacao = obter_transacao(transacao_id)
+            if transacao and transacao.get('usuario') != st.session_state["usuario"]:
+                transacao = None
+
+            if transacao:
+                st.subheader("Editar Transação")
+
+                with st.form(key="editar_transacao"):
+                    # Campos para edição
+                    perfil_edit = st.selectbox("Perfil da Transação", 
+                                        ["Café da Manhã", "Almoço", "Janta", "Outros Serviços", "Saída de Caixa" , "Entrada de Caixa"],
+                                        index=["Café da Manhã", "Almoço", "Janta", "Outros Serviços", "Saída de Caixa" , "Entrada de Caixa"].index(transacao.get('perfil', 'Outros Serviços')))
+
+                    # Campo de valor que aceita vírgula ou ponto como separador decimal
+                    valor_atual = float(transacao.get('valor', 0))
+                    valor_str_edit = st.text_input("Valor", value=f"{valor_atual:.2f}".replace('.', ','), 
+                                        help="Digite o valor usando vírgula ou ponto como separador decimal",
+                                        key="valor_edit_text")
+                    valor_edit = converter_para_float(valor_str_edit)
+
+                    # Descrição original da transação
+                    descricao_edit = st.text_input("Descrição (opcional)",
+                                            value=transacao.get('descricao', ''))
+
+                    # Botão para upload de foto na edição
+                    if "mostrar_camera_edicao" not in st.session_state:
+                        st.session_state.mostrar_camera_edicao = False
+
+                    if not st.session_state.mostrar_camera_edicao:
+                        camera_button = st.form_submit_button("📷 Atualizar Foto (opcional)")
+                        if camera_button:
+                            st.session_state.mostrar_camera_edicao = True
+                            reexecutar_secao()
+                    else:
+                        # Upload de arquivo ao invés de câmera
+                        foto_edit = st.file_uploader("Escolher foto", type=['jpg', 'jpeg', 'png'], key="foto_edit")
+                        cancelar_foto = st.form_submit_button("❌ Cancelar")
+                        if cancelar_foto:
+                            st.session_state.mostrar_camera_edicao = False
+                            st.session_state.foto_capturada_edicao = None
+                            reexecutar_secao()
+
+                        # Armazena a foto na sessão
+                        if foto_edit is not None:
+                            st.session_state.foto_capturada_edicao = foto_edit
+                            st.success("Nova foto anexada com sucesso!")
+
+                    # Data original da transação
+                    data_original = transacao.get('data', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+                    # Tentar converter a data para exibição
+                    try:
+                        if len(data_original) >= 10:
+                            if data_original[4] == '-':  # Formato ISO
+                                data_obj = datetime.strptime(data_original[:10], '%Y-%m-%d')
+                                hora_str = data_original[10:16] if len(data_original) > 16 else "00:00"
+                                hora_parts = hora_str.split(':')
+                                hora_val = int(hora_parts[0]) if len(hora_parts) > 0 else 0
+                                min_val = int(hora_parts[1]) if len(hora_parts) > 1 else 0
+                            else:  # Possível formato brasileiro
+                                data_obj = datetime.strptime(data_original[:10], '%d/%m/%Y')
+                                hora_str = data_original[10:16] if len(data_original) > 16 else "00:00"
+                                hora_parts = hora_str.split(':')
+                                hora_val = int(hora_parts[0]) if len(hora_parts) > 0 else 0
+                                min_val = int(hora_parts[1]) if len(hora_parts) > 1 else 0
+                    except:
+                        data_obj = datetime.now()
+                        hora_val = 0
+                        min_val = 0
+
+                    # Campos de data e hora para edição
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        data_edit = st.date_input("Data", value=data_obj, format="DD/MM/YYYY", key="data_edit")
+
+                    with col2:
+                        hora_col, min_col = st.columns(2)
+                        with hora_col:
+                            hora_valor_edit = st.slider("Hora", 0, 23, hora_val, key="hora_edit")
+                        with min_col:
+                            minuto_valor_edit = st.slider("Minuto", 0, 59, min_val, step=5, key="min_edit")
+
+                    # Botões de ação para edição
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        cancelar = st.form_submit_button("Cancelar")
+
+                    with col2:
+                        salvar = st.form_submit_button("Salvar Alterações")
+
+                    # Tratamento dos botões
+                    if cancelar:
+                        if "transacao_editando" in st.session_state:
+                            del st.session_state["transacao_editando"]
+                        reexecutar_secao()
+
+                    if salvar:
+                        if valor_edit <= 0:
+                            st.error("O valor deve ser maior que zero!")
+                        else:
+                            # Combina data e hora
+                            data_hora_edit = datetime.combine(
+                                data_edit, 
+                                datetime.now().time().replace(hour=hora_valor_edit, minute=minuto_valor_edit)
+                            ).strftime('%d/%m/%Y %H:%M:%S')
+
+                            # Define o tipo com base no perfil
+                            tipo_edit = "entrada" if perfil_edit == "Entrada de Caixa" else "saida"
+
+                            # Obtém a foto da sessão para edição, se existir
+                            foto_edit_para_salvar = st.session_state.get("foto_capturada_edicao", None)
+
+                            # Atualiza a transação
+                            if atualizar_transacao(transacao_id, tipo_edit, valor_edit, descricao_edit, perfil_edit, data_hora_edit, foto_edit_para_salvar):
+                                # Limpa o estado de edição e recarrega
+                                if "transacao_editando" in st.session_state:
+                                    del st.session_state["transacao_editando"]
+                                if "foto_capturada_edicao" in st.session_state:
+                                    del st.session_state["foto_capturada_edicao"]
+                                if "mostrar_camera_edicao" in st.session_state:
+                                    del st.session_state["mostrar_camera_edicao"]
+                                st.toast("Transação atualizada com sucesso!", icon="✅")
+                                st.rerun()
+                            else:
+                                st.error("Erro ao atualizar a transação!")
+
+                # Botão adicional para excluir fora do formulário
+                if st.button("Excluir Transação", type="primary", help="Esta ação não pode ser desfeita!"):
+                    if st.session_state.get("confirmar_exclusao") != transacao_id:
+                        st.session_state["confirmar_exclusao"] = transacao_id
+                        st.warning("Clique novamente para confirmar a exclusão.")
+                    else:
+                        if excluir_transacao(transacao_id):
+                            if "transacao_editando" in st.session_state:
+                                del st.session_state["transacao_editando"]
+                            if "confirmar_exclusao" in st.session_state:
+                                del st.session_state["confirmar_exclusao"]
+                            st.toast("Transação excluída com sucesso!", icon="✅")
+                            st.rerun()
+                        else:
+                            st.error("Erro ao excluir transação. Tente novamente.")
+
+        # Opções de filtro vêm de consultas DISTINCT, sem carregar o histórico
+        perfis_usuario = obter_perfis_usuario(st.session_state["usuario"])
+        anos_disponiveis = obter_anos_transacoes(st.session_state["usuario"])
+
+        # Adicionar filtros
+        st.subheader("Filtros")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            perfis_disponiveis = ["Todos"] + perfis_usuario
+            filtro_perfil = st.selectbox("Filtrar por Perfil", perfis_disponiveis)
+        with col2:
+            meses = ["Todos", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", 
+                    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+            mes_atual = datetime.now().month
+            filtro_mes = st.selectbox("Filtrar por Mês", meses, index=mes_atual)
+        with col3:
+            if not anos_disponiveis:
+                anos_disponiveis = [str(datetime.now().year)]
+            filtro_ano = st.selectbox("Filtrar por Ano", anos_disponiveis)
+        with col4:
+            tamanho_pagina = st.selectbox("Itens por página", TAMANHOS_PAGINA_TRANSACOES,
+                                          index=TAMANHOS_PAGINA_TRANSACOES.index(TAMANHO_PAGINA_PADRAO))
+
+        # Filtros aplicados no SQL (perfil e colunas geradas ano/mes)
+        perfil_sql = None if filtro_perfil == "Todos" else filtro_perfil
+        mes_numero = None if filtro_mes == "Todos" else meses.index(filtro_mes)
+        ano_numero = int(filtro_ano)
+        filtros_lista = (st.session_state["usuario"], perfil_sql, ano_numero, mes_numero, tamanho_pagina)
+
+        # Cursores das páginas carregadas ("Carregar mais" acrescenta um);
+        # voltam à primeira página quando os filtros mudam
+        if st.session_state.get("filtros_lista_transacoes") != filtros_lista:
+            st.session_state["filtros_lista_transacoes"] = filtros_lista
+            st.session_state["cursores_transacoes"] = [None]
+
+        paginas = []
+        proximo_cursor = None
+        for cursor_pagina in st.session_state["cursores_transacoes"]:
+            df_pagina, proximo_cursor = obter_pagina_transacoes_usuario(
+                st.session_state["usuario"], tamanho_pagina, cursor_pagina, perfil_sql, ano_numero, mes_numero
+            )
+            paginas.append(df_pagina)
+            if proximo_cursor is None:
+                break
+        df_filtrado = pd.concat(paginas) if len(paginas) > 1 else paginas[0]
+
+        # Exibir tabela com estilo
+        if not df_filtrado.empty:
+            # Aplicar formatação aos valores para exibição
+            df_display = df_filtrado.copy()
+            df_display["Valor"] = df_display["Símbolo"] + " R$ " + df_display["Valor_Display"]
+
+            modo_exibicao = st.radio("Exibição", MODOS_EXIBICAO_TRANSACOES, horizontal=True, key="modo_exibicao_transacoes")
+
+            if modo_exibicao == "Tabela":
+                # Uma única grade; a linha selecionada habilita editar e ver foto
+                selecionada = exibir_grade_transacoes(df_display, chave=f"grade_transacoes_{filtros_lista}")
+                if selecionada is not None:
+                    col_editar, col_foto = st.columns(2)
+                    with col_editar:
+                        if st.button("✏️ Editar transação selecionada", key="editar_selecionada"):
+                            st.session_state["transacao_editando"] = selecionada["ID"]
+                            reexecutar_secao()
+                    if selecionada["Foto"]:
+                        chave_foto = f"mostrar_foto_{selecionada['ID']}"
+                        with col_foto:
+                            if st.button("📷 Ver foto", key="foto_selecionada"):
+                                st.session_state[chave_foto] = not st.session_state.get(chave_foto, False)
+                                reexecutar_secao()
+                        if st.session_state.get(chave_foto, False):
+                            exibir_foto_transacao(selecionada, chave=selecionada["ID"], rendicao="previa")
+            else:
+                # Exibir a tabela com formatação personalizada
+                for index, row in df_display.iterrows():
+                    col1, col2, col3, col4, col5, col6 = st.columns([2, 2, 2, 3, 1, 1])
+                    with col1:
+                        st.write(row["Data"].split(" ")[0])  # Apenas a data sem a hora
+                    with col2:
+                        st.write(row["Hora"])  # Hora
+                    with col3:
+                        st.write(row["Perfil"])
+                    with col4:
+                        # Mostrar valor com a cor correta
+                        if row["Símbolo"] == "+":
+                            st.markdown(f"<span style='color:green'>+ R$ {row['Valor_Display']}</span>", unsafe_allow_html=True)
+                        else:
+                            st.markdown(f"<span style='color:red'>- R$ {row['Valor_Display']}</span>", unsafe_allow_html=True)
+                    with col5:
+                        st.write(row["Descrição"])
+                    with col6:
+                        if st.button("✏️", key=f"edit_{row['ID']}_{index}"):
+                            st.session_state["transacao_editando"] = row["ID"]
+                            reexecutar_secao()
+                        if row["Foto"]:
+                            foto_key = f"foto_{row['ID']}_{index}"
+                            if st.button("📷", key=foto_key):
+                                st.session_state[f"mostrar_foto_{row['ID']}"] = not st.session_state.get(f"mostrar_foto_{row['ID']}", False)
+                                reexecutar_secao()
+                        elif row["Status_Foto"] == FOTO_PENDENTE:
+                            st.caption("⏳ Foto")
+                    if st.session_state.get(f"mostrar_foto_{row['ID']}", False) and row["Foto"]:
+                        exibir_foto_transacao(row, chave=f"{row['ID']}_{index}")
+                    st.markdown("---")
+
+            total_filtrado = contar_transacoes(st.session_state["usuario"], perfil_sql, ano_numero, mes_numero)
+            st.caption(f"Exibindo {len(df_display)} de {total_filtrado} transações")
+            if proximo_cursor is not None:
+                if st.button("Carregar mais", key="carregar_mais_transacoes"):
+                    st.session_state["cursores_transacoes"].append(proximo_cursor)
+                    reexecutar_secao()
+        else:
+            st.info("Nenhuma transação encontrada com os filtros selecionados.")
+
+@secao_interface("Saldos do colaborador")
+def secao_saldos_colaborador():
+    st.subheader("Saldo Atual")
+    saldo = obter_saldo(st.session_state["usuario"])
+    saldo_formatado = formatar_valor(saldo)
+    if saldo >= 0:
+        st.success(f"{saldo_formatado}")
+    else:
+        st.error(f"{saldo_formatado}")
+
+    # Exibir saldos separados
+    st.subheader("Saldos")
+    saldos = obter_saldos_separados(st.session_state["usuario"])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        saldo_colab = saldos['colaborador']
+        saldo_colab_fmt = formatar_valor(saldo_colab)
+        st.markdown("**Saldo do Colaborador:**")
+        if saldo_colab >= 0:
+            st.success(f"{saldo_colab_fmt}")
+        else:
+            st.error(f"{saldo_colab_fmt}")
+            st.info("💡 Este valor será devolvido pela empresa")
+
+    with col2:
+        saldo_emp = saldos['emprestado']
+        saldo_emp_fmt = formatar_valor(saldo_emp)
+        st.markdown("**Saldo Emprestado:**")
+        if saldo_emp >= 0:
+            st.warning(f"{saldo_emp_fmt}")
+            if saldo_emp > 0:
+                st.info("💡 Este valor deve ser devolvido")
+        else:
+            st.error(f"{saldo_emp_fmt}")
+
+# Login e, com o usuário logado, a área do colaborador
+st.subheader("Login")
+if "usuario" not in st.session_state:
+    nome = st.text_input("Nome")
+    senha = st.text_input("Senha", type="password")
+    if st.button("Entrar"):  # Botão padronizado
+        if nome and senha:
+            tipo_usuario = verificar_usuario(nome, senha)
+            if tipo_usuario:
+                st.session_state["usuario"] = nome
+                st.session_state["tipo"] = tipo_usuario
+                st.success(f"Bem-vindo, {st.session_state['usuario']}!")
+                st.rerun()
+            else:
+                st.error("Usuário ou senha incorretos")
+        else:
+            st.warning("Por favor, preencha todos os campos!")
+else:
+    # Mostra informações do usuário logado e botão de logoff
+    st.success(f"Você está logado como: {st.session_state['usuario']}")
+
+    if st.button("Sair"):
+        # Limpa os dados da sessão
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+        st.rerun()
+
+    secao_nova_transacao()
+    secao_minhas_transacoes()
+    secao_saldos_colaborador()
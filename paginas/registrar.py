@@ -0,0 +1,27 @@
+"""
+Página de cadastro de colaboradores (autorizado pela senha de um supervisor).
+"""
+import streamlit as st
+
+from tripledger.ledger import adicionar_usuario
+from tripledger.storage import conexao_banco
+
+st.subheader("Criar Conta")
+nome = st.text_input("Nome")
+senha = st.text_input("Senha", type="password")
+senha_supervisor = st.text_input("Senha do Supervisor", type="password", help="Digite a senha de um supervisor para autorizar o cadastro")
+if st.button("Entrar"):  # Botão padronizado
+    if nome and senha and senha_supervisor:
+        # Verificar se existe algum supervisor com a senha fornecida
+        with conexao_banco() as conn:
+            supervisor = conn.execute("SELECT * FROM usuarios WHERE tipo = 'supervisor' AND senha = ?", (senha_supervisor,)).fetchone()
+
+        if supervisor:
+            if adicionar_usuario(nome, senha):
+                st.success("Conta criada com sucesso!")
+            else:
+                st.error("Usuário já existe ou ocorreu um erro ao registrar!")
+        else:
+            st.error("Senha do supervisor incorreta!")
+    else:
+        st.warning("Por favor, preencha todos os campos!")
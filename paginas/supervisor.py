@@ -0,0 +1,533 @@
+"""
+Painel do supervisor: status dos usuários, dashboard com gráficos, transações
+por usuário com exportação CSV e manutenção. É a única página que usa plotly,
+importado aqui para não pesar no carregamento das demais.
+"""
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from nucleo import (
+    MODOS_EXIBICAO_TRANSACOES, exibir_foto_transacao, exibir_grade_transacoes,
+    formatar_valor, reexecutar_secao, secao_interface,
+)
+from tripledger import moeda
+from tripledger.export import gerar_csv_transacoes
+from tripledger.ledger import (
+    contar_transacoes, obter_anos_transacoes, obter_dataframe_transacoes,
+    obter_saldos_separados, obter_status_usuarios, obter_transacoes,
+    reconstruir_saldos, verificar_saldos, verificar_usuario,
+)
+from tripledger.photos import (
+    agendar_rendicoes_faltantes, corrigir_fotos, estatisticas_fotos, recodificar_fotos, resumir_recodificacao,
+    verificar_fotos,
+)
+from tripledger.storage import estatisticas_cache_leituras
+
+@secao_interface("Status de usuários")
+def secao_status_usuarios():
+    # Saldos e estado do caixa de todos os usuários em uma única consulta
+    status_usuarios = obter_status_usuarios()
+    df = pd.DataFrame(status_usuarios)
+
+    # Adicionar filtros
+    st.subheader("Filtros")
+    status_disponiveis = ["Todos"] + sorted(df["Status"].unique().tolist())
+    filtro_status = st.selectbox("Filtrar por Status", status_disponiveis)
+
+    # Aplicar filtros
+    df_filtrado = df.copy()
+    if filtro_status != "Todos":
+        df_filtrado = df_filtrado[df_filtrado["Status"] == filtro_status]
+
+    # Ordenar por saldo (maior para menor)
+    df_filtrado = df_filtrado.sort_values(by="Saldo", ascending=False)
+
+    # Exibir tabela customizada incluindo a nova coluna "Dias de Caixa"
+    st.markdown("### Status de Usuários")
+    # Cabeçalho
+    col_u, col_s, col_sc, col_se, col_stat, col_d, col_df = st.columns([2, 2, 2, 2, 1.5, 3, 2])
+    col_u.markdown("**Usuário**")
+    col_s.markdown("**Saldo Total**")
+    col_sc.markdown("**Saldo Colab.**")
+    col_se.markdown("**Saldo Emp.**")
+    col_stat.markdown("**Status**")
+    col_d.markdown("**Dias de Caixa**")
+    col_df.markdown("**Fechamento do Caixa**")
+
+    hoje = datetime.now().date()
+    # Para cada usuário calcular dias de caixa aberto
+    for _, row in df_filtrado.iterrows():
+        usuario = row["Usuário"]
+        saldo_total_fmt = row["Saldo_Formatado"]
+        status = row["Status"]
+        cor = row.get("Cor", "black")
+
+        # Saldos separados (já calculados na consulta de status)
+        saldo_colab_fmt = formatar_valor(row["Saldo_Colaborador"])
+        saldo_emp_fmt = formatar_valor(row["Saldo_Emprestado"])
+
+        # Caixa em aberto: dias desde a abertura e data de fechamento
+        dias_display = ""
+        dias_color = None
+        data_fechamento = ""
+        fechamento = row["Fechamento_Caixa"] if pd.notna(row["Fechamento_Caixa"]) else None
+        if fechamento:
+            dias = int(row["Dias_Caixa"])
+            dias_display = f"{dias} dias de caixa em aberto"
+
+            if dias >= 30:
+                dias_color = "red"
+            elif dias >= 25:
+                dias_color = "orange"
+
+            data_fechamento = fechamento.strftime('%d/%m/%Y')
+        # Caso contrário, caixa está FECHADO - não mostrar nada
+
+        # Renderizar linha
+        col_u, col_s, col_sc, col_se, col_stat, col_d, col_df = st.columns([2, 2, 2, 2, 1.5, 3, 2])
+        col_u.write(usuario)
+        color_map = {"blue":"#0b5394","green":"#198754","orange":"#ff9900","red":"#d9534f"}
+        saldo_color = color_map.get(cor, "black")
+        col_s.markdown(f"<span style='color:{saldo_color}; font-weight:bold'>{saldo_total_fmt}</span>", unsafe_allow_html=True)
+        col_sc.write(saldo_colab_fmt)
+        col_se.write(saldo_emp_fmt)
+        col_stat.write(status)
+        if dias_display:
+            if dias_color == "red":
+                col_d.markdown(f"<span style='color:red; font-weight:bold'>{dias_display}</span>", unsafe_allow_html=True)
+            elif dias_color == "orange":
+                col_d.markdown(f"<span style='color:orange; font-weight:bold'>{dias_display}</span>", unsafe_allow_html=True)
+            else:
+                col_d.write(dias_display)
+        else:
+            col_d.write("")
+        # Exibir data de fechamento do caixa com cor vermelha se já chegou ou passou
+        if fechamento and hoje >= fechamento:
+            col_df.markdown(f"<span style='color:red; font-weight:bold'>{data_fechamento}</span>", unsafe_allow_html=True)
+        elif data_fechamento:
+            col_df.markdown(f"<span style='color:blue; font-weight:bold'>{data_fechamento}</span>", unsafe_allow_html=True)
+        else:
+            col_df.write("")
+
+@secao_interface("Dashboard")
+def secao_dashboard():
+    status_por_usuario = {u["Usuário"]: u for u in obter_status_usuarios()}
+    # Filtro por mês e ano
+    st.subheader("Filtrar por mês e ano")
+    meses = ["Todos", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+    mes_atual = datetime.now().month
+    anos_disponiveis = obter_anos_transacoes()
+    if not anos_disponiveis:
+        anos_disponiveis = [str(datetime.now().year)]
+    mes_selecionado = st.selectbox("Selecione o mês:", options=meses, index=mes_atual)
+    ano_selecionado = st.selectbox("Selecione o ano:", options=anos_disponiveis, index=0)
+    # Só as transações do período são lidas (filtro por ano/mes no SQL)
+    mes_numero = None if mes_selecionado == "Todos" else meses.index(mes_selecionado)
+    df_filtrado_mes = pd.DataFrame(
+        obter_transacoes(ano=int(ano_selecionado), mes=mes_numero),
+        columns=["usuario", "perfil", "valor_centavos", "descricao", "data_ts", "mes"]
+    )
+    df_filtrado_mes['valor'] = df_filtrado_mes['valor_centavos'] / 100
+    df_filtrado_mes['data'] = pd.to_datetime(df_filtrado_mes['data_ts'], unit='s')
+
+    # Dashboard Principal
+    st.subheader("Dashboard Principal")
+    col1, col2, col3, col4 = st.columns(4)
+
+    # Filtrar apenas transações que não são do tipo Caixa
+    df_saidas = df_filtrado_mes[~df_filtrado_mes['perfil'].isin(['Saída de Caixa', 'Entrada de Caixa'])]
+
+    with col1:
+        total_transacoes = len(df_saidas)
+        st.metric("Total de Transações", total_transacoes)
+
+    with col2:
+        valor_total = df_saidas['valor'].sum()
+        st.metric("Valor Total Gasto", moeda.formatar_centavos(df_saidas['valor_centavos'].sum()))
+
+    with col3:
+        usuarios_ativos = len(df_saidas['usuario'].unique())
+        st.metric("Usuários Ativos", usuarios_ativos)
+
+    with col4:
+        ticket_medio = valor_total / total_transacoes if total_transacoes > 0 else 0
+        st.metric("Ticket Médio", formatar_valor(ticket_medio))
+
+    # Gráficos e Visualizações
+    st.subheader("Análise de Transações")
+
+    # Gráfico de barras com transações por dia - apenas saídas
+    df_saidas = df_filtrado_mes[~df_filtrado_mes['perfil'].isin(['Saída de Caixa', 'Entrada de Caixa'])]
+    df_saidas['dia'] = df_saidas['data'].dt.day
+    fig_dia = px.bar(
+        df_saidas.groupby('dia').size().reset_index(name='count'),
+        x='dia',
+        y='count',
+        title=f'Transações por Dia - {mes_selecionado}',
+        labels={'dia': 'Dia', 'count': 'Número de Saídas'}
+    )
+    st.plotly_chart(fig_dia, use_container_width=True)
+
+    # Gráfico de pizza com distribuição por tipo de transação
+    df_pizza = df_filtrado_mes[~df_filtrado_mes['perfil'].isin(['Saída de Caixa', 'Entrada de Caixa'])]
+    fig_tipo = px.pie(
+        df_pizza,
+        names='perfil',
+        values='valor',
+        title=f'Distribuição de Custos por Tipo de Transação - {mes_selecionado}'
+    )
+    st.plotly_chart(fig_tipo, use_container_width=True)
+
+    # Métricas por Usuário
+    st.subheader("Métricas por Usuário")
+
+    # Ranking de usuários por valor gasto
+    df_usuarios = df_filtrado_mes[~df_filtrado_mes['perfil'].isin(['Saída de Caixa', 'Entrada de Caixa'])].groupby('usuario')['valor'].sum().reset_index()
+    df_usuarios = df_usuarios.sort_values('valor', ascending=False)
+
+    fig_ranking = px.bar(
+        df_usuarios,
+        x='usuario',
+        y='valor',
+        title=f'Ranking de Usuários por Valor Gasto - {mes_selecionado}'
+    )
+    st.plotly_chart(fig_ranking, use_container_width=True)
+
+    # Alertas e Indicadores
+    st.subheader("Transações por Usuário")
+
+    # Usuários com saldo negativo
+    usuarios_negativo = [u for u in df_filtrado_mes['usuario'].unique() if u in status_por_usuario and status_por_usuario[u]["Saldo"] < 0]
+    if usuarios_negativo:
+        st.warning(f"Usuários com saldo negativo: {', '.join(usuarios_negativo)}")
+
+    # Transações acima da média - excluindo Caixa
+    df_sem_caixa = df_filtrado_mes[~df_filtrado_mes['perfil'].isin(['Saída de Caixa', 'Entrada de Caixa'])]
+    if not df_sem_caixa.empty:
+        media_transacao = df_sem_caixa['valor'].mean()
+        transacoes_acima_media = df_sem_caixa[df_sem_caixa['valor'] > media_transacao * 1.5]
+
+        if not transacoes_acima_media.empty:
+            st.warning(f"Transações acima de 50% da média: {len(transacoes_acima_media)}")
+
+            # CSS personalizado para os cards
+            st.markdown("""
+            <style>
+            .card {
+                border-radius: 10px;
+                box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+                padding: 15px;
+                margin-bottom: 15px;
+                background-color: #ffffff;
+                border-left: 5px solid #ff4b4b;
+            }
+            .card-title {
+                color: #333333;
+                font-weight: bold;
+                font-size: 16px;
+                margin-bottom: 8px;
+            }
+            .card-value {
+                color: #ff4b4b;
+                font-weight: bold;
+                font-size: 18px;
+                margin-bottom: 5px;
+            }
+            .card-detail {
+                color: #666666;
+                margin-bottom: 3px;
+                display: flex;
+            }
+            .card-label {
+                min-width: 100px;
+                font-weight: 500;
+            }
+            .percentage-high {
+                background-color: #ffeeee;
+                padding: 2px 8px;
+                border-radius: 10px;
+                color: #ff4b4b;
+                font-weight: bold;
+                display: inline-block;
+                margin-left: 8px;
+            }
+            </style>
+            """, unsafe_allow_html=True)
+
+            # Botão para mostrar/ocultar transações acima da média
+            if "mostrar_transacoes_acima" not in st.session_state:
+                st.session_state.mostrar_transacoes_acima = False
+
+            button_text = "Ocultar transações acima da média" if st.session_state.mostrar_transacoes_acima else "Ver transações acima da média"
+            if st.button(button_text):
+                st.session_state.mostrar_transacoes_acima = not st.session_state.mostrar_transacoes_acima
+                reexecutar_secao()
+
+            if st.session_state.mostrar_transacoes_acima:
+                st.subheader("Detalhes das transações acima da média")
+
+                # Ordenar transações da mais alta para a mais baixa em relação à média
+                transacoes_ordenadas = transacoes_acima_media.sort_values(by='valor', ascending=False)
+
+                for _, row in transacoes_ordenadas.iterrows():
+                    usuario = row['usuario']
+                    valor_formatado = formatar_valor(row['valor'])
+                    valor_numerico = float(row['valor'])
+                    percentual = (valor_numerico / media_transacao) * 100 - 100
+                    data = row['data'].strftime('%d/%m/%Y') if hasattr(row['data'], 'strftime') else row['data']
+                    perfil = row['perfil']
+                    descricao = row['descricao'] if 'descricao' in row and row['descricao'] else "Sem descrição"
+
+                    # Card HTML para cada transação
+                    st.markdown(f"""
+                    <div class="card">
+                        <div class="card-title">Transação de {usuario}</div>
+                        <div class="card-value">{valor_formatado} <span class="percentage-high">{percentual:.1f}% da média</span></div>
+                        <div class="card-detail"><span class="card-label">Data:</span> {data}</div>
+                        <div class="card-detail"><span class="card-label">Categoria:</span> {perfil}</div>
+                        <div class="card-detail"><span class="card-label">Descrição:</span> {descricao}</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                # Resumo estatístico
+                st.markdown("### Resumo Estatístico")
+                col2, col3 = st.columns(2)
+                with col2:
+                    st.metric("Maior transação", formatar_valor(transacoes_ordenadas['valor'].max()))
+                with col3:
+                    st.metric("Total acima da média", formatar_valor(transacoes_ordenadas['valor'].sum()))
+
+@secao_interface("Transações por usuário")
+def secao_transacoes_usuario():
+    # Ver detalhes de um usuário específico
+    # Usuários em ordem de saldo (maior para menor), como na tabela de status
+    usuarios_por_saldo = sorted(obter_status_usuarios(), key=lambda u: u["Saldo"], reverse=True)
+    usuario_selecionado = st.selectbox("Ver detalhes de transações do usuário:", options=[u["Usuário"] for u in usuarios_por_saldo])
+
+    # Sempre mostrar transações
+    st.session_state['ver_transacoes'] = True
+
+    if st.session_state.get('ver_transacoes', False):
+        st.subheader(f"Transações de {usuario_selecionado}")
+
+        # Obter transações do usuário selecionado
+        if contar_transacoes(usuario=usuario_selecionado):
+            # Filtros por mês e ano
+            meses = ["Todos", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+            ano_atual = datetime.now().year
+            anos_disponiveis = obter_anos_transacoes(usuario_selecionado)
+            if not anos_disponiveis:
+                anos_disponiveis = [str(ano_atual)]
+            col_mes, col_ano = st.columns(2)
+            with col_mes:
+                mes_filtro_nome = st.selectbox("Filtrar por mês", meses, index=datetime.now().month, key="mes_filtro_usuario_sup")
+            with col_ano:
+                ano_filtro = st.selectbox("Filtrar por ano", anos_disponiveis, key="ano_filtro_usuario_sup")
+            # Filtros por ano e mês aplicados no SQL
+            mes_filtro = None if mes_filtro_nome == "Todos" else meses.index(mes_filtro_nome)
+            df_filtrado_usuario = obter_dataframe_transacoes(usuario_selecionado, ano=int(ano_filtro), mes=mes_filtro)
+            # Exibir tabela de transações do usuário
+            if not df_filtrado_usuario.empty:
+                df_display = df_filtrado_usuario.copy()
+                df_display["Valor"] = df_display["Símbolo"] + " R$ " + df_display["Valor_Display"]
+                modo_exibicao_sup = st.radio("Exibição", MODOS_EXIBICAO_TRANSACOES, horizontal=True, key="modo_exibicao_transacoes_sup")
+                if modo_exibicao_sup == "Tabela":
+                    selecionada = exibir_grade_transacoes(
+                        df_display, chave=f"grade_transacoes_sup_{usuario_selecionado}_{ano_filtro}_{mes_filtro}", mostrar_tipo=True
+                    )
+                    if selecionada is not None and selecionada["Foto"]:
+                        exibir_foto_transacao(selecionada, chave=f"sup_{selecionada['ID']}", rendicao="previa")
+                else:
+                    for index, row in df_display.iterrows():
+                        col1, col1b, col2, col3, col4, col5, col6 = st.columns([1.5, 1, 2, 2, 3, 1, 1])
+                        with col1:
+                            st.write(row["Data"].split(" ")[0])  # Data
+                        with col1b:
+                            st.write(row["Hora"])  # Hora
+                        with col2:
+                            st.write(row["Perfil"])
+                        with col3:
+                            if row["Símbolo"] == "+":
+                                st.markdown(f"<span style='color:green'>+ R$ {row['Valor_Display']}</span>", unsafe_allow_html=True)
+                            else:
+                                st.markdown(f"<span style='color:red'>- R$ {row['Valor_Display']}</span>", unsafe_allow_html=True)
+                        with col4:
+                            st.write(row["Descrição"])
+                        with col5:
+                            st.write(row["Tipo"])
+                        with col6:
+                            if row["Foto"]:
+                                if st.button("📷", key=f"foto_sup_{row['ID']}_{index}"):
+                                    st.session_state[f"mostrar_foto_sup_{row['ID']}"] = not st.session_state.get(f"mostrar_foto_sup_{row['ID']}", False)
+                                    reexecutar_secao()
+                        if st.session_state.get(f"mostrar_foto_sup_{row['ID']}", False) and row["Foto"]:
+                            exibir_foto_transacao(row, chave=f"sup_{row['ID']}_{index}")
+                            if st.button("Fechar foto", key=f"fechar_foto_sup_{row['ID']}_{index}"):
+                                st.session_state[f"mostrar_foto_sup_{row['ID']}"] = False
+                                reexecutar_secao()
+                        st.markdown("---")
+                # Mostrar saldo do período filtrado usando valores numéricos
+                total_entradas = int(df_display.loc[df_display["Tipo"] == "Entrada", "Valor_Centavos"].sum())
+                total_saidas = int(df_display.loc[df_display["Tipo"] == "Saída", "Valor_Centavos"].sum())
+                saldo_periodo = total_entradas - total_saidas
+                # Exibir saldos separados
+                st.subheader("Resumo do Período")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Total de Entradas", moeda.formatar_centavos(total_entradas))
+                with col2:
+                    st.metric("Total de Saídas", moeda.formatar_centavos(total_saidas))
+                with col3:
+                    saldo_texto = moeda.formatar_centavos(saldo_periodo)
+                    if saldo_periodo >= 0:
+                        st.metric("Saldo do Período", saldo_texto)
+                    else:
+                        st.metric("Saldo do Período", saldo_texto, delta_color="inverse")
+            else:
+                st.info("Nenhuma transação encontrada para este usuário no filtro selecionado.")
+
+            # Exibir saldos separados do usuário selecionado
+            st.subheader("Saldos do Usuário")
+            saldos_usuario = obter_saldos_separados(usuario_selecionado)
+            col1, col2 = st.columns(2)
+            with col1:
+                saldo_colab = saldos_usuario['colaborador']
+                saldo_colab_fmt = formatar_valor(saldo_colab)
+                st.markdown("**Saldo do Colaborador:**")
+                if saldo_colab >= 0:
+                    st.success(f"{saldo_colab_fmt}")
+                else:
+                    st.error(f"{saldo_colab_fmt}")
+                    st.info("💡 Este valor será devolvido pela empresa")
+            with col2:
+                saldo_emp = saldos_usuario['emprestado']
+                saldo_emp_fmt = formatar_valor(saldo_emp)
+                st.markdown("**Saldo Emprestado:**")
+                if saldo_emp >= 0:
+                    st.warning(f"{saldo_emp_fmt}")
+                    if saldo_emp > 0:
+                        st.info("💡 Este valor deve ser devolvido")
+                else:
+                    st.error(f"{saldo_emp_fmt}")
+
+            # Exportação em fragmento próprio: o download não reexecuta o restante da seção
+            secao_exportacao(usuario_selecionado, ano_filtro, mes_filtro)
+
+@secao_interface("Exportação CSV")
+def secao_exportacao(usuario_selecionado, ano_filtro, mes_filtro):
+    csv = gerar_csv_transacoes(usuario_selecionado, int(ano_filtro), mes_filtro)
+
+    st.download_button(
+        label="📄 Baixar CSV das Transações",
+        data=csv,
+        file_name=f"transacoes_{usuario_selecionado}.csv",
+        mime="text/csv"
+    )
+
+@secao_interface("Manutenção")
+def secao_manutencao():
+    # Manutenção: conferir/reconstruir a tabela de saldos materializados e o
+    # registro das fotos, acompanhar o cache de leituras
+    with st.expander("Manutenção"):
+        col_verificar, col_reconstruir = st.columns(2)
+        with col_verificar:
+            if st.button("Verificar saldos"):
+                try:
+                    divergencias = verificar_saldos()
+                    if divergencias:
+                        st.warning(f"{len(divergencias)} saldo(s) divergente(s) do histórico.")
+                        st.dataframe(pd.DataFrame(divergencias), hide_index=True)
+                    else:
+                        st.success("Saldos conferem com o histórico de transações.")
+                except Exception as e:
+                    st.error(f"Erro ao verificar saldos: {str(e)}")
+        with col_reconstruir:
+            if st.button("Reconstruir saldos"):
+                try:
+                    reconstruir_saldos()
+                    st.success("Saldos reconstruídos a partir do histórico.")
+                except Exception as e:
+                    st.error(f"Erro ao reconstruir saldos: {str(e)}")
+
+        # Situação do cache de leituras do processo
+        st.caption("Cache de leituras")
+        st.dataframe(pd.DataFrame([estatisticas_cache_leituras()]), hide_index=True)
+
+        # Fila de processamento de fotos em segundo plano (desde o início do processo)
+        st.caption("Processamento de fotos")
+        st.dataframe(pd.DataFrame([estatisticas_fotos()]), hide_index=True)
+        # Tabela fotos x transações x disco (arquivos apagados ou copiados à mão)
+        col_verificar_fotos, col_corrigir_fotos = st.columns(2)
+        with col_verificar_fotos:
+            if st.button("Verificar fotos"):
+                try:
+                    divergencias_fotos = verificar_fotos()
+                    if divergencias_fotos:
+                        st.warning(f"{len(divergencias_fotos)} divergência(s) entre o registro das fotos e o disco.")
+                        st.dataframe(pd.DataFrame(divergencias_fotos), hide_index=True)
+                    else:
+                        st.success("Registro das fotos confere com o disco.")
+                except Exception as e:
+                    st.error(f"Erro ao verificar fotos: {str(e)}")
+        with col_corrigir_fotos:
+            if st.button("Corrigir fotos"):
+                try:
+                    st.success(f"{corrigir_fotos()} foto(s) corrigida(s).")
+                except Exception as e:
+                    st.error(f"Erro ao corrigir fotos: {str(e)}")
+        # Fotos gravadas antes das miniaturas (ou de um perfil novo): gerar as versões reduzidas em segundo plano
+        if st.button("Gerar miniaturas das fotos existentes"):
+            agendar_rendicoes_faltantes()
+            st.toast("Gerando miniaturas em segundo plano.", icon="⏳")
+        # Fotos gravadas com perfis antigos (resolução da câmera, JPEG 95):
+        # recodificar com o perfil de comprovante atual
+        simular = st.checkbox("Apenas simular a recodificação", value=True)
+        if st.button("Recodificar fotos existentes"):
+            try:
+                with st.spinner("Recodificando fotos..."):
+                    relatorio = recodificar_fotos(aplicar=not simular)
+                st.dataframe(pd.DataFrame([resumir_recodificacao(relatorio)]), hide_index=True)
+                if relatorio:
+                    st.dataframe(pd.DataFrame(relatorio), hide_index=True)
+            except Exception as e:
+                st.error(f"Erro ao recodificar fotos: {str(e)}")
+
+        # Tempo da última execução de cada seção: uma interação reexecuta só a
+        # seção correspondente; "Execução completa" é o custo de um rerun do app todo
+        st.caption("Tempo da última execução (ms)")
+        tempos = st.session_state.get("tempos_secoes", {})
+        st.dataframe(
+            pd.DataFrame({"Seção": list(tempos), "Tempo (ms)": [round(t, 1) for t in tempos.values()]}),
+            hide_index=True
+        )
+
+# Login do supervisor e painel
+st.subheader("Painel do Supervisor")
+
+# Verificar se o usuário está logado e é supervisor
+if "usuario" not in st.session_state or "tipo" not in st.session_state or st.session_state["tipo"] != "supervisor":
+    st.warning("Você precisa estar logado como supervisor para acessar esta área.")
+    nome = st.text_input("Nome")
+    senha = st.text_input("Senha", type="password")
+    if st.button("Entrar"):  # Botão padronizado
+        if nome and senha:
+            tipo_usuario = verificar_usuario(nome, senha)
+            if tipo_usuario == "supervisor":
+                st.session_state["usuario"] = nome
+                st.session_state["tipo"] = tipo_usuario
+                st.success(f"Bem-vindo, Supervisor {st.session_state['usuario']}!")
+                st.rerun()
+            else:
+                st.error("Acesso negado. Esta área é restrita para supervisores.")
+        else:
+            st.warning("Por favor, preencha todos os campos!")
+else:
+    # Conteúdo do painel do supervisor
+    if obter_status_usuarios():
+        secao_status_usuarios()
+        secao_dashboard()
+        secao_transacoes_usuario()
+    secao_manutencao()
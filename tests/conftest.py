@@ -0,0 +1,19 @@
+"""
+Fixtures dos testes: cada teste usa um banco novo em um diretório temporário
+(que também recebe fotos/), com todas as migrações aplicadas.
+"""
+import pytest
+
+from tripledger import storage
+from tripledger.migracoes import aplicar_migracoes
+
+
+@pytest.fixture
+def banco(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "dados.db"))
+    # O cache de leituras é do processo: entradas de outro banco não servem
+    storage.invalidar_cache_leituras()
+    aplicar_migracoes()
+    yield tmp_path
+    storage.invalidar_cache_leituras()
@@ -0,0 +1,62 @@
+"""
+Cache de leituras (storage.ler_com_cache): acertos sem nova consulta,
+recarga após escritas deste ou de outro processo e limite de entradas com
+descarte da menos usada.
+"""
+import sqlite3
+
+from tripledger import ledger, storage
+
+
+# Função para montar um `carregar` que conta as chamadas e devolve o valor dado
+def _carga(valor, chamadas):
+    def carregar():
+        chamadas.append(valor)
+        return valor
+    return carregar
+
+
+def test_segunda_leitura_e_acerto_sem_carregar(banco):
+    chamadas = []
+    acertos = storage.estatisticas_cache_leituras()["Acertos"]
+    assert storage.ler_com_cache("chave", _carga(1, chamadas)) == 1
+    assert storage.ler_com_cache("chave", _carga(2, chamadas)) == 1
+    assert chamadas == [1]
+    assert storage.estatisticas_cache_leituras()["Acertos"] == acertos + 1
+
+
+def test_escritas_recarregam_as_leituras(banco):
+    ledger.adicionar_usuario("ana.souza", "123")
+    ledger.adicionar_transacao("ana.souza", "entrada", "100", "", "Entrada de Caixa", "03/10/2025 08:00:00")
+    assert len(ledger.obter_transacoes(usuario="ana.souza")) == 1
+
+    # Escrita pelo app
+    ledger.adicionar_transacao("ana.souza", "saida", "25,50", "almoço", "Almoço", "03/10/2025 12:00:00")
+    assert len(ledger.obter_transacoes(usuario="ana.souza")) == 2
+    assert ledger.obter_saldos_separados("ana.souza")["colaborador"] == 74.5
+
+    # Escrita por outro processo: outra conexão, sem invalidar_cache_leituras;
+    # só o contador (triggers) avisa este processo
+    outra = sqlite3.connect(storage.DB_PATH)
+    outra.execute("UPDATE transacoes SET descricao = 'jantar' WHERE descricao = 'almoço'")
+    outra.commit()
+    outra.close()
+    assert [t["descricao"] for t in ledger.obter_transacoes(usuario="ana.souza")] == ["jantar", ""]
+
+
+def test_limite_de_entradas_descarta_a_menos_usada(banco, monkeypatch):
+    monkeypatch.setattr(storage, "CACHE_LEITURAS_TAMANHO", 3)
+    chamadas = []
+    for chave in ("a", "b", "c"):
+        storage.ler_com_cache(chave, _carga(chave, chamadas))
+    # "a" lida de novo passa a ser a mais recente; "b" é a menos usada
+    storage.ler_com_cache("a", _carga("a", chamadas))
+    storage.ler_com_cache("d", _carga("d", chamadas))
+    assert storage.estatisticas_cache_leituras()["Entradas"] == 3
+    assert chamadas == ["a", "b", "c", "d"]
+
+    storage.ler_com_cache("a", _carga("a", chamadas))
+    assert chamadas == ["a", "b", "c", "d"]
+    storage.ler_com_cache("b", _carga("b", chamadas))
+    assert chamadas == ["a", "b", "c", "d", "b"]
+    assert storage.estatisticas_cache_leituras()["Entradas"] == 3
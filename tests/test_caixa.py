@@ -0,0 +1,66 @@
+"""
+Status do caixa (abertura/fechamento) sob escritas simultâneas e falhas.
+"""
+import threading
+import time
+
+from tripledger import caixa, ledger
+from tripledger.storage import conexao_banco
+
+
+# Função para listar (perfil, status_caixa) das transações do usuário em ordem
+def _status_caixa(usuario):
+    with conexao_banco() as conn:
+        return [tuple(row) for row in conn.execute(
+            "SELECT perfil, status_caixa FROM transacoes WHERE usuario = ? ORDER BY data_ts, rowid", (usuario,)
+        ).fetchall()]
+
+
+def test_entradas_simultaneas_abrem_o_caixa_uma_vez(banco, monkeypatch):
+    # Atraso entre a leitura do saldo e a gravação: sem o lock de escrita, as
+    # duas inclusões leriam o saldo zerado e ambas abririam o caixa
+    extrair = ledger.extrair_data_para_date
+
+    def extrair_devagar(data):
+        time.sleep(0.2)
+        return extrair(data)
+
+    monkeypatch.setattr(ledger, "extrair_data_para_date", extrair_devagar)
+    resultados = []
+
+    def incluir(hora):
+        resultados.append(ledger.adicionar_transacao(
+            "ana.souza", "entrada", "50", "", "Entrada de Caixa", f"03/10/2025 {hora}:00:00"
+        ))
+
+    threads = [threading.Thread(target=incluir, args=(hora,)) for hora in ("08", "09")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert resultados == [True, True]
+    aberturas = [status for _, status in _status_caixa("ana.souza") if status]
+    assert len(aberturas) == 1
+    assert ledger.obter_saldos_centavos("ana.souza")["colaborador"] == 10000
+
+
+def _falhar_recalculo(*args, **kwargs):
+    raise RuntimeError("falha simulada no recálculo do caixa")
+
+
+def test_falha_no_recalculo_desfaz_exclusao_e_edicao(banco, monkeypatch):
+    ledger.adicionar_transacao("ana.souza", "entrada", "50", "", "Entrada de Caixa", "03/10/2025 08:00:00")
+    ledger.adicionar_transacao("ana.souza", "saida", "50", "", "Saída de Caixa", "03/10/2025 18:00:00")
+    antes = _status_caixa("ana.souza")
+    saldos_antes = ledger.obter_saldos_centavos("ana.souza")
+    id_saida = ledger.obter_transacoes(usuario="ana.souza")[0]["id_transacao"]
+
+    monkeypatch.setattr(caixa, "_simular_caixa", _falhar_recalculo)
+    assert ledger.excluir_transacao(id_saida) is False
+    assert ledger.atualizar_transacao(id_saida, "saida", "20", "", "Saída de Caixa", "03/10/2025 19:00:00") is False
+
+    # Exclusão e edição desfeitas por inteiro: transação, saldo e caixa intactos
+    assert ledger.obter_transacao(id_saida)["valor_centavos"] == 5000
+    assert _status_caixa("ana.souza") == antes
+    assert ledger.obter_saldos_centavos("ana.souza") == saldos_antes
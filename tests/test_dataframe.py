@@ -0,0 +1,46 @@
+"""
+ledger.criar_dataframe_transacoes (operações colunares) contra a montagem
+linha a linha anterior (benchmarks/dataframe_transacoes.py).
+"""
+import pandas as pd
+import pandas.testing as pdt
+
+from benchmarks.dataframe_transacoes import criar_dataframe_linha_a_linha, gerar_transacoes
+from tripledger import ledger
+
+# Colunas que a montagem linha a linha produzia
+COLUNAS_ANTIGAS = [
+    "Data", "Data_ts", "Hora", "Data_Ordenacao", "Perfil", "Valor", "Valor_Centavos",
+    "Valor_Display", "Símbolo", "Cor", "Descrição", "ID", "Tipo", "Foto",
+]
+
+
+# Função para comparar as duas montagens, descontadas as diferenças
+# intencionais: Valor_Display com separador de milhar e Foto "" em vez de None
+def _comparar(transacoes):
+    antigo = criar_dataframe_linha_a_linha(transacoes).reset_index(drop=True)
+    novo = ledger.criar_dataframe_transacoes(transacoes).reset_index(drop=True)
+    antigo["Foto"] = antigo["Foto"].fillna("")
+    novo["Valor_Display"] = novo["Valor_Display"].str.replace(".", "", regex=False)
+    pdt.assert_frame_equal(novo[COLUNAS_ANTIGAS], antigo[COLUNAS_ANTIGAS], check_dtype=False)
+
+
+def test_equivale_a_montagem_linha_a_linha():
+    transacoes = gerar_transacoes(5000)
+    # Empates de data_ts: a ordenação estável mantém a ordem da consulta
+    transacoes[1]["data"], transacoes[1]["data_ts"] = transacoes[0]["data"], transacoes[0]["data_ts"]
+    _comparar(transacoes)
+
+
+def test_equivale_com_transacoes_do_banco(banco):
+    ledger.adicionar_usuario("ana.souza", "123")
+    ledger.adicionar_transacao("ana.souza", "entrada", "1234,56", "", "Entrada de Caixa", "03/10/2025 08:00:00")
+    ledger.adicionar_transacao("ana.souza", "saida", "25,5", "almoço", "Almoço", "03/10/2025 12:30:00")
+    ledger.adicionar_transacao("ana.souza", "saida", "0,01", None, "Outros Serviços", "2025-10-04 23:59:59")
+    _comparar(ledger.obter_transacoes(usuario="ana.souza"))
+
+
+def test_entrada_vazia_tem_as_colunas():
+    df = ledger.criar_dataframe_transacoes([])
+    assert df.empty
+    assert list(df.columns) == ledger.COLUNAS_DATAFRAME_TRANSACOES
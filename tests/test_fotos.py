@@ -0,0 +1,153 @@
+"""
+Arquivos de foto: o mesmo envio é gravado uma vez, versões reduzidas de outro
+perfil têm outro endereço, e a migração para o endereçamento por conteúdo e a
+remoção de fotos só apagam arquivos do próprio banco, nunca os de outro banco
+que use a mesma pasta.
+"""
+import io
+import os
+import sqlite3
+
+from tripledger import estaticos, ledger, photos, storage
+from tripledger.migracoes import aplicar_migracoes
+
+
+# Função para gerar os bytes de um JPEG pequeno (cores diferentes, arquivos diferentes)
+def _jpeg(cor):
+    from PIL import Image
+    saida = io.BytesIO()
+    Image.new("RGB", (40, 30), cor).save(saida, "JPEG")
+    return saida.getvalue()
+
+
+def _gravar(caminho, dados):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "wb") as f:
+        f.write(dados)
+
+
+def test_migracao_apaga_so_as_fotos_antigas_migradas(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "antigo.db"))
+    conn = sqlite3.connect(storage.DB_PATH)
+    conn.execute("CREATE TABLE usuarios (id INTEGER PRIMARY KEY AUTOINCREMENT, nome TEXT NOT NULL, senha TEXT NOT NULL, tipo TEXT DEFAULT 'colaborador')")
+    conn.execute("""
+        CREATE TABLE transacoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, id_transacao TEXT, usuario TEXT NOT NULL, tipo TEXT NOT NULL,
+            valor REAL NOT NULL, descricao TEXT, perfil TEXT NOT NULL, data TEXT NOT NULL, caminho_foto TEXT
+        )
+    """)
+    conn.execute("INSERT INTO usuarios (nome, senha) VALUES ('ana.souza', '123')")
+    conn.execute("""
+        INSERT INTO transacoes (id_transacao, usuario, tipo, valor, descricao, perfil, data, caminho_foto)
+        VALUES ('t1', 'ana.souza', 'saida', 10.0, 'almoço', 'Almoço', '2025-10-03 12:00:00', 'fotos/t1.jpg')
+    """)
+    conn.commit()
+    conn.close()
+    _gravar("fotos/t1.jpg", _jpeg("red"))
+    _gravar("fotos/previas/t1.jpg", _jpeg("red"))
+    # Foto de outro banco na mesma pasta, no formato antigo
+    _gravar("fotos/outra.jpg", _jpeg("blue"))
+
+    aplicar_migracoes()
+    assert photos.remover_fotos_legadas() == 2
+
+    with storage.conexao_banco() as conn:
+        caminho_novo = conn.execute("SELECT caminho_foto FROM transacoes").fetchone()[0]
+        assert conn.execute("SELECT COUNT(*) FROM fotos_legadas").fetchone()[0] == 0
+    assert photos.endereco_por_conteudo(caminho_novo)
+    assert os.path.exists(caminho_novo)
+    assert os.path.exists(photos.caminho_rendicao(caminho_novo, "previa"))
+    assert not os.path.exists("fotos/t1.jpg")
+    assert not os.path.exists("fotos/previas/t1.jpg")
+    assert os.path.exists("fotos/outra.jpg")
+
+
+def test_copia_do_banco_nao_apaga_fotos(banco, monkeypatch):
+    with photos.ingerir_foto(_jpeg("green")) as caminho_foto:
+        pass
+    # O banco do app é o primeiro a usar a pasta
+    assert photos.pasta_fotos_do_banco()
+
+    # Cópia pela API de backup: o arquivo sozinho não tem o que está no WAL
+    destino = sqlite3.connect(banco / "copia.db")
+    with storage.conexao_banco() as conn:
+        conn.backup(destino)
+    destino.close()
+    with monkeypatch.context() as m:
+        m.setattr(storage, "DB_PATH", str(banco / "copia.db"))
+        assert not photos.pasta_fotos_do_banco()
+        assert photos.liberar_foto(caminho_foto)
+    assert os.path.exists(caminho_foto)
+
+    assert photos.liberar_foto(caminho_foto)
+    assert not os.path.exists(caminho_foto)
+
+
+def test_reenvio_reaproveita_a_foto_mesmo_com_codificacao_diferente(banco, monkeypatch):
+    # Codificador que nunca produz os mesmos bytes (outra versão do Pillow, outro perfil)
+    codificar = photos._codificar_imagem
+    monkeypatch.setattr(photos, "_codificar_imagem", lambda *args: codificar(*args) + os.urandom(8))
+    foto = _jpeg("red")
+    with photos.ingerir_foto(foto) as primeiro:
+        pass
+    with photos.ingerir_foto(foto) as segundo:
+        pass
+    assert segundo == primeiro
+    with storage.conexao_banco() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM fotos").fetchone()[0] == 1
+
+    # Foto removida: o próximo envio grava o arquivo de novo
+    assert photos.liberar_foto(primeiro)
+    with photos.ingerir_foto(foto) as terceiro:
+        pass
+    assert os.path.exists(terceiro)
+
+
+def test_escritas_em_fotos_mudam_a_versao_do_cache(banco):
+    # Só a tabela fotos é escrita: o cache de leituras precisa perceber cada uma
+    versoes = [storage.versao_dados()]
+    with photos.ingerir_foto(_jpeg("yellow")) as caminho_foto:
+        pass
+    versoes.append(storage.versao_dados())
+    with storage.conexao_banco() as conn:
+        conn.execute("UPDATE fotos SET status = ? WHERE caminho = ?", (photos.ARQUIVO_SEM_VERSOES, caminho_foto))
+    versoes.append(storage.versao_dados())
+    assert photos.liberar_foto(caminho_foto)
+    versoes.append(storage.versao_dados())
+    assert versoes == sorted(set(versoes))
+
+
+def test_perfil_novo_das_versoes_reduzidas_muda_a_url(banco, monkeypatch):
+    ledger.adicionar_usuario("ana.souza", "123")
+    ledger.adicionar_transacao("ana.souza", "entrada", "100", "", "Entrada de Caixa", "03/10/2025 08:00:00")
+    ledger.adicionar_transacao(
+        "ana.souza", "saida", "25,50", "almoço", "Almoço", "03/10/2025 12:00:00", foto=io.BytesIO(_jpeg("red"))
+    )
+    assert photos.aguardar_fotos(timeout=30)
+    with storage.conexao_banco() as conn:
+        caminho_foto = conn.execute("SELECT caminho_foto FROM transacoes WHERE caminho_foto IS NOT NULL").fetchone()[0]
+    antes = photos.caminho_rendicao(caminho_foto, "miniatura")
+    assert os.path.exists(antes)
+
+    # Mesma foto, versões reduzidas com outra qualidade: o navegador não pode
+    # reaproveitar a miniatura guardada em cache pela URL antiga
+    monkeypatch.setattr(photos, "FOTO_QUALIDADE_RENDICOES", 60)
+    depois = photos.caminho_rendicao(caminho_foto, "miniatura")
+    assert estaticos.url_foto(antes, "http://fotos") != estaticos.url_foto(depois, "http://fotos")
+    assert estaticos.url_foto(depois, "http://fotos") is not None
+    assert {divergencia["Problema"] for divergencia in photos.verificar_fotos()} >= {"versão reduzida de perfil anterior"}
+
+    assert photos.gerar_rendicoes_faltantes() == 1
+    assert os.path.exists(depois)
+    assert not os.path.exists(antes)
+    with storage.conexao_banco() as conn:
+        assert conn.execute("SELECT caminho_miniatura FROM fotos").fetchone()[0] == depois
+    assert photos.verificar_fotos() == []
+
+
+def test_servidor_de_fotos_ouve_so_na_interface_local_por_padrao(monkeypatch):
+    assert estaticos.SERVIDOR_FOTOS["endereco"] == "127.0.0.1"
+    assert estaticos.servidor_somente_local()
+    monkeypatch.setitem(estaticos.SERVIDOR_FOTOS, "endereco", "")
+    assert not estaticos.servidor_somente_local()
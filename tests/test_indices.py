@@ -0,0 +1,125 @@
+"""
+Planos das consultas frequentes (EXPLAIN QUERY PLAN): cada uma deve ser
+atendida pelo seu índice, sem varrer a tabela. As consultas são capturadas das
+próprias funções do pacote, com os parâmetros já aplicados.
+"""
+import sqlite3
+
+import pytest
+
+from tripledger import caixa, ledger, photos, storage
+from tripledger.migracoes import aplicar_migracoes
+
+
+# Função para executar `acao(conn)` capturando o SQL enviado ao banco e devolver
+# o plano de cada consulta sobre as tabelas do app (exceto o contador do cache)
+def _planos(acao):
+    comandos = []
+    storage.invalidar_cache_leituras()
+    with storage.conexao_banco() as conn:
+        conn.set_trace_callback(comandos.append)
+        try:
+            acao(conn)
+        finally:
+            conn.set_trace_callback(None)
+        return [
+            [linha[3] for linha in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+            for sql in comandos
+            if sql.lstrip().upper().startswith(("SELECT", "WITH")) and "contador_alteracoes" not in sql
+        ]
+
+
+@pytest.fixture
+def banco_com_dados(banco):
+    ledger.adicionar_usuario("ana.souza", "123")
+    ledger.adicionar_transacao("ana.souza", "entrada", "100", "", "Entrada de Caixa", "03/10/2025 08:00:00")
+    ledger.adicionar_transacao("ana.souza", "saida", "25,50", "almoço", "Almoço", "03/10/2025 12:00:00")
+    return banco
+
+
+CONSULTAS = [
+    ("login", lambda conn: ledger.verificar_usuario("ana.souza", "123"), "idx_usuarios_nome"),
+    ("lista do usuário", lambda conn: ledger.obter_transacoes(usuario="ana.souza"), "idx_transacoes_usuario_data_ts"),
+    (
+        "página seguinte",
+        lambda conn: ledger.obter_pagina_transacoes_usuario("ana.souza", 20, apos=(1759500000, 2)),
+        "idx_transacoes_usuario_data_ts",
+    ),
+    (
+        "página entre as transações sem data",
+        lambda conn: ledger.obter_pagina_transacoes_usuario("ana.souza", 20, apos=(None, 2)),
+        "idx_transacoes_usuario_data_ts",
+    ),
+    (
+        "mês do usuário",
+        lambda conn: ledger.obter_transacoes(usuario="ana.souza", ano=2025, mes=10),
+        "idx_transacoes_usuario_ano_mes",
+    ),
+    ("mês no painel", lambda conn: ledger.obter_transacoes(ano=2025, mes=10), "idx_transacoes_ano_mes"),
+    ("todas no painel", lambda conn: ledger.obter_transacoes(limite=20), "idx_transacoes_data_ts"),
+    ("contagem do usuário", lambda conn: ledger.contar_transacoes(usuario="ana.souza"), "idx_transacoes_usuario"),
+    ("anos do usuário", lambda conn: ledger.obter_anos_transacoes("ana.souza"), "idx_transacoes_usuario_ano_mes"),
+    (
+        "perfis do usuário",
+        lambda conn: ledger.obter_perfis_usuario("ana.souza"),
+        "idx_transacoes_usuario_origem_perfil",
+    ),
+    # Bancos novos têm a restrição UNIQUE da tabela; os antigos, o índice da migração 5
+    ("transação por id", lambda conn: ledger.obter_transacao("x"), "sqlite_autoindex_transacoes_1"),
+    ("saldos materializados", lambda conn: ledger.obter_saldos_centavos("ana.souza"), "PRIMARY KEY"),
+    ("status dos usuários", lambda conn: ledger.obter_status_usuarios(), "idx_transacoes_status_caixa"),
+    (
+        "recálculo do caixa",
+        lambda conn: caixa._recalcular_caixa(conn.cursor(), "ana.souza", a_partir_de=1759500000),
+        "idx_transacoes_usuario_data_ts",
+    ),
+    ("referências da foto", lambda conn: photos.liberar_foto("fotos/ab/cd/x.webp"), "idx_transacoes_caminho_foto"),
+]
+
+
+@pytest.mark.parametrize("acao, indice", [c[1:] for c in CONSULTAS], ids=[c[0] for c in CONSULTAS])
+def test_consulta_usa_indice(banco_com_dados, acao, indice):
+    planos = _planos(acao)
+    assert planos, "nenhuma consulta capturada"
+    for plano in planos:
+        # Nenhuma varredura de transacoes/usuarios sem índice (saldos tem uma
+        # linha por usuário e origem e pode ser lida inteira pelo painel)
+        varreduras = [linha for linha in plano if linha.startswith(("SCAN transacoes", "SCAN usuarios"))]
+        assert all("INDEX" in linha for linha in varreduras), plano
+    assert any(indice in linha for plano in planos for linha in plano), planos
+
+
+# Bancos criados pela versão original do app: tabelas sem UNIQUE e, às vezes,
+# nomes de usuário repetidos
+def _criar_banco_antigo(caminho, usuarios):
+    conn = sqlite3.connect(caminho)
+    conn.execute("CREATE TABLE usuarios (id INTEGER PRIMARY KEY AUTOINCREMENT, nome TEXT NOT NULL, senha TEXT NOT NULL, tipo TEXT DEFAULT 'colaborador')")
+    conn.execute("""
+        CREATE TABLE transacoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, id_transacao TEXT, usuario TEXT NOT NULL, tipo TEXT NOT NULL,
+            valor REAL NOT NULL, descricao TEXT, perfil TEXT NOT NULL, data TEXT NOT NULL, caminho_foto TEXT
+        )
+    """)
+    conn.executemany("INSERT INTO usuarios (nome, senha) VALUES (?, ?)", usuarios)
+    conn.commit()
+    conn.close()
+
+
+def test_banco_antigo_recebe_indice_de_id_transacao(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "antigo.db"))
+    _criar_banco_antigo(storage.DB_PATH, [("ana.souza", "123")])
+    aplicar_migracoes()
+    assert "idx_transacoes_id_transacao" in _planos(lambda conn: ledger.obter_transacao("x"))[0][0]
+
+
+def test_nomes_duplicados_interrompem_a_migracao(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "antigo.db"))
+    _criar_banco_antigo(storage.DB_PATH, [("ana.souza", "1"), ("ana.souza", "2"), ("bia", "3"), ("bia", "4"), ("caio", "5")])
+    with pytest.raises(sqlite3.IntegrityError, match="ana.souza, bia"):
+        aplicar_migracoes()
+    # Nada foi aplicado: nenhum cadastro apagado, nenhuma versão registrada
+    with storage.conexao_banco() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0] == 5
+        assert conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == 0
@@ -0,0 +1,71 @@
+"""
+Valores em centavos: textos BR e US, negativos, zero e valores grandes, com as
+versões escalar e vetorizada de conversão e formatação dando o mesmo resultado.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from tripledger import moeda
+
+CASOS = [
+    ("1.234,56", 123456),
+    ("25,5", 2550),
+    ("25,50", 2550),
+    ("R$ 1.234,56", 123456),
+    ("1,234.56", 123456),
+    ("10.5", 1050),
+    ("-25,50", -2550),
+    ("R$ -1.234,56", -123456),
+    ("0", 0),
+    ("0,00", 0),
+    ("1.234.567.890,12", 123456789012),
+    ("", 0),
+    ("abc", 0),
+    (None, 0),
+    (12.345, 1235),
+    (-0.005, -1),
+    (100, 10000),
+    (float("nan"), 0),
+    (float("inf"), 0),
+]
+
+
+@pytest.mark.parametrize("valor, esperado", CASOS)
+def test_para_centavos(valor, esperado):
+    assert moeda.para_centavos(valor) == esperado
+
+
+def test_versao_vetorizada_igual_a_escalar():
+    textos = pd.Series([valor for valor, _ in CASOS if valor is None or isinstance(valor, str)], dtype=object)
+    numeros = pd.Series([valor for valor, _ in CASOS if isinstance(valor, (int, float))], dtype="float64")
+    for serie in (textos, numeros):
+        centavos = moeda.serie_para_centavos(serie)
+        assert centavos.dtype == np.int64
+        assert centavos.tolist() == [moeda.para_centavos(valor) for valor in serie]
+
+
+@pytest.mark.parametrize("centavos, esperado", [
+    (0, "R$ 0,00"),
+    (5, "R$ 0,05"),
+    (2550, "R$ 25,50"),
+    (123456, "R$ 1.234,56"),
+    (-123456, "R$ -1.234,56"),
+    (100000000, "R$ 1.000.000,00"),
+    (123456789012, "R$ 1.234.567.890,12"),
+])
+def test_formatar_centavos(centavos, esperado):
+    assert moeda.formatar_centavos(centavos) == esperado
+    assert moeda.formatar_serie_centavos(pd.Series([centavos])).tolist() == [esperado]
+
+
+def test_formatacao_vetorizada_igual_a_escalar(monkeypatch):
+    # Bloco pequeno para passar também pela divisão em blocos
+    monkeypatch.setattr(moeda, "_BLOCO_FORMATACAO", 7)
+    valores = [0, 1, -1, 99, -100, 999, 1000, -99999, 100000, 123456789, -987654321098, np.iinfo(np.int64).max // 2]
+    serie = moeda.formatar_serie_centavos(pd.Series(valores))
+    assert serie.tolist() == [moeda.formatar_centavos(valor) for valor in valores]
+    assert moeda.formatar_serie_centavos(pd.Series(valores), prefixo="").tolist() == [
+        moeda.formatar_centavos(valor)[3:] for valor in valores
+    ]
+    assert moeda.formatar_serie_centavos(pd.Series([], dtype="int64")).tolist() == []
@@ -0,0 +1,36 @@
+"""
+Paginação por keyset da lista do colaborador: as páginas concatenadas trazem
+as mesmas transações, na mesma ordem, que a lista completa, inclusive com
+datas repetidas e transações sem data_ts.
+"""
+import pytest
+
+from tripledger import ledger, storage
+
+
+@pytest.fixture
+def transacoes(banco):
+    ledger.adicionar_usuario("ana.souza", "123")
+    ledger.adicionar_transacao("ana.souza", "entrada", "100", "", "Entrada de Caixa", "01/10/2025 08:00:00")
+    for dia, hora in [("02", "12:00"), ("02", "12:00"), ("02", "12:00"), ("03", "09:30"), ("04", "19:00"), ("04", "19:00")]:
+        ledger.adicionar_transacao("ana.souza", "saida", "5", "almoço", "Almoço", f"{dia}/10/2025 {hora}:00")
+    for descricao in ("sem data 1", "sem data 2"):
+        ledger.adicionar_transacao("ana.souza", "saida", "3", descricao, "Janta", "05/10/2025 20:00:00")
+    # Datas que não puderam ser convertidas (data_ts NULL), como na inclusão e no backfill
+    with storage.conexao_banco() as conn:
+        conn.execute("UPDATE transacoes SET data_ts = NULL WHERE descricao LIKE 'sem data%'")
+    storage.invalidar_cache_leituras()
+    return [t["id_transacao"] for t in ledger.obter_transacoes(usuario="ana.souza")]
+
+
+@pytest.mark.parametrize("tamanho", [1, 2, 3, 20])
+def test_paginas_concatenadas_trazem_todas_as_transacoes(transacoes, tamanho):
+    assert len(transacoes) == 9
+    paginas, cursor = [], None
+    while True:
+        df, cursor = ledger.obter_pagina_transacoes_usuario("ana.souza", tamanho, apos=cursor)
+        assert len(df) <= tamanho
+        paginas.extend(df["ID"])
+        if cursor is None:
+            break
+    assert paginas == transacoes
@@ -0,0 +1,17 @@
+"""
+Núcleo do TripLedger, sem dependência do Streamlit.
+
+Módulos:
+- storage: conexões SQLite, cache de leituras e backups
+- migracoes: esquema versionado e inicializar_banco_dados()
+- ledger: usuários, transações, consultas e saldos
+- caixa: abertura/fechamento do caixa do colaborador
+- photos: fotos dos comprovantes
+- estaticos: servidor HTTP das fotos, com cache no navegador
+- export: exportação CSV
+- datas, moeda: datas e valores monetários (centavos)
+
+Nada é executado na importação: scripts de lote chamam
+migracoes.inicializar_banco_dados() antes de usar o banco. Erros são
+registrados no logger "tripledger" (a interface os exibe na página).
+"""
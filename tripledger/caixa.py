@@ -0,0 +1,135 @@
+"""
+Caixa do colaborador: simulação de abertura/fechamento (status_caixa e
+checkpoints gravados em cada transação).
+"""
+import logging
+
+from tripledger.datas import timestamp_para_datetime
+from tripledger.storage import conexao_banco, iniciar_escrita, invalidar_cache_leituras
+
+logger = logging.getLogger(__name__)
+
+# Função para simular o caixa do colaborador a partir de um estado inicial
+def _simular_caixa(transacoes, saldo_colab=0, caixa_aberto=False):
+    """
+    Reproduz a simulação do caixa sobre transações do colaborador já ordenadas.
+
+    Lógica:
+    - ABERTURA: Entrada de Caixa quando saldo estava zerado
+    - FECHAMENTO: Qualquer transação que zera o saldo (Saída de Caixa OU entrada que abate saldo negativo)
+
+    Recebe linhas com (perfil, valor_centavos, data_ts) e devolve, para cada uma, o
+    status_caixa calculado e o estado logo APÓS ela (saldo simulado e se o
+    caixa ficou aberto), que é gravado como checkpoint. Saldos em centavos.
+    """
+    resultados = []
+    for trans in transacoes:
+        perfil, valor, data_ts = trans["perfil"], trans["valor_centavos"], trans["data_ts"]
+        saldo_antes = saldo_colab
+        marcar_data = False
+
+        # Atualizar saldo simulado baseado no perfil
+        if perfil == "Entrada de Caixa":
+            saldo_colab += valor
+            # ABERTURA: Entrada de Caixa quando saldo estava zerado
+            if saldo_antes == 0 and not caixa_aberto:
+                caixa_aberto = True
+                marcar_data = True
+            # FECHAMENTO: Entrada que zera saldo negativo
+            elif saldo_antes < 0 and saldo_colab == 0:
+                caixa_aberto = False
+                marcar_data = True
+
+        elif perfil == "Saída de Caixa":
+            saldo_colab -= valor
+            # FECHAMENTO: Saída de Caixa (sempre marca como fechamento)
+            caixa_aberto = False
+            marcar_data = True
+
+        else:
+            # Outras transações: com saldo negativo a transação abate o saldo
+            # (e pode fechar o caixa ao zerá-lo); caso contrário é uma saída normal
+            if saldo_antes < 0:
+                saldo_colab += valor
+                # FECHAMENTO: Entrada normal que zera saldo negativo
+                if saldo_colab == 0:
+                    caixa_aberto = False
+                    marcar_data = True
+            else:
+                saldo_colab -= valor
+
+        status_caixa = None
+        if marcar_data and data_ts is not None:
+            status_caixa = timestamp_para_datetime(data_ts).strftime('%Y-%m-%d')
+        resultados.append((status_caixa, saldo_colab, 1 if caixa_aberto else 0))
+    return resultados
+
+# Função que recalcula o caixa de um usuário a partir de uma data (sem interface)
+def _recalcular_caixa(cursor, usuario, a_partir_de=None, atualizar_status=True):
+    """
+    Retoma a simulação do checkpoint gravado na última transação do colaborador
+    anterior a `a_partir_de` (timestamp, ver data_ts) e reprocessa apenas as
+    transações a partir desse instante. Sem `a_partir_de` (ou sem checkpoint disponível) reprocessa tudo.
+    Com atualizar_status=False apenas os checkpoints são regravados e o
+    status_caixa existente é mantido. Grava somente as linhas que mudaram,
+    com um único executemany.
+    """
+    saldo_inicial, aberto_inicial = 0, False
+    if a_partir_de is not None:
+        checkpoint = cursor.execute("""
+            SELECT caixa_saldo_centavos_apos, caixa_aberto_apos
+            FROM transacoes
+            WHERE usuario = ? AND origem_saldo = 'colaborador' AND data_ts < ?
+            ORDER BY data_ts DESC, rowid DESC
+            LIMIT 1
+        """, (usuario, a_partir_de)).fetchone()
+        if checkpoint is not None:
+            if checkpoint["caixa_saldo_centavos_apos"] is None:
+                # Checkpoint ausente (não deveria ocorrer após a migração): refazer tudo
+                a_partir_de = None
+            else:
+                saldo_inicial = checkpoint["caixa_saldo_centavos_apos"]
+                aberto_inicial = bool(checkpoint["caixa_aberto_apos"])
+
+    # Buscar apenas a cauda do histórico do colaborador, em ordem cronológica
+    # ("rowid AS rowid": sem o alias o sqlite3.Row chama a coluna de "id", o
+    # INTEGER PRIMARY KEY da tabela)
+    sql_cauda = """
+        SELECT rowid AS rowid, perfil, valor_centavos, data_ts, status_caixa, caixa_saldo_centavos_apos, caixa_aberto_apos
+        FROM transacoes
+        WHERE usuario = ? AND origem_saldo = 'colaborador'
+    """
+    parametros = [usuario]
+    if a_partir_de is not None:
+        sql_cauda += " AND data_ts >= ?"
+        parametros.append(a_partir_de)
+    sql_cauda += " ORDER BY data_ts ASC, rowid ASC"
+    cauda = cursor.execute(sql_cauda, parametros).fetchall()
+
+    alteracoes = []
+    for trans, (status, saldo_apos, aberto_apos) in zip(cauda, _simular_caixa(cauda, saldo_inicial, aberto_inicial)):
+        if not atualizar_status:
+            status = trans["status_caixa"]
+        if (trans["status_caixa"], trans["caixa_saldo_centavos_apos"], trans["caixa_aberto_apos"]) != (status, saldo_apos, aberto_apos):
+            alteracoes.append((status, saldo_apos, aberto_apos, trans["rowid"]))
+    if alteracoes:
+        cursor.executemany("""
+            UPDATE transacoes
+            SET status_caixa = ?, caixa_saldo_centavos_apos = ?, caixa_aberto_apos = ?
+            WHERE rowid = ?
+        """, alteracoes)
+    return len(alteracoes)
+
+def recalcular_status_caixa_usuario(usuario, a_partir_de=None):
+    """
+    Recalcula o status_caixa das transações do colaborador a partir de
+    `a_partir_de` (timestamp, ver data_ts). Chamada após inclusão,
+    exclusão ou edição de transações do colaborador.
+    """
+    try:
+        with conexao_banco() as conn:
+            iniciar_escrita(conn)
+            _recalcular_caixa(conn.cursor(), usuario, a_partir_de)
+        invalidar_cache_leituras()
+    except Exception as e:
+        logger.error(f"Erro ao recalcular status_caixa: {str(e)}")
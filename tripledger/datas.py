@@ -0,0 +1,69 @@
+"""
+Datas das transações: leitura de textos ISO ou BR, conversão para o timestamp
+gravado em transacoes.data_ts e formatação vetorizada no padrão brasileiro.
+"""
+import calendar
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Utilitário: extrair data (date) de strings nos formatos usados no app
+def extrair_data_para_date(data_str):
+    try:
+        if not data_str:
+            return None
+        s = str(data_str).strip()
+        # ISO YYYY-MM-DD ou YYYY-MM-DD HH:MM:SS
+        if len(s) >= 10 and s[4] == '-':
+            return datetime.strptime(s[:10], '%Y-%m-%d').date()
+        # BR DD/MM/YYYY ou DD/MM/YYYY HH:MM:SS
+        if '/' in s and len(s) >= 10:
+            return datetime.strptime(s[:10], '%d/%m/%Y').date()
+        # fallback: try isoformat parse
+        try:
+            return datetime.fromisoformat(s.split(' ')[0]).date()
+        except:
+            return None
+    except:
+        return None
+
+# Utilitário: converter data (ISO ou BR, com ou sem hora) em timestamp inteiro.
+# A hora gravada é tratada como UTC, de modo que a conversão independe do fuso
+# do servidor; use timestamp_para_datetime para o caminho inverso.
+def converter_data_para_timestamp(data_str):
+    if not data_str:
+        return None
+    s = str(data_str).strip()
+    formato_data = '%Y-%m-%d' if s[4:5] == '-' else '%d/%m/%Y'
+    for formato in (formato_data + ' %H:%M:%S', formato_data + ' %H:%M', formato_data):
+        try:
+            return calendar.timegm(datetime.strptime(s, formato).timetuple())
+        except ValueError:
+            continue
+    # fallback: apenas a parte de data (meia-noite)
+    d = extrair_data_para_date(s)
+    return calendar.timegm(d.timetuple()) if d else None
+
+# Utilitário: converter timestamp inteiro (ver converter_data_para_timestamp) em datetime
+def timestamp_para_datetime(ts):
+    return datetime(1970, 1, 1) + timedelta(seconds=int(ts))
+
+# Posições do texto ISO "AAAA-MM-DDTHH:MM:SS" que formam "DD/MM/AAAA HH:MM:SS"
+_POSICOES_DATA_BR = [8, 9, 4, 5, 6, 7, 0, 1, 2, 3, 10, 11, 12, 13, 14, 15, 16, 17, 18]
+
+# Função para formatar uma Series de datetimes sem laço por linha: reordena os
+# caracteres do texto ISO gerado pelo numpy. Devolve três Series de textos,
+# "DD/MM/AAAA HH:MM:SS", "DD/MM/AAAA" e "HH:MM"; NaT vira NaN.
+def formatar_datas_br(serie_dt):
+    iso = np.datetime_as_string(serie_dt.to_numpy().astype("datetime64[s]"))
+    codigos = iso.view(np.uint32).reshape(len(iso), -1)[:, _POSICOES_DATA_BR]
+    codigos[:, [2, 5]] = ord("/")
+    codigos[:, 10] = ord(" ")
+    valida = serie_dt.notna()
+
+    def _textos(inicio, fim):
+        trecho = np.ascontiguousarray(codigos[:, inicio:fim]).view(f"<U{fim - inicio}").ravel()
+        return pd.Series(trecho, index=serie_dt.index, dtype=object).where(valida)
+
+    return _textos(0, 19), _textos(0, 10), _textos(11, 16)
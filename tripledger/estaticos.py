@@ -0,0 +1,152 @@
+"""
+Servidor HTTP das fotos dos comprovantes, sem dependência do Streamlit.
+
+As fotos são endereçadas por conteúdo (ver photos.DIRETORIO_FOTOS): o nome do
+arquivo é o SHA-256 dos bytes, e o caminho das versões reduzidas inclui também
+o perfil com que foram geradas (photos.perfil_rendicao), então o conteúdo de
+uma URL nunca muda. O servidor entrega os arquivos com Cache-Control immutable
+e ETag igual ao caminho, e o navegador guarda cada foto uma vez: exibições
+seguintes não chegam ao servidor. Com st.image(caminho) o Streamlit relia o
+arquivo a cada rerun.
+
+Só nomes endereçados por conteúdo são servidos (originais e versões reduzidas);
+fotos pendentes e qualquer outro caminho recebem 404. As URLs contêm o hash de
+256 bits da foto e não são listadas em lugar nenhum, mas quem tiver a URL vê a
+foto. Por isso o servidor ouve só na interface local (127.0.0.1) por padrão;
+para acesso pela rede, a implantação escolhe a interface em
+SERVIDOR_FOTOS["endereco"].
+"""
+import functools
+import http.server
+import ipaddress
+import logging
+import os
+import re
+import shutil
+import threading
+from urllib.parse import urlsplit
+
+from tripledger import photos
+
+logger = logging.getLogger(__name__)
+
+# Configuração do servidor. "endereco" é a interface em que ele ouve: 127.0.0.1
+# atende só navegadores na própria máquina (acessos de outras máquinas recebem
+# as fotos pelo Streamlit); "" ouve em todas as interfaces, para acesso direto
+# pela rede. "porta" None desativa o servidor (as fotos voltam a ser lidas pelo
+# Streamlit); 0 escolhe uma porta livre. "url_base" é o endereço do servidor
+# visto pelo navegador (ex.: atrás de um proxy); None deixa a interface
+# deduzi-lo do endereço do app. Scripts e implantações podem alterar os
+# valores antes de iniciar_servidor_fotos().
+SERVIDOR_FOTOS = {
+    "endereco": "127.0.0.1",
+    "porta": 8502,
+    "url_base": None,
+}
+
+# Tipos de conteúdo das extensões gravadas (photos.EXTENSOES_FORMATO e fotos
+# migradas do formato antigo)
+TIPOS_CONTEUDO = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+}
+
+# Um ano, o máximo recomendado: o conteúdo de uma URL nunca muda. "private"
+# mantém os comprovantes fora de caches compartilhados (proxies).
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+# Nomes de host pelos quais o navegador alcança um servidor na interface local
+HOSTS_LOCAIS = {"localhost", "127.0.0.1", "[::1]"}
+
+# Caminhos servidos: [previas/<perfil>/|miniaturas/<perfil>/]ab/cd/abcd<60 hex>.<extensão>
+_CAMINHO_FOTO = re.compile(
+    r"(?:(?:%s)/[0-9]+q[0-9]+/)?(?P<a>[0-9a-f]{2})/(?P<b>[0-9a-f]{2})/(?P<hash>(?P=a)(?P=b)[0-9a-f]{60})(?P<extensao>%s)" % (
+        "|".join(re.escape(subdiretorio) for subdiretorio, _ in photos.RENDICOES.values()),
+        "|".join(re.escape(extensao) for extensao in TIPOS_CONTEUDO),
+    )
+)
+
+class _ManipuladorFotos(http.server.BaseHTTPRequestHandler):
+    server_version = "TripLedger"
+
+    def do_GET(self):
+        self._responder(enviar_corpo=True)
+
+    def do_HEAD(self):
+        self._responder(enviar_corpo=False)
+
+    def _responder(self, enviar_corpo):
+        relativo = urlsplit(self.path).path.lstrip("/")
+        encontrado = _CAMINHO_FOTO.fullmatch(relativo)
+        if encontrado is None:
+            self.send_error(404)
+            return
+        etag = f'"{relativo}"'
+        # A URL identifica o conteúdo: a revalidação não precisa abrir o arquivo
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self._cabecalhos_cache(etag)
+            self.end_headers()
+            return
+        try:
+            arquivo = open(os.path.join(photos.DIRETORIO_FOTOS, *relativo.split("/")), "rb")
+        except OSError:
+            self.send_error(404)
+            return
+        with arquivo:
+            self.send_response(200)
+            self.send_header("Content-Type", TIPOS_CONTEUDO[encontrado["extensao"]])
+            self.send_header("Content-Length", str(os.fstat(arquivo.fileno()).st_size))
+            self.send_header("X-Content-Type-Options", "nosniff")
+            self._cabecalhos_cache(etag)
+            self.end_headers()
+            if enviar_corpo:
+                try:
+                    shutil.copyfileobj(arquivo, self.wfile)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # navegador desistiu da foto (ex.: mudou de página)
+
+    def _cabecalhos_cache(self, etag):
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("ETag", etag)
+
+    def log_message(self, formato, *args):
+        logger.debug("%s - " + formato, self.address_string(), *args)
+
+# Função para saber se o servidor ouve só na interface local (loopback): nesse
+# caso navegadores de outras máquinas não alcançam as fotos por ele
+def servidor_somente_local():
+    if SERVIDOR_FOTOS["endereco"] == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(SERVIDOR_FOTOS["endereco"]).is_loopback
+    except ValueError:
+        return False
+
+# Função para iniciar o servidor das fotos em uma thread, uma vez por processo.
+# Devolve a porta em uso, ou None se o servidor está desativado ou não pôde ser
+# iniciado (ex.: porta ocupada); nesse caso as fotos são lidas pelo Streamlit.
+@functools.cache
+def iniciar_servidor_fotos():
+    if SERVIDOR_FOTOS["porta"] is None:
+        return None
+    try:
+        servidor = http.server.ThreadingHTTPServer(
+            (SERVIDOR_FOTOS["endereco"], SERVIDOR_FOTOS["porta"]), _ManipuladorFotos
+        )
+    except OSError as e:
+        logger.warning(f"Servidor de fotos não iniciado na porta {SERVIDOR_FOTOS['porta']}: {str(e)}")
+        return None
+    threading.Thread(target=servidor.serve_forever, name="tripledger-fotos-http", daemon=True).start()
+    return servidor.server_address[1]
+
+# Função para montar a URL de uma foto gravada (original ou versão reduzida) no
+# servidor em url_base. Devolve None para caminhos que o servidor não entrega.
+def url_foto(caminho_foto, url_base):
+    relativo = "/".join(os.path.relpath(caminho_foto, photos.DIRETORIO_FOTOS).split(os.sep))
+    if _CAMINHO_FOTO.fullmatch(relativo) is None:
+        return None
+    return f"{url_base.rstrip('/')}/{relativo}"
@@ -0,0 +1,120 @@
+"""
+Exportação das transações de um usuário para CSV (planilha em formato
+brasileiro: separador ";" e vírgula decimal), com colunas separadas por origem
+do saldo, status de abertura/fechamento do caixa e linha de totais.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from tripledger import moeda
+from tripledger.ledger import obter_dataframe_transacoes, obter_transacoes
+
+# Função para montar a tabela exportada das transações do usuário no período
+# (ano/mes None = sem filtro), já com a linha de totais
+def montar_tabela_exportacao(usuario, ano=None, mes=None):
+    df_filtrado_usuario = obter_dataframe_transacoes(usuario, ano=ano, mes=mes)
+    df_exportar = df_filtrado_usuario.copy()
+
+    # Separar Data e Hora em colunas diferentes
+    df_exportar["Data_Export"] = df_exportar["Data"].apply(lambda x: x.split(" ")[0] if " " in str(x) else str(x))
+    df_exportar["Hora_Export"] = df_exportar["Hora"]
+
+    # Valores em centavos, negativos ou positivos com base no tipo
+    df_exportar["Valor_Num"] = np.where(
+        df_exportar["Tipo"] == "Saída", -df_exportar["Valor_Centavos"], df_exportar["Valor_Centavos"]
+    )
+
+    # Buscar dados originais do banco para ter origem_saldo e status_caixa
+    dados_originais = obter_transacoes(usuario=usuario, ano=ano, mes=mes)
+    origens_dict = {t['id_transacao']: t.get('origem_saldo', 'colaborador') for t in dados_originais}
+    status_caixa_dict = {t['id_transacao']: t.get('status_caixa', '') for t in dados_originais}
+
+    df_exportar["Origem"] = df_exportar["ID"].map(origens_dict).fillna("colaborador")
+    df_exportar["Status_Caixa_Raw"] = df_exportar["ID"].map(status_caixa_dict).fillna("")
+
+    # Calcular saldo acumulado (em centavos) para detectar se Entrada de Caixa é abertura ou fechamento
+    df_temp = df_exportar.sort_values('Data_ts', kind='stable').copy()
+    saldo_acumulado = 0
+    status_caixa_dict = {}
+
+    for idx, row in df_temp.iterrows():
+        status_raw = row["Status_Caixa_Raw"]
+        perfil = row["Perfil"]
+        valor_original = row["Valor_Centavos"]
+        origem = row["Origem"]
+        trans_id = row["ID"]
+
+        status_formatado = ""
+
+        if status_raw and status_raw != "" and origem == "colaborador":
+            try:
+                # Converter data para formato brasileiro
+                data_obj = datetime.strptime(str(status_raw)[:10], '%Y-%m-%d')
+                data_br = data_obj.strftime('%d/%m/%Y')
+
+                if perfil == "Entrada de Caixa":
+                    # Se saldo estava zerado antes da entrada = ABERTURA
+                    if saldo_acumulado == 0:
+                        status_formatado = f"Abertura: {data_br}"
+                    # Se saldo estava negativo e vai zerar = FECHAMENTO
+                    elif saldo_acumulado < 0:
+                        saldo_apos = saldo_acumulado + valor_original
+                        if saldo_apos == 0:
+                            status_formatado = f"Fechamento: {data_br}"
+                        # Se não zera, considera abertura (caso de valor maior que o negativo)
+                        else:
+                            status_formatado = f"Abertura: {data_br}"
+                elif perfil == "Saída de Caixa":
+                    # Saída de caixa sempre é fechamento
+                    status_formatado = f"Fechamento: {data_br}"
+            except:
+                status_formatado = ""
+
+        status_caixa_dict[trans_id] = status_formatado
+
+        # Atualizar saldo acumulado
+        if origem == "colaborador":
+            if perfil == "Entrada de Caixa":
+                saldo_acumulado += valor_original
+            else:
+                saldo_acumulado -= valor_original
+
+    # Aplicar status_caixa de volta na ordem original
+    df_exportar["Status_Caixa"] = df_exportar["ID"].map(status_caixa_dict).fillna("")
+
+    # Separar valores conforme origem_saldo (somas exatas em centavos, CSV em reais)
+    centavos_colab = np.where(df_exportar["Origem"] == "colaborador", df_exportar["Valor_Num"], 0)
+    centavos_emp = np.where(df_exportar["Origem"] == "emprestado", df_exportar["Valor_Num"], 0)
+    df_exportar["Colaborador"] = centavos_colab / 100
+    df_exportar["Emprestado"] = centavos_emp / 100
+    total_colab = moeda.centavos_para_reais(centavos_colab.sum())
+    total_emp = moeda.centavos_para_reais(centavos_emp.sum())
+
+    # Selecionar colunas desejadas na ordem correta
+    df_final = df_exportar[["Data_Export", "Hora_Export", "Perfil", "Descrição", "Tipo", "Colaborador", "Emprestado", "Status_Caixa"]].copy()
+
+    # Renomear colunas para o CSV
+    df_final.columns = ["Data", "Hora", "Perfil", "Descrição", "Tipo", "Colaborador", "Emprestado", "Status do Caixa"]
+
+    # Adiciona linha de totais
+    df_totais = pd.DataFrame([{
+        "Data": "",
+        "Hora": "",
+        "Perfil": "",
+        "Descrição": "TOTAL",
+        "Tipo": "",
+        "Colaborador": total_colab,
+        "Emprestado": total_emp,
+        "Status do Caixa": ""
+    }])
+
+    df_final = pd.concat([df_final, df_totais], ignore_index=True)
+
+    return df_final
+
+# Função para gerar o texto CSV (com BOM, para abrir acentuado no Excel)
+def gerar_csv_transacoes(usuario, ano=None, mes=None):
+    df_final = montar_tabela_exportacao(usuario, ano, mes)
+    return df_final.to_csv(index=False, sep=";", decimal=",", encoding="utf-8-sig")
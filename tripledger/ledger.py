@@ -0,0 +1,654 @@
+"""
+Livro-caixa: usuários, inclusão/edição/exclusão de transações, consultas
+filtradas (com cache de leituras), saldos materializados e o status de cada
+usuário. Erros de banco são registrados no logger do módulo e as funções
+devolvem um valor neutro (False, None, lista vazia), como a interface espera.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from tripledger import moeda
+from tripledger.caixa import _recalcular_caixa
+from tripledger.datas import converter_data_para_timestamp, extrair_data_para_date, formatar_datas_br
+from tripledger.photos import (
+    ARQUIVO_AUSENTE, FOTO_PENDENTE, agendar_foto_transacao, liberar_foto, preparar_foto_transacao,
+)
+from tripledger.storage import (
+    conexao_banco, criar_backup_banco_dados, iniciar_escrita, invalidar_cache_leituras, ler_com_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+# Saldos calculados a partir do histórico, por usuário e origem (colaborador/emprestado).
+# Usado para popular, reconstruir e verificar a tabela materializada "saldos".
+_SQL_SALDOS_CALCULADOS = """
+    SELECT
+        usuario,
+        CASE WHEN COALESCE(origem_saldo, 'colaborador') = 'colaborador'
+             THEN 'colaborador' ELSE 'emprestado' END AS origem,
+        COALESCE(SUM(CASE WHEN perfil = 'Entrada de Caixa' THEN valor_centavos ELSE -valor_centavos END), 0) AS saldo_centavos,
+        COUNT(*) AS quantidade
+    FROM transacoes
+    GROUP BY usuario, origem
+"""
+
+# Função para (re)popular a tabela de saldos a partir do histórico de transações
+def _popular_saldos(cursor):
+    agora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    cursor.execute("DELETE FROM saldos")
+    cursor.execute(f"""
+        INSERT INTO saldos (usuario, origem_saldo, saldo_centavos, quantidade, ultima_atualizacao)
+        SELECT usuario, origem, saldo_centavos, quantidade, ? FROM ({_SQL_SALDOS_CALCULADOS})
+    """, (agora,))
+
+# Funções para operações com o banco de dados
+def adicionar_usuario(nome, senha):
+    try:
+        with conexao_banco() as conn:
+            cursor = conn.cursor()
+            
+            # Verificar se o usuário já existe
+            cursor.execute("SELECT * FROM usuarios WHERE nome = ?", (nome,))
+            if cursor.fetchone():
+                return False
+                
+            # Adicionar o novo usuário
+            cursor.execute(
+                "INSERT INTO usuarios (nome, senha, tipo) VALUES (?, ?, ?)",
+                (nome, senha, "colaborador")
+            )
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao adicionar usuário: {str(e)}")
+        return False
+
+def verificar_usuario(nome, senha):
+    try:
+        with conexao_banco() as conn:
+            # Buscar usuário pelo nome e senha
+            resultado = conn.execute("SELECT tipo FROM usuarios WHERE nome = ? AND senha = ?", (nome, senha)).fetchone()
+        
+        if resultado:
+            return resultado[0]  # Retorna o tipo do usuário
+        return None
+    except Exception as e:
+        logger.error(f"Erro ao verificar usuário: {str(e)}")
+        return None
+
+# Função para definir o status_caixa de uma transação a partir do saldo do
+# colaborador logo antes dela (em centavos). Só transações de CAIXA do
+# colaborador (Entrada/Saída de Caixa) abrem ou fecham o caixa; as demais ficam
+# com None. O saldo deve ser lido na transação de escrita (após iniciar_escrita):
+# com a leitura antes do lock, duas inclusões simultâneas veriam o mesmo saldo
+# zerado e ambas abririam o caixa.
+def _status_caixa_transacao(origem_saldo, perfil, data, saldo_antes, valor_centavos):
+    status_caixa = None
+    try:
+        # Apenas transações de CAIXA colaborador podem ter status_caixa
+        if origem_saldo == "colaborador" and perfil in ["Entrada de Caixa", "Saída de Caixa"]:
+            
+            # ABERTURA: Entrada de Caixa quando saldo estava zerado
+            if perfil == "Entrada de Caixa" and saldo_antes == 0:
+                d = extrair_data_para_date(data)
+                if d:
+                    status_caixa = d.strftime('%Y-%m-%d')
+            
+            # FECHAMENTO: Saída de Caixa (sempre)
+            elif perfil == "Saída de Caixa":
+                d = extrair_data_para_date(data)
+                if d:
+                    status_caixa = d.strftime('%Y-%m-%d')
+            
+            # FECHAMENTO: Entrada de Caixa que zera saldo negativo
+            elif perfil == "Entrada de Caixa":
+                saldo_apos = saldo_antes + valor_centavos
+                if saldo_antes < 0 and saldo_apos == 0:
+                    d = extrair_data_para_date(data)
+                    if d:
+                        status_caixa = d.strftime('%Y-%m-%d')
+    except:
+        status_caixa = None
+    return status_caixa
+
+def adicionar_transacao(usuario, tipo, valor, descricao, perfil, data, foto=None, origem_saldo="colaborador"):
+    try:
+        # Gerar um ID único para a transação
+        id_transacao = str(uuid.uuid4())
+        
+        # Converter o valor para centavos (valor_float é gravado em "valor", em reais)
+        valor_centavos = moeda.para_centavos(valor)
+        valor_float = moeda.centavos_para_reais(valor_centavos)
+        
+        # Verifica se a data está no formato brasileiro e converte para ISO se necessário
+        try:
+            if '/' in data: 
+                partes = data.split(' ', 1)
+                data_parte = partes[0]
+                hora_parte = partes[1] if len(partes) > 1 else ""
+                data_obj = datetime.strptime(data_parte, '%d/%m/%Y')
+                data_iso = data_obj.strftime('%Y-%m-%d')
+                data = data_iso + " " + hora_parte
+        except:
+            pass
+
+        # Foto: os bytes ficam pendentes e são processados em segundo plano após o
+        # commit; caminho_foto é gravado quando o processamento termina
+        foto_pendente = preparar_foto_transacao(id_transacao, foto) if foto is not None else None
+        status_foto = FOTO_PENDENTE if foto_pendente else None
+        
+        # Adicionar a transação no banco de dados (e no saldo, na mesma transação)
+        data_ts = converter_data_para_timestamp(data)
+        with conexao_banco() as conn:
+            iniciar_escrita(conn)
+            # Saldo anterior do colaborador (antes de inserir), lido com o lock de
+            # escrita: obter_saldos_centavos reutiliza esta conexão e transação
+            prev_saldo_colab = obter_saldos_centavos(usuario)['colaborador']
+            status_caixa = _status_caixa_transacao(origem_saldo, perfil, data, prev_saldo_colab, valor_centavos)
+            conn.execute(
+                "INSERT INTO transacoes (id_transacao, usuario, tipo, valor, valor_centavos, descricao, perfil, data, data_ts, origem_saldo, status_caixa, status_foto) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (id_transacao, usuario, tipo, valor_float, valor_centavos, descricao, perfil, data, data_ts, origem_saldo, status_caixa, status_foto)
+            )
+            atualizar_saldo_materializado(conn, usuario, origem_saldo, perfil, valor_centavos, +1)
+
+            # Gravar os checkpoints do caixa da nova transação (e das posteriores,
+            # se for um lançamento retroativo), mantendo o status_caixa definido acima
+            if origem_saldo == 'colaborador':
+                _recalcular_caixa(conn.cursor(), usuario, data_ts, atualizar_status=False)
+
+        # Leituras em cache ficaram desatualizadas
+        invalidar_cache_leituras()
+
+        if foto_pendente:
+            agendar_foto_transacao(id_transacao, foto_pendente)
+
+        # NÃO limpar status_caixa - as datas devem permanecer para relatórios
+
+        # Criar backup após adicionar transação
+        criar_backup_banco_dados()
+        
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao adicionar transação: {str(e)}")
+        return False
+
+def excluir_transacao(id_transacao):
+    try:
+        # Exclusão e recálculo do caixa acontecem na mesma transação
+        with conexao_banco() as conn:
+            iniciar_escrita(conn)
+            cursor = conn.cursor()
+            
+            # Obter informações da transação antes de excluir
+            cursor.execute("SELECT caminho_foto, usuario, origem_saldo, perfil, status_caixa, valor_centavos, data_ts FROM transacoes WHERE id_transacao = ?", (id_transacao,))
+            resultado = cursor.fetchone()
+            
+            if not resultado:
+                return False
+            
+            caminho_foto = resultado[0]
+            usuario = resultado[1]
+            origem_saldo = resultado[2] if resultado[2] else 'colaborador'
+            perfil = resultado[3]
+            tinha_status_caixa = resultado[4]
+            valor_centavos = resultado[5]
+            data_ts = resultado[6]
+            
+            # Excluir a transação do banco de dados e retirar seu efeito do saldo
+            cursor.execute("DELETE FROM transacoes WHERE id_transacao = ?", (id_transacao,))
+            atualizar_saldo_materializado(conn, usuario, origem_saldo, perfil, valor_centavos, -1)
+            
+            # Se era uma transação de colaborador, recalcular a partir da data dela
+            # (qualquer transação pode afetar o caixa das posteriores). Na mesma
+            # transação: se o recálculo falhar, a exclusão é desfeita.
+            if origem_saldo == 'colaborador':
+                _recalcular_caixa(cursor, usuario, data_ts)
+        
+        # Leituras em cache ficaram desatualizadas
+        invalidar_cache_leituras()
+        
+        # Excluir a foto se nenhuma outra transação a usa (se não conseguir, a
+        # exclusão da transação vale assim mesmo)
+        liberar_foto(caminho_foto)
+        
+        # Criar backup após excluir transação
+        criar_backup_banco_dados()
+        
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao excluir transação: {str(e)}")
+        return False
+
+# Função para montar o WHERE das consultas de transações. Cada filtro é opcional
+# (None = sem filtro); ano e mês usam as colunas geradas da migração 12.
+def _filtros_transacoes(usuario=None, perfil=None, ano=None, mes=None, origem_saldo=None):
+    condicoes, parametros = [], []
+    for coluna, valor in (("usuario", usuario), ("perfil", perfil), ("ano", ano),
+                          ("mes", mes), ("origem_saldo", origem_saldo)):
+        if valor is not None:
+            condicoes.append(f"{coluna} = ?")
+            parametros.append(valor)
+    return (" WHERE " + " AND ".join(condicoes) if condicoes else ""), parametros
+
+# Função para executar a consulta de transações com o WHERE dos filtros e uma
+# condição extra opcional, da mais recente para a mais antiga (sem data_ts por último)
+def _selecionar_transacoes(where, parametros, limite=None, condicao=None, parametros_condicao=()):
+    parametros = list(parametros) + list(parametros_condicao)
+    if condicao:
+        where += (" AND " if where else " WHERE ") + condicao
+    # O registro da foto (tabela fotos) vem na mesma consulta: as listas sabem se
+    # o arquivo e as versões reduzidas existem sem consultar o disco
+    sql = f"""
+        SELECT transacoes.rowid AS rowid_transacao, transacoes.*,
+               fotos.status AS arquivo_foto, fotos.caminho_previa, fotos.caminho_miniatura
+        FROM transacoes LEFT JOIN fotos ON fotos.caminho = transacoes.caminho_foto{where}
+        ORDER BY data_ts DESC, transacoes.rowid DESC
+    """
+    if limite is not None:
+        sql += " LIMIT ?"
+        parametros.append(limite)
+    with conexao_banco() as conn:
+        # Linhas vêm como sqlite3.Row; converter para dicionários
+        return [dict(row) for row in conn.execute(sql, parametros).fetchall()]
+
+# Função para buscar transações filtradas, da mais recente para a mais antiga.
+# Paginação por keyset: `apos` é o cursor (data_ts, rowid) da última linha já
+# exibida e a consulta continua dele pelo índice, sem OFFSET; o custo de cada
+# página depende do tamanho da página, não do histórico. Transações sem
+# data_ts (data que não pôde ser convertida) vêm depois de todas as datadas,
+# ordenadas por rowid; para elas a comparação (data_ts, rowid) < (?, ?) é NULL,
+# então são lidas por uma condição própria.
+def _consultar_transacoes(filtros, limite=None, apos=None):
+    where, parametros = _filtros_transacoes(**filtros)
+    if apos is None:
+        return _selecionar_transacoes(where, parametros, limite)
+    if apos[0] is None:
+        # Cursor já entre as transações sem data_ts
+        return _selecionar_transacoes(where, parametros, limite, "data_ts IS NULL AND transacoes.rowid < ?", [apos[1]])
+    transacoes = _selecionar_transacoes(where, parametros, limite, "(data_ts, transacoes.rowid) < (?, ?)", apos)
+    if limite is None or len(transacoes) < limite:
+        # Datadas esgotadas: a página continua nas transações sem data_ts
+        restante = None if limite is None else limite - len(transacoes)
+        transacoes += _selecionar_transacoes(where, parametros, restante, "data_ts IS NULL")
+    return transacoes
+
+def obter_transacoes(usuario=None, perfil=None, ano=None, mes=None, origem_saldo=None, limite=None, apos=None):
+    """
+    Transações que atendem aos filtros (usuario, perfil, ano, mes,
+    origem_saldo), ordenadas por data_ts decrescente. Filtros None são
+    ignorados; `limite` e `apos` paginam o resultado.
+    """
+    filtros = {"usuario": usuario, "perfil": perfil, "ano": ano, "mes": mes, "origem_saldo": origem_saldo}
+    try:
+        return ler_com_cache(
+            ("transacoes", tuple(filtros.values()), limite, apos),
+            lambda: _consultar_transacoes(filtros, limite, apos)
+        )
+    except Exception as e:
+        logger.error(f"Erro ao obter transações: {str(e)}")
+        return []
+
+# Função para contar as transações que atendem aos filtros (mesmos de obter_transacoes)
+def contar_transacoes(usuario=None, perfil=None, ano=None, mes=None, origem_saldo=None):
+    def consultar():
+        where, parametros = _filtros_transacoes(usuario, perfil, ano, mes, origem_saldo)
+        with conexao_banco() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM transacoes{where}", parametros).fetchone()[0]
+    try:
+        return ler_com_cache(("contagem_transacoes", usuario, perfil, ano, mes, origem_saldo), consultar)
+    except Exception as e:
+        logger.error(f"Erro ao contar transações: {str(e)}")
+        return 0
+
+# Função para listar os anos com transações (do usuário ou de todos), do mais
+# recente ao mais antigo. Lê só o índice de ano, sem carregar as transações.
+def obter_anos_transacoes(usuario=None):
+    def consultar():
+        where, parametros = _filtros_transacoes(usuario)
+        with conexao_banco() as conn:
+            return [str(r[0]) for r in conn.execute(
+                f"SELECT DISTINCT ano FROM transacoes{where} ORDER BY ano DESC", parametros
+            ) if r[0] is not None]
+    try:
+        return ler_com_cache(("anos_transacoes", usuario), consultar)
+    except Exception as e:
+        logger.error(f"Erro ao obter anos das transações: {str(e)}")
+        return []
+
+# Função para listar os perfis usados nas transações do usuário (opções do filtro)
+def obter_perfis_usuario(usuario):
+    def consultar():
+        with conexao_banco() as conn:
+            return [r[0] for r in conn.execute(
+                "SELECT DISTINCT perfil FROM transacoes WHERE usuario = ? ORDER BY perfil", (usuario,)
+            )]
+    try:
+        return ler_com_cache(("perfis_usuario", usuario), consultar)
+    except Exception as e:
+        logger.error(f"Erro ao obter perfis: {str(e)}")
+        return []
+
+# Função para buscar uma transação pelo id_transacao (None se não existir)
+def obter_transacao(id_transacao):
+    try:
+        with conexao_banco() as conn:
+            row = conn.execute("SELECT * FROM transacoes WHERE id_transacao = ?", (id_transacao,)).fetchone()
+        return dict(row) if row else None
+    except Exception as e:
+        logger.error(f"Erro ao obter transação: {str(e)}")
+        return None
+
+# Função para aplicar (sinal=+1) ou retirar (sinal=-1) o efeito de uma transação
+# no saldo materializado. Deve ser chamada dentro da mesma transação da escrita.
+def atualizar_saldo_materializado(conn, usuario, origem_saldo, perfil, valor_centavos, sinal):
+    origem = 'colaborador' if (origem_saldo or 'colaborador') == 'colaborador' else 'emprestado'
+    efeito = valor_centavos if perfil == "Entrada de Caixa" else -valor_centavos
+    conn.execute("""
+        INSERT INTO saldos (usuario, origem_saldo, saldo_centavos, quantidade, ultima_atualizacao)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (usuario, origem_saldo) DO UPDATE SET
+            saldo_centavos = saldo_centavos + excluded.saldo_centavos,
+            quantidade = quantidade + excluded.quantidade,
+            ultima_atualizacao = excluded.ultima_atualizacao
+    """, (usuario, origem, sinal * efeito, sinal, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+# Função para obter os saldos do colaborador e emprestado em centavos (exatos)
+def obter_saldos_centavos(usuario):
+    with conexao_banco() as conn:
+        linhas = conn.execute(
+            "SELECT origem_saldo, saldo_centavos FROM saldos WHERE usuario = ?", (usuario,)
+        ).fetchall()
+    saldos = {row["origem_saldo"]: row["saldo_centavos"] for row in linhas}
+    saldo_colaborador = saldos.get('colaborador', 0)
+    saldo_emprestado = saldos.get('emprestado', 0)
+    return {
+        'colaborador': saldo_colaborador,
+        'emprestado': saldo_emprestado,
+        'total': saldo_colaborador + saldo_emprestado
+    }
+
+def obter_saldos_separados(usuario):
+    """Retorna os saldos do colaborador e emprestado em reais, lidos da tabela materializada"""
+    try:
+        saldos = ler_com_cache(("saldos", usuario), lambda: obter_saldos_centavos(usuario))
+        return {chave: moeda.centavos_para_reais(valor) for chave, valor in saldos.items()}
+    except Exception as e:
+        logger.error(f"Erro ao calcular saldos: {str(e)}")
+        return {'colaborador': 0.0, 'emprestado': 0.0, 'total': 0.0}
+
+# Função para comparar a tabela de saldos com o histórico de transações.
+# Retorna a lista de divergências (vazia quando tudo confere).
+def verificar_saldos():
+    with conexao_banco() as conn:
+        calculados = {
+            (row["usuario"], row["origem"]): (row["saldo_centavos"], row["quantidade"])
+            for row in conn.execute(_SQL_SALDOS_CALCULADOS).fetchall()
+        }
+        materializados = {
+            (row["usuario"], row["origem_saldo"]): (row["saldo_centavos"], row["quantidade"])
+            for row in conn.execute("SELECT usuario, origem_saldo, saldo_centavos, quantidade FROM saldos").fetchall()
+        }
+    divergencias = []
+    for chave in sorted(set(calculados) | set(materializados)):
+        saldo_calc, qtd_calc = calculados.get(chave, (0, 0))
+        saldo_mat, qtd_mat = materializados.get(chave, (0, 0))
+        if saldo_calc != saldo_mat or qtd_calc != qtd_mat:
+            divergencias.append({
+                "Usuário": chave[0],
+                "Origem": chave[1],
+                "Saldo Materializado": moeda.centavos_para_reais(saldo_mat),
+                "Saldo Calculado": moeda.centavos_para_reais(saldo_calc),
+                "Qtd. Materializada": qtd_mat,
+                "Qtd. Calculada": qtd_calc,
+            })
+    return divergencias
+
+# Função para reconstruir a tabela de saldos a partir do histórico
+def reconstruir_saldos():
+    with conexao_banco() as conn:
+        iniciar_escrita(conn)
+        _popular_saldos(conn.cursor())
+    invalidar_cache_leituras()
+
+def obter_saldo(usuario):
+    """Mantida para compatibilidade, agora usa obter_saldos_separados"""
+    saldos = obter_saldos_separados(usuario)
+    return saldos['total']
+
+# Função para obter a cor do saldo de acordo com o valor
+def cor_do_saldo(saldo):
+    if (saldo >= 1000):
+        return "blue"
+    elif (saldo >= 500):
+        return "green"
+    elif (saldo >= 0):
+        return "orange"
+    else:
+        return "red"
+
+# Função para obter, em uma única consulta, a situação de todos os usuários com
+# transações: saldos (total, colaborador, emprestado), status/cor do saldo e o
+# estado do caixa (última abertura/fechamento, dias em aberto, data de fechamento)
+def obter_status_usuarios(hoje=None):
+    hoje = hoje or datetime.now().date()
+
+    # Consulta única, mantida no cache de leituras até a próxima escrita
+    def consultar():
+        with conexao_banco() as conn:
+            return conn.execute("""
+                WITH caixa AS (
+                    SELECT
+                        usuario,
+                        MAX(CASE WHEN perfil = 'Entrada de Caixa' THEN status_caixa END) AS ultima_abertura,
+                        MAX(CASE WHEN perfil = 'Saída de Caixa' THEN status_caixa END) AS ultimo_fechamento
+                    FROM transacoes
+                    WHERE status_caixa IS NOT NULL
+                      AND origem_saldo = 'colaborador'
+                      AND perfil IN ('Entrada de Caixa', 'Saída de Caixa')
+                    GROUP BY usuario
+                )
+                SELECT
+                    s.usuario,
+                    SUM(CASE WHEN s.origem_saldo = 'colaborador' THEN s.saldo_centavos ELSE 0 END) AS saldo_colaborador,
+                    SUM(CASE WHEN s.origem_saldo = 'emprestado' THEN s.saldo_centavos ELSE 0 END) AS saldo_emprestado,
+                    c.ultima_abertura,
+                    c.ultimo_fechamento
+                FROM saldos s
+                LEFT JOIN caixa c ON c.usuario = s.usuario
+                GROUP BY s.usuario
+                HAVING SUM(s.quantidade) > 0
+            """).fetchall()
+
+    try:
+        linhas = ler_com_cache(("status_usuarios",), consultar)
+    except Exception as e:
+        logger.error(f"Erro ao obter status dos usuários: {str(e)}")
+        return []
+
+    status_usuarios = []
+    for row in linhas:
+        saldo_colab = moeda.centavos_para_reais(row["saldo_colaborador"])
+        saldo_emp = moeda.centavos_para_reais(row["saldo_emprestado"])
+        saldo = moeda.centavos_para_reais((row["saldo_colaborador"] or 0) + (row["saldo_emprestado"] or 0))
+        cor = cor_do_saldo(saldo)
+        status = "Excelente" if cor == "blue" else "Bom" if cor == "green" else "Regular" if cor == "orange" else "Negativo"
+
+        # Caixa aberto: há abertura e não há fechamento posterior a ela
+        ultima_abertura = extrair_data_para_date(row["ultima_abertura"])
+        ultimo_fechamento = extrair_data_para_date(row["ultimo_fechamento"])
+        dias_caixa = None
+        fechamento = None
+        if ultima_abertura and (not ultimo_fechamento or ultimo_fechamento < ultima_abertura):
+            dias_caixa = (hoje - ultima_abertura).days
+            # Data de fechamento: 30 dias após a abertura
+            fechamento = ultima_abertura + timedelta(days=30)
+
+        status_usuarios.append({
+            "Usuário": row["usuario"],
+            "Saldo": saldo,
+            "Saldo_Formatado": moeda.formatar_centavos(moeda.para_centavos(saldo)),
+            "Saldo_Colaborador": saldo_colab,
+            "Saldo_Emprestado": saldo_emp,
+            "Status": status,
+            "Cor": cor,
+            "Dias_Caixa": dias_caixa,
+            "Fechamento_Caixa": fechamento,
+        })
+    return status_usuarios
+
+# Colunas do DataFrame de transações usado nas listas e na exportação
+COLUNAS_DATAFRAME_TRANSACOES = [
+    "Data", "Data_ts", "Hora", "Data_Ordenacao", "Perfil", "Valor", "Valor_Centavos",
+    "Valor_Display", "Símbolo", "Cor", "Descrição", "ID", "Tipo", "Foto", "Foto_Previa", "Foto_Miniatura",
+    "Status_Foto",
+]
+
+# Função para criar um DataFrame com as transações (operações colunares, sem laço por linha)
+def criar_dataframe_transacoes(transacoes):
+    bruto = pd.DataFrame.from_records(transacoes) if not isinstance(transacoes, pd.DataFrame) else transacoes
+    if bruto.empty:
+        return pd.DataFrame(columns=COLUNAS_DATAFRAME_TRANSACOES)
+
+    data_dt = pd.to_datetime(bruto["data_ts"], unit="s")
+    centavos = bruto["valor_centavos"].fillna(0).astype("int64")
+    entrada = (bruto["perfil"] == "Entrada de Caixa").to_numpy()
+
+    # Data exibida no formato brasileiro; textos sem timestamp são mantidos como estão
+    data_hora, data_ordenacao, hora = formatar_datas_br(data_dt)
+    data_display = data_hora.fillna(bruto["data"].fillna("-"))
+
+    # Foto só quando o arquivo está registrado e presente no disco (tabela fotos)
+    foto_presente = bruto["arquivo_foto"].notna() & (bruto["arquivo_foto"] != ARQUIVO_AUSENTE)
+
+    df = pd.DataFrame({
+        "Data": data_display,
+        "Data_ts": bruto["data_ts"],
+        "Hora": hora.fillna("00:00"),
+        "Data_Ordenacao": data_ordenacao.fillna(data_display),
+        "Perfil": bruto["perfil"],
+        "Valor": centavos / 100,
+        "Valor_Centavos": centavos,
+        # Valor sem o prefixo "R$ " (o símbolo +/- é exibido antes dele)
+        "Valor_Display": moeda.formatar_serie_centavos(centavos, prefixo=""),
+        "Símbolo": np.where(entrada, "+", "-"),
+        "Cor": np.where(entrada, "green", "red"),
+        "Descrição": bruto["descricao"],
+        "ID": bruto["id_transacao"],
+        "Tipo": np.where(entrada, "Entrada", "Saída"),
+        "Foto": bruto["caminho_foto"].where(foto_presente).fillna(""),
+        "Foto_Previa": bruto["caminho_previa"].fillna(""),
+        "Foto_Miniatura": bruto["caminho_miniatura"].fillna(""),
+        "Status_Foto": bruto["status_foto"].fillna(""),
+    })
+    return df.sort_values(by="Data_ts", ascending=False, kind="stable")
+
+# Função para obter o DataFrame das transações filtradas (em cache até a próxima escrita)
+def obter_dataframe_transacoes(usuario=None, perfil=None, ano=None, mes=None, origem_saldo=None):
+    return ler_com_cache(
+        ("dataframe_transacoes", usuario, perfil, ano, mes, origem_saldo),
+        lambda: criar_dataframe_transacoes(obter_transacoes(usuario, perfil, ano, mes, origem_saldo))
+    )
+
+# Função para obter uma página de transações do usuário como DataFrame. Devolve
+# (DataFrame, cursor da próxima página); o cursor é None na última página.
+def obter_pagina_transacoes_usuario(usuario, tamanho, apos=None, perfil=None, ano=None, mes=None):
+    def carregar():
+        # Uma linha a mais indica se existe página seguinte
+        transacoes = obter_transacoes(usuario, perfil, ano, mes, limite=tamanho + 1, apos=apos)
+        pagina, restante = transacoes[:tamanho], transacoes[tamanho:]
+        proximo = (pagina[-1]["data_ts"], pagina[-1]["rowid_transacao"]) if restante else None
+        return criar_dataframe_transacoes(pagina), proximo
+    return ler_com_cache(("pagina_transacoes_usuario", usuario, tamanho, apos, perfil, ano, mes), carregar)
+
+def atualizar_transacao(id_transacao, tipo, valor, descricao, perfil, data, foto=None):
+    try:
+        # Converter o valor para centavos (valor_float é gravado em "valor", em reais)
+        valor_centavos = moeda.para_centavos(valor)
+        valor_float = moeda.centavos_para_reais(valor_centavos)
+        
+        # Verifica se a data está no formato brasileiro e converte para ISO se necessário
+        try:
+            if '/' in data: 
+                # Extrair a parte da data e da hora
+                partes = data.split(' ', 1)
+                data_parte = partes[0]
+                hora_parte = partes[1] if len(partes) > 1 else ""
+                
+                # Converter a data para formato ISO
+                data_obj = datetime.strptime(data_parte, '%d/%m/%Y')
+                data_iso = data_obj.strftime('%Y-%m-%d')
+                
+                # Reconstruir a string de data/hora
+                data = data_iso + " " + hora_parte
+        except:
+            pass
+        
+        # Obter dados da transação atual
+        with conexao_banco() as conn:
+            resultado = conn.execute("SELECT usuario, origem_saldo FROM transacoes WHERE id_transacao = ?", (id_transacao,)).fetchone()
+            
+            if not resultado:
+                return False
+                
+            usuario = resultado[0]
+            origem_saldo = resultado[1] if resultado[1] else 'colaborador'
+            
+        # Nova foto, se houver: processada em segundo plano após o commit. A foto
+        # anterior continua valendo até a nova ficar pronta.
+        foto_pendente = preparar_foto_transacao(id_transacao, foto) if foto is not None else None
+
+        # Atualizar a transação, o saldo e o caixa na mesma transação do banco
+        data_ts = converter_data_para_timestamp(data)
+        with conexao_banco() as conn:
+            iniciar_escrita(conn)
+            # Reler perfil/valor/data já com o lock de escrita, para trocar o efeito no saldo
+            registro_atual = conn.execute("SELECT perfil, valor_centavos, data_ts FROM transacoes WHERE id_transacao = ?", (id_transacao,)).fetchone()
+            if not registro_atual:
+                return False
+
+            # Saldo do colaborador ANTES da transação editada (removendo o efeito
+            # atual dela), lido na mesma transação de escrita
+            saldo_antes = obter_saldos_centavos(usuario)['colaborador']
+            if origem_saldo == 'colaborador':
+                if registro_atual["perfil"] == "Entrada de Caixa":
+                    saldo_antes -= registro_atual["valor_centavos"]
+                else:
+                    saldo_antes += registro_atual["valor_centavos"]
+            status_caixa = _status_caixa_transacao(origem_saldo, perfil, data, saldo_antes, valor_centavos)
+
+            conn.execute(
+                "UPDATE transacoes SET tipo = ?, valor = ?, valor_centavos = ?, descricao = ?, perfil = ?, data = ?, data_ts = ?, status_caixa = ? WHERE id_transacao = ?",
+                (tipo, valor_float, valor_centavos, descricao, perfil, data, data_ts, status_caixa, id_transacao)
+            )
+            if foto_pendente:
+                conn.execute("UPDATE transacoes SET status_foto = ? WHERE id_transacao = ?", (FOTO_PENDENTE, id_transacao))
+            atualizar_saldo_materializado(conn, usuario, origem_saldo, registro_atual["perfil"], registro_atual["valor_centavos"], -1)
+            atualizar_saldo_materializado(conn, usuario, origem_saldo, perfil, valor_centavos, +1)
+            
+            # Recalcular a partir da menor data afetada (a antiga ou a nova). O
+            # status_caixa só é recalculado se for transação de CAIXA colaborador;
+            # nas demais apenas os checkpoints posteriores são atualizados. Uma
+            # falha no recálculo desfaz a edição inteira.
+            if origem_saldo == 'colaborador':
+                # Sem uma das datas (texto não reconhecido) reprocessa todo o histórico
+                datas_afetadas = [registro_atual["data_ts"], data_ts]
+                a_partir_de = None if None in datas_afetadas else min(datas_afetadas)
+                atualizar_status = perfil in ['Entrada de Caixa', 'Saída de Caixa']
+                _recalcular_caixa(conn.cursor(), usuario, a_partir_de, atualizar_status=atualizar_status)
+        
+        # Leituras em cache ficaram desatualizadas
+        invalidar_cache_leituras()
+
+        if foto_pendente:
+            agendar_foto_transacao(id_transacao, foto_pendente)
+        
+        # Criar backup após atualizar transação
+        criar_backup_banco_dados()
+        
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao atualizar transação: {str(e)}")
+        return False
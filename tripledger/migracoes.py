@@ -0,0 +1,340 @@
+"""
+Esquema do banco: migrações versionadas (tabela schema_version) e a
+reconstrução dos dados derivados (saldos e checkpoints do caixa).
+"""
+import functools
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from tripledger import moeda
+from tripledger.caixa import _recalcular_caixa
+from tripledger.datas import converter_data_para_timestamp
+from tripledger.ledger import _popular_saldos
+from tripledger.photos import (
+    migrar_fotos_para_conteudo, registrar_fotos_existentes, remover_fotos_legadas, retomar_fotos_pendentes,
+)
+from tripledger.storage import conexao_banco
+
+# Funções auxiliares das migrações: bancos antigos (criados antes do controle de
+# versão) podem já ter algumas colunas, então elas só são adicionadas se faltarem
+def _colunas_da_tabela(cursor, tabela):
+    # table_xinfo inclui as colunas geradas (ver migração 12), que table_info omite
+    return {row[1] for row in cursor.execute(f"PRAGMA table_xinfo({tabela})").fetchall()}
+
+def _adicionar_coluna_se_nao_existir(cursor, tabela, coluna, definicao):
+    if coluna not in _colunas_da_tabela(cursor, tabela):
+        cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+
+# Migração 1: tabelas de usuários e de transações
+def _migracao_tabelas_base(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        senha TEXT NOT NULL,
+        tipo TEXT DEFAULT 'colaborador'
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS transacoes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_transacao TEXT UNIQUE,
+        usuario TEXT NOT NULL,
+        tipo TEXT NOT NULL,
+        valor REAL NOT NULL,
+        descricao TEXT,
+        perfil TEXT NOT NULL,
+        data TEXT NOT NULL,
+        caminho_foto TEXT
+    )
+    ''')
+
+# Migração 2: origem do saldo (colaborador ou emprestado)
+def _migracao_origem_saldo(cursor):
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "origem_saldo", "TEXT DEFAULT 'colaborador'")
+
+# Migração 3: data de início da contagem para entradas de caixa do colaborador
+def _migracao_caixa_inicio(cursor):
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "caixa_inicio", "TEXT")
+
+# Migração 4: data de abertura/fechamento do caixa (ver recalcular_status_caixa_usuario)
+def _migracao_status_caixa(cursor):
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "status_caixa", "TEXT")
+
+# Migração 5: índices secundários para os padrões de acesso do app
+def _migracao_indices(cursor):
+    # Listas por usuário (WHERE usuario = ? ORDER BY data)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_usuario_data ON transacoes (usuario, data)")
+    # Saldos por usuário: índice de cobertura, a soma é feita sem ler a tabela
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_usuario_origem_perfil ON transacoes (usuario, origem_saldo, perfil, valor)")
+    # Painel do supervisor (todas as transações ORDER BY data)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_data ON transacoes (data)")
+
+    # Buscas por id_transacao (editar/excluir). Bancos antigos não têm a restrição
+    # UNIQUE na tabela, então o índice é criado apenas se ainda não houver um.
+    indice_existente = False
+    for indice in cursor.execute("PRAGMA index_list(transacoes)").fetchall():
+        colunas = [c[2] for c in cursor.execute(f"PRAGMA index_info('{indice[1]}')").fetchall()]
+        if indice[2] and colunas == ["id_transacao"]:
+            indice_existente = True
+    if not indice_existente:
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_transacoes_id_transacao ON transacoes (id_transacao)")
+
+    # Login (WHERE nome = ? AND senha = ?). Com nomes duplicados o índice único
+    # não pode ser criado; a migração falha (e nada é aplicado) em vez de escolher
+    # qual cadastro apagar: quem administra o banco decide o que fazer com eles.
+    duplicados = [row[0] for row in cursor.execute(
+        "SELECT nome FROM usuarios GROUP BY nome HAVING COUNT(*) > 1 ORDER BY nome"
+    ).fetchall()]
+    if duplicados:
+        raise sqlite3.IntegrityError(
+            "Nomes de usuário cadastrados mais de uma vez: " + ", ".join(duplicados)
+            + ". Renomeie ou remova os cadastros repetidos na tabela usuarios e inicie o app novamente."
+        )
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_nome ON usuarios (nome)")
+
+# Migração 6: saldos materializados por usuário, atualizados a cada escrita.
+# A tabela é preenchida por _reconstruir_dados_derivados ao fim das migrações.
+def _migracao_saldos(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS saldos (
+        usuario TEXT NOT NULL,
+        origem_saldo TEXT NOT NULL,
+        saldo REAL NOT NULL DEFAULT 0,
+        quantidade INTEGER NOT NULL DEFAULT 0,
+        ultima_atualizacao TEXT,
+        PRIMARY KEY (usuario, origem_saldo)
+    ) WITHOUT ROWID
+    ''')
+
+# Migração 7: checkpoints do caixa. Cada transação do colaborador guarda o saldo
+# simulado e o estado do caixa logo após ela, para que o recálculo do status_caixa
+# possa recomeçar do ponto editado em vez de reprocessar todo o histórico.
+# Os valores são preenchidos por _reconstruir_dados_derivados.
+def _migracao_checkpoint_caixa(cursor):
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "caixa_saldo_apos", "REAL")
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "caixa_aberto_apos", "INTEGER")
+
+# Migração 8: índice parcial com as transações que abriram/fecharam caixa,
+# usado pelo status de usuários do painel do supervisor
+def _migracao_indice_status_caixa(cursor):
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transacoes_status_caixa
+        ON transacoes (usuario, perfil, status_caixa, origem_saldo)
+        WHERE status_caixa IS NOT NULL
+    """)
+
+# Migração 9: data normalizada em timestamp inteiro (segundos desde 1970, hora
+# de parede tratada como UTC), usada em toda ordenação e filtro por período.
+# Substitui os índices sobre o texto de "data", que mistura formatos ISO e BR.
+def _migracao_data_ts(cursor):
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "data_ts", "INTEGER")
+    registros = cursor.execute("SELECT rowid AS rowid, data FROM transacoes WHERE data_ts IS NULL").fetchall()
+    cursor.executemany(
+        "UPDATE transacoes SET data_ts = ? WHERE rowid = ?",
+        [(converter_data_para_timestamp(r["data"]), r["rowid"]) for r in registros]
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_usuario_data_ts ON transacoes (usuario, data_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_data_ts ON transacoes (data_ts)")
+    cursor.execute("DROP INDEX IF EXISTS idx_transacoes_usuario_data")
+    cursor.execute("DROP INDEX IF EXISTS idx_transacoes_data")
+
+# Migração 10: valores em centavos inteiros (ver moeda.py). transacoes.valor
+# continua gravado em reais para leitura externa; saldos e checkpoints do
+# caixa passam a ser inteiros, sem tolerâncias de arredondamento.
+def _migracao_centavos(cursor):
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "valor_centavos", "INTEGER")
+    registros = cursor.execute("SELECT rowid AS rowid, valor FROM transacoes").fetchall()
+    centavos = moeda.serie_para_centavos(pd.Series([r["valor"] for r in registros], dtype=object))
+    cursor.executemany(
+        "UPDATE transacoes SET valor_centavos = ?, valor = ? WHERE rowid = ?",
+        [(int(c), moeda.centavos_para_reais(c), r["rowid"]) for c, r in zip(centavos, registros)]
+    )
+    cursor.execute("DROP INDEX IF EXISTS idx_transacoes_usuario_origem_perfil")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_usuario_origem_perfil ON transacoes (usuario, origem_saldo, perfil, valor_centavos)")
+
+    # Saldos são dados derivados: recriar a tabela com o saldo em centavos
+    cursor.execute("DROP TABLE IF EXISTS saldos")
+    cursor.execute('''
+    CREATE TABLE saldos (
+        usuario TEXT NOT NULL,
+        origem_saldo TEXT NOT NULL,
+        saldo_centavos INTEGER NOT NULL DEFAULT 0,
+        quantidade INTEGER NOT NULL DEFAULT 0,
+        ultima_atualizacao TEXT,
+        PRIMARY KEY (usuario, origem_saldo)
+    ) WITHOUT ROWID
+    ''')
+
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "caixa_saldo_centavos_apos", "INTEGER")
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        cursor.execute("ALTER TABLE transacoes DROP COLUMN caixa_saldo_apos")
+
+# Função para criar os triggers que incrementam o contador de alterações a cada
+# INSERT, UPDATE e DELETE em `tabela`
+def _criar_triggers_contador(cursor, tabela):
+    for operacao in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{tabela}_{operacao.lower()}_contador
+            AFTER {operacao} ON {tabela}
+            BEGIN
+                UPDATE contador_alteracoes SET versao = versao + 1 WHERE id = 1;
+            END
+        """)
+
+# Migração 11: contador de alterações para o cache de leituras (ver ler_com_cache).
+# Triggers incrementam o contador a cada escrita em transacoes ou saldos, inclusive
+# de outros processos do servidor usando o mesmo arquivo, sem serviço de cache externo.
+def _migracao_contador_alteracoes(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS contador_alteracoes (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        versao INTEGER NOT NULL
+    )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO contador_alteracoes (id, versao) VALUES (1, 0)")
+    for tabela in ("transacoes", "saldos"):
+        _criar_triggers_contador(cursor, tabela)
+
+# Migração 12: ano e mês como colunas geradas a partir de data_ts, indexadas para
+# os filtros por período (ver obter_transacoes) e para a lista de anos disponíveis.
+# São VIRTUAL: calculadas na leitura e gravadas apenas nos índices.
+def _migracao_ano_mes(cursor):
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "ano",
+        "INTEGER GENERATED ALWAYS AS (CAST(strftime('%Y', data_ts, 'unixepoch') AS INTEGER)) VIRTUAL")
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "mes",
+        "INTEGER GENERATED ALWAYS AS (CAST(strftime('%m', data_ts, 'unixepoch') AS INTEGER)) VIRTUAL")
+    # Lista do colaborador (WHERE usuario = ? AND ano = ? AND mes = ? ORDER BY data_ts)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_usuario_ano_mes ON transacoes (usuario, ano, mes, data_ts)")
+    # Painel do supervisor (todas as transações de um mês/ano)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_ano_mes ON transacoes (ano, mes, data_ts)")
+
+# Migração 13: estado do processamento da foto em segundo plano (ver
+# photos.agendar_foto_transacao). Fotos já gravadas foram processadas na inclusão.
+def _migracao_status_foto(cursor):
+    _adicionar_coluna_se_nao_existir(cursor, "transacoes", "status_foto", "TEXT")
+    cursor.execute("UPDATE transacoes SET status_foto = 'pronta' WHERE caminho_foto IS NOT NULL AND status_foto IS NULL")
+
+# Migração 14: fotos endereçadas por conteúdo (ver photos.DIRETORIO_FOTOS).
+# O índice sustenta a contagem de referências de photos.liberar_foto; a tabela
+# fotos_legadas guarda os arquivos antigos já migrados, apagados após o commit.
+def _migracao_fotos_por_conteudo(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_caminho_foto ON transacoes (caminho_foto)")
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS fotos_legadas (
+        caminho TEXT PRIMARY KEY,
+        caminho_novo TEXT NOT NULL
+    )
+    ''')
+    migrar_fotos_para_conteudo(cursor)
+
+# Migração 15: tabela fotos, um registro por arquivo (ver photos.ARQUIVO_OK):
+# tamanho, dimensões, hash, versões reduzidas e situação no disco. As listas de
+# transações leem a tabela em vez de consultar o sistema de arquivos; como elas
+# passam pelo cache de leituras, escritas em fotos também incrementam o contador.
+def _migracao_tabela_fotos(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS fotos (
+        caminho TEXT PRIMARY KEY,
+        hash TEXT,
+        bytes INTEGER,
+        largura INTEGER,
+        altura INTEGER,
+        formato TEXT,
+        caminho_previa TEXT,
+        caminho_miniatura TEXT,
+        status TEXT NOT NULL,
+        registrada_em TEXT NOT NULL
+    )
+    ''')
+    _criar_triggers_contador(cursor, "fotos")
+    registrar_fotos_existentes(cursor)
+
+# Migração 16: bytes enviados de cada foto (SHA-256 do upload -> arquivo gravado).
+# O reenvio do mesmo comprovante reaproveita o arquivo sem processá-lo de novo,
+# mesmo que o codificador produza bytes diferentes (ver photos.ingerir_foto).
+def _migracao_envios_fotos(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS envios_fotos (
+        hash_envio TEXT PRIMARY KEY,
+        caminho TEXT NOT NULL
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_envios_fotos_caminho ON envios_fotos (caminho)")
+
+# Lista ordenada de migrações: (versão, descrição, função).
+# Novas alterações de esquema devem ser ADICIONADAS ao final, nunca editadas.
+MIGRACOES = [
+    (1, "Tabelas usuarios e transacoes", _migracao_tabelas_base),
+    (2, "Coluna transacoes.origem_saldo", _migracao_origem_saldo),
+    (3, "Coluna transacoes.caixa_inicio", _migracao_caixa_inicio),
+    (4, "Coluna transacoes.status_caixa", _migracao_status_caixa),
+    (5, "Índices de transacoes e usuarios", _migracao_indices),
+    (6, "Tabela saldos", _migracao_saldos),
+    (7, "Checkpoints do caixa em transacoes", _migracao_checkpoint_caixa),
+    (8, "Índice parcial de status_caixa", _migracao_indice_status_caixa),
+    (9, "Coluna transacoes.data_ts", _migracao_data_ts),
+    (10, "Valores em centavos", _migracao_centavos),
+    (11, "Contador de alterações", _migracao_contador_alteracoes),
+    (12, "Colunas geradas transacoes.ano e transacoes.mes", _migracao_ano_mes),
+    (13, "Coluna transacoes.status_foto", _migracao_status_foto),
+    (14, "Fotos endereçadas por conteúdo", _migracao_fotos_por_conteudo),
+    (15, "Tabela fotos", _migracao_tabela_fotos),
+    (16, "Tabela envios_fotos", _migracao_envios_fotos),
+]
+
+# Função para recalcular os dados derivados do histórico (tabela de saldos e
+# checkpoints do caixa) com o código e o esquema atuais. O status_caixa já
+# gravado é mantido.
+def _reconstruir_dados_derivados(cursor):
+    _popular_saldos(cursor)
+    usuarios = [row[0] for row in cursor.execute("SELECT DISTINCT usuario FROM transacoes").fetchall()]
+    for usuario in usuarios:
+        _recalcular_caixa(cursor, usuario, atualizar_status=False)
+
+# Função para aplicar as migrações pendentes, registrando cada uma em schema_version.
+# Todas as pendentes são aplicadas em uma única transação, seguidas da reconstrução
+# dos dados derivados: as migrações alteram apenas o esquema e nunca dependem de
+# colunas criadas por migrações posteriores.
+def aplicar_migracoes():
+    with conexao_banco() as conn:
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            versao INTEGER PRIMARY KEY,
+            descricao TEXT NOT NULL,
+            aplicada_em TEXT NOT NULL
+        )
+        ''')
+        conn.commit()
+
+        # BEGIN IMMEDIATE garante que só um processo aplica as migrações;
+        # os demais esperam o lock e então encontram as versões já registradas
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            aplicadas = {row[0] for row in conn.execute("SELECT versao FROM schema_version").fetchall()}
+            pendentes = [m for m in MIGRACOES if m[0] not in aplicadas]
+            for versao, descricao, migracao in pendentes:
+                migracao(conn.cursor())
+                conn.execute(
+                    "INSERT INTO schema_version (versao, descricao, aplicada_em) VALUES (?, ?, ?)",
+                    (versao, descricao, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                )
+            if pendentes:
+                _reconstruir_dados_derivados(conn.cursor())
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+# Inicializar o banco de dados uma única vez por processo. O Streamlit reexecuta
+# as páginas a cada interação; o cache evita repetir DDL em cada rerun. Arquivos
+# de foto do formato antigo já migrados são apagados, e fotos que ficaram
+# pendentes em uma execução anterior voltam para a fila.
+@functools.cache
+def inicializar_banco_dados():
+    aplicar_migracoes()
+    remover_fotos_legadas()
+    retomar_fotos_pendentes()
+    return True
@@ -0,0 +1,124 @@
+"""
+Valores monetários em centavos inteiros.
+
+Converte textos em formato brasileiro (1.234,56) ou americano (1,234.56) para
+centavos e formata centavos como "R$ 1.234,56". Cada operação existe em versão
+escalar e em versão vetorizada sobre uma pandas.Series inteira; as duas seguem
+as mesmas regras e produzem o mesmo resultado.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# Caracteres mantidos do texto digitado; o restante ("R$", espaços) é descartado
+_CARACTERES_INVALIDOS = r"[^0-9,.\-]"
+
+# Função para normalizar um texto numérico para o formato americano sem milhares.
+# O último separador (vírgula ou ponto) é o decimal; os demais são de milhares.
+def _normalizar_texto(texto):
+    texto = "".join(c for c in texto if c.isdigit() or c in ",.-")
+    if texto.rfind(",") > texto.rfind("."):
+        return texto.replace(".", "").replace(",", ".")
+    return texto.replace(",", "")
+
+# Função para arredondar reais para centavos (meio centavo para longe do zero)
+def _arredondar_centavos(reais):
+    return int(math.copysign(math.floor(abs(reais) * 100 + 0.5), reais))
+
+def para_centavos(valor):
+    """Converte número ou texto (BR ou US) em centavos. Inválido vale 0."""
+    if valor is None:
+        return 0
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        reais = float(valor)
+    else:
+        try:
+            reais = float(_normalizar_texto(str(valor).strip()))
+        except ValueError:
+            return 0
+    if math.isnan(reais) or math.isinf(reais):
+        return 0
+    return _arredondar_centavos(reais)
+
+def serie_para_centavos(serie):
+    """Versão vetorizada de para_centavos: devolve uma Series int64."""
+    serie = pd.Series(serie)
+    if pd.api.types.is_numeric_dtype(serie):
+        reais = serie.astype("float64")
+    else:
+        textos = serie.astype("string").str.replace(_CARACTERES_INVALIDOS, "", regex=True)
+        decimal_virgula = textos.str.rfind(",") > textos.str.rfind(".")
+        normalizados = textos.str.replace(",", "", regex=False).where(
+            ~decimal_virgula,
+            textos.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+        )
+        reais = pd.to_numeric(normalizados, errors="coerce").astype("float64")
+    reais = reais.replace([np.inf, -np.inf], np.nan).fillna(0.0)
+    centavos = np.copysign(np.floor(np.abs(reais.to_numpy()) * 100 + 0.5), reais.to_numpy())
+    return pd.Series(centavos.astype("int64"), index=serie.index)
+
+def centavos_para_reais(centavos):
+    """Converte centavos inteiros em reais (float), para exibição e gráficos."""
+    return int(centavos or 0) / 100
+
+def formatar_centavos(centavos):
+    """Formata centavos como "R$ 1.234,56" (negativos como "R$ -1.234,56")."""
+    centavos = int(centavos or 0)
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(centavos), 100)
+    return f"R$ {sinal}{reais:,}".replace(",", ".") + f",{resto:02d}"
+
+# Linhas processadas por vez em _formatar_array_centavos (limita a memória das
+# matrizes intermediárias em tabelas grandes)
+_BLOCO_FORMATACAO = 65536
+
+# Função para formatar um array de centavos sem laço por valor. Cada texto é
+# montado da direita para a esquerda em uma matriz de códigos de caractere (uma
+# linha por valor, zeros à direita como preenchimento) vista como array de strings.
+def _formatar_array_centavos(centavos, prefixo):
+    centavos = np.asarray(centavos, dtype=np.int64)
+    if len(centavos) > _BLOCO_FORMATACAO:
+        return np.concatenate([
+            _formatar_array_centavos(centavos[inicio:inicio + _BLOCO_FORMATACAO], prefixo)
+            for inicio in range(0, len(centavos), _BLOCO_FORMATACAO)
+        ])
+    if len(centavos) == 0:
+        return np.array([], dtype="<U1")
+
+    potencias = 10 ** np.arange(19, dtype=np.int64)
+    negativo = (centavos < 0)[:, None]
+    reais, resto = np.divmod(np.abs(centavos), 100)
+    digitos = np.searchsorted(potencias[1:], reais, side="right") + 1
+    inteiro = digitos + (digitos - 1) // 3          # dígitos e pontos de milhar
+    corpo = inteiro + 3                             # mais ",cc"
+    total = corpo + negativo[:, 0] + len(prefixo)
+
+    # k: posição de cada coluna contada a partir do fim do texto da linha
+    k = total[:, None] - 1 - np.arange(total.max())[None, :]
+    reais, resto, inteiro, corpo = reais[:, None], resto[:, None], inteiro[:, None], corpo[:, None]
+
+    codigos = np.zeros(k.shape, dtype=np.int64)
+    codigos = np.where(k == 0, ord("0") + resto % 10, codigos)
+    codigos = np.where(k == 1, ord("0") + resto // 10, codigos)
+    codigos = np.where(k == 2, ord(","), codigos)
+    j = k - 3
+    na_parte_inteira = (j >= 0) & (j < inteiro)
+    ponto = na_parte_inteira & (j % 4 == 3)
+    indice_digito = np.clip(j - j // 4, 0, 18)
+    digito = reais // potencias[indice_digito] % 10
+    codigos = np.where(na_parte_inteira & ~ponto, ord("0") + digito, codigos)
+    codigos = np.where(ponto, ord("."), codigos)
+    codigos = np.where(negativo & (k == corpo), ord("-"), codigos)
+    posicao_prefixo = k - corpo - negativo
+    for posicao, caractere in enumerate(reversed(prefixo)):
+        codigos = np.where(posicao_prefixo == posicao, ord(caractere), codigos)
+
+    codigos = np.ascontiguousarray(codigos, dtype=np.uint32)
+    return codigos.view(f"<U{codigos.shape[1]}").ravel()
+
+def formatar_serie_centavos(serie, prefixo="R$ "):
+    """Versão vetorizada de formatar_centavos: devolve uma Series de textos."""
+    serie = pd.Series(serie)
+    centavos = serie.fillna(0).astype("int64").to_numpy()
+    return pd.Series(_formatar_array_centavos(centavos, prefixo), index=serie.index, dtype=object)
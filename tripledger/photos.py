@@ -0,0 +1,878 @@
+"""
+Fotos dos comprovantes: processamento da imagem (Pillow) e gravação em
+DIRETORIO_FOTOS, um arquivo por conteúdo (SHA-256). O mesmo comprovante enviado
+em mais de uma transação é gravado uma vez: os bytes enviados são reconhecidos
+pelo SHA-256 deles (tabela envios_fotos) antes de qualquer processamento, e
+imagens que resultam nos mesmos bytes gravados compartilham o arquivo. Os
+arquivos só são removidos quando
+nenhuma transação os referencia (liberar_foto). Uma pasta de fotos serve a um
+único banco: cópias do banco (storage.DB_PATH) usam os arquivos da pasta, mas
+não os apagam (pasta_fotos_do_banco).
+
+O processamento acontece em segundo plano. Na inclusão/edição os bytes enviados
+são apenas gravados em DIRETORIO_PENDENTES (preparar_foto_transacao) e a
+transação é confirmada com status_foto "pendente"; após o commit a foto é
+agendada (agendar_foto_transacao) em um pool limitado de threads, que processa
+a imagem, grava caminho_foto e marca status_foto como "pronta" ou "erro".
+Fotos pendentes sobrevivem a um reinício: retomar_fotos_pendentes() as agenda
+de novo na inicialização.
+
+Cada foto é decodificada uma vez, validada, orientada pelo EXIF, reduzida e
+codificada segundo PERFIL_COMPROVANTE e gravada de forma atômica (ingerir_foto).
+Fotos gravadas com perfis anteriores podem ser recodificadas (recodificar_fotos).
+Falhas não impedem o registro da transação: são informadas pelo logger do
+módulo, status_foto fica "erro" e a transação fica sem foto (ou com a anterior).
+"""
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import io
+import logging
+import os
+import shutil
+import string
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from tripledger import storage
+from tripledger.storage import conexao_banco, iniciar_escrita, invalidar_cache_leituras
+
+logger = logging.getLogger(__name__)
+
+# Diretório das fotos, relativo ao diretório de trabalho do app. Cada foto é
+# gravada uma vez, com o nome dado pelo SHA-256 do conteúdo, em dois níveis de
+# subdiretórios: fotos/ab/cd/abcd...<64 hex>.webp. Transações com o mesmo
+# comprovante apontam para o mesmo arquivo.
+DIRETORIO_FOTOS = "fotos"
+# Arquivo em DIRETORIO_FOTOS com o banco dono da pasta (caminho relativo ao
+# diretório que contém a pasta). Uma pasta de fotos serve a um único banco.
+ARQUIVO_DONO_FOTOS = ".banco"
+# Perfil de codificação das fotos de comprovante. Scripts podem alterar os
+# valores antes de processar fotos ou passar outro perfil a recodificar_fotos.
+PERFIL_COMPROVANTE = {
+    "lado_maximo": 2048,          # maior lado em pixels (None mantém a resolução da câmera)
+    "formato": "WEBP",            # "JPEG", "WEBP" ou "AVIF" (se o Pillow tiver suporte)
+    "qualidade": 80,
+    "tons_de_cinza": False,       # comprovantes continuam legíveis em cinza, com arquivos menores
+    "forcar_retrato": False,      # gira fotos deitadas (comportamento antigo); a orientação EXIF é sempre aplicada
+}
+# Extensão de arquivo de cada formato
+EXTENSOES_FORMATO = {"JPEG": ".jpg", "WEBP": ".webp", "AVIF": ".avif"}
+
+# Versões reduzidas geradas junto com a foto: nome -> (subdiretório, maior lado em
+# pixels). A miniatura vai nas listas, a prévia no detalhe da transação; a foto
+# original só é enviada ao navegador quando pedida. O caminho de cada versão
+# inclui o perfil dela (lado e qualidade, ver perfil_rendicao): mudar os valores
+# muda as URLs junto com o conteúdo, e as versões do perfil novo são geradas por
+# gerar_rendicoes_faltantes.
+RENDICOES = {
+    "previa": ("previas", 1280),
+    "miniatura": ("miniaturas", 320),
+}
+FOTO_QUALIDADE_RENDICOES = 80
+# Bytes enviados aguardando processamento ("<id_transacao>__<token>")
+DIRETORIO_PENDENTES = os.path.join(DIRETORIO_FOTOS, "pendentes")
+
+# Pool de processamento. Threads bastam: o Pillow libera o GIL ao decodificar e
+# codificar, e o resultado é gravado pelo mesmo pool de conexões do processo.
+FOTOS_TRABALHADORES = 2           # fotos processadas ao mesmo tempo
+FOTOS_FILA_MAXIMA = 32            # fotos aguardando; com a fila cheia, processa na própria chamada
+_TRAVAS_TRANSACOES = 64           # travas por transação e por arquivo (distribuídas por hash)
+
+# Estados do processamento (coluna transacoes.status_foto; None = sem foto)
+FOTO_PENDENTE = "pendente"
+FOTO_PRONTA = "pronta"
+FOTO_ERRO = "erro"
+
+# Situação de cada arquivo na tabela fotos (um registro por arquivo, gravado na
+# entrada da foto): as listas decidem o que exibir por ela, sem consultar o disco
+ARQUIVO_OK = "ok"                     # original e versões reduzidas gravadas
+ARQUIVO_SEM_VERSOES = "sem_versoes"   # original sem alguma versão reduzida
+ARQUIVO_AUSENTE = "ausente"           # original não encontrado
+
+# Função para decodificar a foto enviada uma única vez e normalizá-la segundo o
+# perfil: valida as dimensões, aplica a orientação EXIF da câmera, converte o modo
+# de cor e reduz ao lado máximo. Levanta exceção se os bytes não forem uma imagem
+# legível.
+def _normalizar_imagem(foto_bytes, perfil=None):
+    # Pillow só é carregado quando há foto para processar
+    from PIL import Image, ImageOps
+    perfil = perfil or PERFIL_COMPROVANTE
+    imagem = Image.open(io.BytesIO(foto_bytes))
+    # Decodificação completa aqui: um arquivo truncado falha antes de qualquer gravação
+    imagem.load()
+    if imagem.width == 0 or imagem.height == 0:
+        raise ValueError("Dimensões da imagem inválidas")
+
+    # Celulares gravam a foto "deitada" e indicam a rotação no EXIF; transpose
+    # apenas reordena os pixels, sem reamostragem. Os metadados (inclusive GPS)
+    # não são copiados para o arquivo gravado.
+    ImageOps.exif_transpose(imagem, in_place=True)
+
+    modo = 'L' if perfil["tons_de_cinza"] else 'RGB'
+    if imagem.mode != modo:
+        imagem = imagem.convert(modo)
+
+    if perfil["forcar_retrato"] and imagem.width > imagem.height:
+        imagem = imagem.transpose(Image.Transpose.ROTATE_270)
+
+    lado = perfil["lado_maximo"]
+    if lado and max(imagem.size) > lado:
+        escala = lado / max(imagem.size)
+        tamanho = (max(1, round(imagem.width * escala)), max(1, round(imagem.height * escala)))
+        imagem = imagem.resize(tamanho, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return imagem
+
+# Função para obter o formato de gravação do perfil. Um formato sem suporte no
+# Pillow instalado (AVIF em builds antigos) cai para JPEG.
+def formato_perfil(perfil=None):
+    from PIL import features
+    formato = (perfil or PERFIL_COMPROVANTE)["formato"].upper()
+    if formato not in EXTENSOES_FORMATO:
+        raise ValueError(f"Formato de foto não suportado: {formato}")
+    if formato != "JPEG" and not features.check(formato.lower()):
+        logger.warning(f"Pillow sem suporte a {formato}; fotos gravadas como JPEG")
+        return "JPEG"
+    return formato
+
+# Função para codificar uma imagem já decodificada no formato indicado
+def _codificar_imagem(imagem, formato, qualidade):
+    buffer = io.BytesIO()
+    imagem.save(buffer, format=formato, quality=qualidade)
+    return buffer.getvalue()
+
+# Função para obter o perfil de uma versão reduzida, usado no caminho dela
+# (maior lado e qualidade, ex.: "320q80")
+def perfil_rendicao(rendicao):
+    return f"{RENDICOES[rendicao][1]}q{FOTO_QUALIDADE_RENDICOES}"
+
+# Função para obter o caminho de uma versão reduzida ("previa", "miniatura")
+# da foto: o mesmo caminho relativo, sob o subdiretório e o perfil da versão
+# (fotos/ab/cd/<hash>.webp -> fotos/miniaturas/320q80/ab/cd/<hash>.webp)
+def caminho_rendicao(caminho_foto, rendicao):
+    subdiretorio = RENDICOES[rendicao][0]
+    return os.path.join(
+        DIRETORIO_FOTOS, subdiretorio, perfil_rendicao(rendicao), os.path.relpath(caminho_foto, DIRETORIO_FOTOS)
+    )
+
+# Função para listar as versões reduzidas de uma foto no disco, de qualquer
+# perfil (as de perfis anteriores ficam até serem substituídas)
+def _rendicoes_no_disco(caminho_foto):
+    relativo = os.path.relpath(caminho_foto, DIRETORIO_FOTOS)
+    arquivos = []
+    for subdiretorio, _ in RENDICOES.values():
+        diretorio = os.path.join(DIRETORIO_FOTOS, subdiretorio)
+        if not os.path.isdir(diretorio):
+            continue
+        for perfil in os.listdir(diretorio):
+            caminho = os.path.join(diretorio, perfil, relativo)
+            if os.path.exists(caminho):
+                arquivos.append(caminho)
+    return arquivos
+
+# Função para obter o caminho de uma foto pelo conteúdo (SHA-256 dos bytes gravados)
+def caminho_por_conteudo(dados, extensao):
+    resumo = hashlib.sha256(dados).hexdigest()
+    return os.path.join(DIRETORIO_FOTOS, resumo[:2], resumo[2:4], resumo + extensao)
+
+# Função para saber se um caminho já segue o endereçamento por conteúdo (fotos
+# gravadas antes dele ficam em fotos/<id_transacao>.jpg)
+def endereco_por_conteudo(caminho_foto):
+    nome, extensao = os.path.splitext(os.path.basename(caminho_foto))
+    if len(nome) != 64 or not set(nome) <= set(string.hexdigits.lower()):
+        return False
+    return os.path.normpath(caminho_foto) == os.path.join(DIRETORIO_FOTOS, nome[:2], nome[2:4], nome + extensao)
+
+# Função para gravar as versões reduzidas a partir da imagem já decodificada.
+# Cada versão é reduzida a partir da anterior (maior), não da original.
+def _gravar_rendicoes(imagem, caminho_foto, formato, rendicoes=None):
+    from PIL import Image
+    for rendicao, (_, lado) in sorted(RENDICOES.items(), key=lambda item: -item[1][1]):
+        escala = lado / max(imagem.size)
+        if escala < 1:
+            tamanho = (max(1, round(imagem.width * escala)), max(1, round(imagem.height * escala)))
+            # reducing_gap reduz primeiro por fator inteiro (rápido) e só então reamostra
+            imagem = imagem.resize(tamanho, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        if rendicoes is None or rendicao in rendicoes:
+            _gravar_atomicamente(caminho_rendicao(caminho_foto, rendicao), _codificar_imagem(imagem, formato, FOTO_QUALIDADE_RENDICOES))
+
+# Função para gravar um arquivo de forma atômica: grava um temporário no mesmo
+# diretório e renomeia. Quem lê o caminho vê o arquivo anterior ou o novo completo.
+def _gravar_atomicamente(caminho, dados):
+    diretorio = os.path.dirname(caminho) or "."
+    os.makedirs(diretorio, exist_ok=True)
+    temporario = os.path.join(diretorio, f".{os.path.basename(caminho)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temporario, "wb") as f:
+            f.write(dados)
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        raise
+
+# Função para processar os bytes enviados com o perfil de comprovante: devolve a
+# imagem normalizada, os bytes codificados e o formato. Levanta exceção se a
+# foto for inválida.
+def _preparar_foto(foto_bytes, perfil=None):
+    perfil = perfil or PERFIL_COMPROVANTE
+    formato = formato_perfil(perfil)
+    imagem = _normalizar_imagem(foto_bytes, perfil)
+    return imagem, _codificar_imagem(imagem, formato, perfil["qualidade"]), formato
+
+# Função para obter a trava de um arquivo de foto: gravação, referência e
+# remoção do mesmo arquivo não se intercalam entre transações diferentes
+def _trava_foto(caminho_foto):
+    return _obter_processamento()["travas_fotos"][hash(os.path.normpath(caminho_foto)) % _TRAVAS_TRANSACOES]
+
+# Função para gravar a foto já codificada no seu endereço por conteúdo, se ainda
+# não existir, e devolver o caminho com a trava do arquivo obtida. Quem usa o
+# caminho (UPDATE de caminho_foto) deve fazê-lo dentro do bloco "with": assim
+# liberar_foto não remove o arquivo entre a gravação e a referência. Com
+# `resumo_envio` (SHA-256 dos bytes enviados) o envio fica associado ao arquivo.
+@contextlib.contextmanager
+def _foto_gravada(imagem, dados, formato, resumo_envio=None):
+    caminho_foto = caminho_por_conteudo(dados, EXTENSOES_FORMATO[formato])
+    with _trava_foto(caminho_foto):
+        if os.path.exists(caminho_foto):
+            # Mesmo comprovante já gravado (reenvio, outra transação)
+            estado = _obter_processamento()
+            with estado["lock"]:
+                estado["contagem"]["Repetidas"] += 1
+            with conexao_banco() as conn:
+                registrada = conn.execute("SELECT 1 FROM fotos WHERE caminho = ?", (caminho_foto,)).fetchone()
+            if registrada is None:
+                _atualizar_registro_foto(caminho_foto)
+        else:
+            # Versões reduzidas antes da original: quando a original existe, as versões também
+            _gravar_rendicoes(imagem, caminho_foto, formato)
+            _gravar_atomicamente(caminho_foto, dados)
+            resumo = os.path.splitext(os.path.basename(caminho_foto))[0]
+            with conexao_banco() as conn:
+                iniciar_escrita(conn)
+                _registrar_foto(conn, caminho_foto, resumo, len(dados), imagem.width, imagem.height, formato, list(RENDICOES))
+        if resumo_envio:
+            with conexao_banco() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO envios_fotos (hash_envio, caminho) VALUES (?, ?)", (resumo_envio, caminho_foto)
+                )
+        yield caminho_foto
+
+# Função para obter a foto já gravada a partir dos mesmos bytes enviados, com a
+# trava do arquivo obtida (como _foto_gravada). Devolve None se o envio não é
+# conhecido ou se o arquivo não está mais no disco.
+@contextlib.contextmanager
+def _foto_enviada(resumo_envio):
+    consulta = """
+        SELECT e.caminho FROM envios_fotos e JOIN fotos f ON f.caminho = e.caminho
+        WHERE e.hash_envio = ? AND f.status != ?
+    """
+    with conexao_banco() as conn:
+        registro = conn.execute(consulta, (resumo_envio, ARQUIVO_AUSENTE)).fetchone()
+    if registro is None:
+        yield None
+        return
+    caminho_foto = registro[0]
+    with _trava_foto(caminho_foto):
+        # Conferido de novo sob a trava: liberar_foto pode ter removido a foto
+        with conexao_banco() as conn:
+            registro = conn.execute(consulta, (resumo_envio, ARQUIVO_AUSENTE)).fetchone()
+        if registro is None or registro[0] != caminho_foto or not os.path.exists(caminho_foto):
+            yield None
+            return
+        estado = _obter_processamento()
+        with estado["lock"]:
+            estado["contagem"]["Repetidas"] += 1
+        yield caminho_foto
+
+# Função única de entrada de fotos (inclusão, edição e scripts): processa os
+# bytes enviados com o perfil de comprovante e grava a foto e as versões
+# reduzidas, geradas da mesma imagem decodificada. Bytes já enviados antes
+# reaproveitam a foto gravada sem processá-la. Usada como
+# "with ingerir_foto(foto_bytes) as caminho_foto:", referenciando o caminho
+# dentro do bloco. Levanta exceção se a foto for inválida; nesse caso nada é gravado.
+@contextlib.contextmanager
+def ingerir_foto(foto_bytes, perfil=None):
+    resumo_envio = hashlib.sha256(foto_bytes).hexdigest()
+    with _foto_enviada(resumo_envio) as caminho_foto:
+        if caminho_foto is not None:
+            yield caminho_foto
+            return
+    with _foto_gravada(*_preparar_foto(foto_bytes, perfil), resumo_envio) as caminho_foto:
+        yield caminho_foto
+
+# Função para remover os arquivos de uma foto (original e versões reduzidas de
+# todos os perfis). A original sai primeiro: enquanto ela existir, as versões
+# também existem. Falhas são ignoradas.
+def _remover_arquivos_foto(caminho_foto):
+    for caminho in [caminho_foto] + _rendicoes_no_disco(caminho_foto):
+        if os.path.exists(caminho):
+            try:
+                os.remove(caminho)
+            except:
+                pass
+
+# Função para informar se DIRETORIO_FOTOS pertence ao banco atual (DB_PATH). A
+# contagem de referências só enxerga as transações de um banco, então apenas o
+# banco dono da pasta apaga arquivos dela. O dono fica anotado em
+# ARQUIVO_DONO_FOTOS, gravado pelo primeiro banco que usa a pasta; para
+# transferi-la a outro banco, apague o arquivo.
+def pasta_fotos_do_banco():
+    banco = os.path.relpath(os.path.abspath(storage.DB_PATH), os.path.dirname(os.path.abspath(DIRETORIO_FOTOS)))
+    marcador = os.path.join(DIRETORIO_FOTOS, ARQUIVO_DONO_FOTOS)
+    if not os.path.exists(marcador):
+        os.makedirs(DIRETORIO_FOTOS, exist_ok=True)
+        temporario = f"{marcador}.{uuid.uuid4().hex}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(banco + "\n")
+        try:
+            # Vínculo em vez de os.replace: de dois bancos iniciando juntos, só um fica dono
+            os.link(temporario, marcador)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temporario)
+    with open(marcador, encoding="utf-8") as f:
+        dono = f.read().strip()
+    if dono != banco:
+        logger.warning(f"A pasta {DIRETORIO_FOTOS} pertence ao banco {dono}: nenhum arquivo de foto é apagado por {banco}")
+        return False
+    return True
+
+# Função para liberar uma foto que deixou de ser referenciada por uma transação
+# (exclusão, troca de foto): o registro e os arquivos só são removidos se
+# nenhuma outra transação aponta para eles. Os arquivos ficam no disco quando a
+# pasta pertence a outro banco (pasta_fotos_do_banco). Chamada após o commit
+# que retirou a referência.
+def liberar_foto(caminho_foto):
+    if not caminho_foto:
+        return False
+    try:
+        with _trava_foto(caminho_foto):
+            with conexao_banco() as conn:
+                iniciar_escrita(conn)
+                referencias = conn.execute(
+                    "SELECT COUNT(*) FROM transacoes WHERE caminho_foto = ?", (caminho_foto,)
+                ).fetchone()[0]
+                if referencias:
+                    return False
+                conn.execute("DELETE FROM fotos WHERE caminho = ?", (caminho_foto,))
+                conn.execute("DELETE FROM envios_fotos WHERE caminho = ?", (caminho_foto,))
+            if pasta_fotos_do_banco():
+                _remover_arquivos_foto(caminho_foto)
+            return True
+    except Exception as e:
+        logger.error(f"Erro ao remover a foto {caminho_foto}: {str(e)}")
+        return False
+
+# Função para gravar (ou substituir) o registro de um arquivo na tabela fotos.
+# `rendicoes` são as versões reduzidas presentes no disco; `conn` pode ser uma
+# conexão ou o cursor de uma migração.
+def _registrar_foto(conn, caminho_foto, resumo, tamanho, largura, altura, formato, rendicoes):
+    conn.execute("""
+        INSERT OR REPLACE INTO fotos
+            (caminho, hash, bytes, largura, altura, formato, caminho_previa, caminho_miniatura, status, registrada_em)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        caminho_foto, resumo, tamanho, largura, altura, formato,
+        caminho_rendicao(caminho_foto, "previa") if "previa" in rendicoes else None,
+        caminho_rendicao(caminho_foto, "miniatura") if "miniatura" in rendicoes else None,
+        ARQUIVO_OK if set(rendicoes) >= set(RENDICOES) else ARQUIVO_SEM_VERSOES,
+        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    ))
+
+# Função para registrar um arquivo a partir do disco (fotos anteriores à tabela,
+# correções): lê os bytes para o hash e só o cabeçalho da imagem para as dimensões
+def _registrar_foto_do_disco(conn, caminho_foto):
+    from PIL import Image
+    if not os.path.exists(caminho_foto):
+        conn.execute("""
+            INSERT OR REPLACE INTO fotos (caminho, status, registrada_em) VALUES (?, ?, ?)
+        """, (caminho_foto, ARQUIVO_AUSENTE, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        return
+    with open(caminho_foto, "rb") as f:
+        dados = f.read()
+    try:
+        with Image.open(io.BytesIO(dados)) as imagem:
+            largura, altura, formato = imagem.width, imagem.height, imagem.format
+    except Exception:
+        # Arquivo ilegível: registrado sem dimensões
+        largura = altura = formato = None
+    rendicoes = [r for r in RENDICOES if os.path.exists(caminho_rendicao(caminho_foto, r))]
+    _registrar_foto(conn, caminho_foto, hashlib.sha256(dados).hexdigest(), len(dados), largura, altura, formato, rendicoes)
+
+# Função para atualizar o registro de um arquivo com o que está no disco
+def _atualizar_registro_foto(caminho_foto):
+    with conexao_banco() as conn:
+        iniciar_escrita(conn)
+        _registrar_foto_do_disco(conn, caminho_foto)
+
+# Função para registrar na tabela fotos todos os arquivos referenciados pelas
+# transações (executada pela migração que cria a tabela)
+def registrar_fotos_existentes(cursor):
+    caminhos = [row[0] for row in cursor.execute(
+        "SELECT DISTINCT caminho_foto FROM transacoes WHERE caminho_foto IS NOT NULL"
+    ).fetchall()]
+    for caminho_foto in caminhos:
+        _registrar_foto_do_disco(cursor, caminho_foto)
+
+# Função para listar os arquivos de foto no disco (originais e versões
+# reduzidas). Arquivos temporários de gravações em andamento e os pendentes
+# ficam de fora.
+def _arquivos_no_disco():
+    pendentes = os.path.relpath(DIRETORIO_PENDENTES, DIRETORIO_FOTOS)
+    for diretorio, subpastas, nomes in os.walk(DIRETORIO_FOTOS):
+        if os.path.relpath(diretorio, DIRETORIO_FOTOS) == ".":
+            subpastas[:] = [p for p in subpastas if p != pendentes]
+        for nome in nomes:
+            if not nome.startswith("."):
+                yield os.path.join(diretorio, nome)
+
+# Função para obter a foto original a que um arquivo pertence (o próprio
+# caminho, ou a original de uma versão reduzida de qualquer perfil; inverso de
+# caminho_rendicao)
+def _foto_do_arquivo(caminho):
+    relativo = os.path.relpath(caminho, DIRETORIO_FOTOS)
+    raiz, _, resto = relativo.partition(os.sep)
+    if resto and raiz in {sub for sub, _ in RENDICOES.values()}:
+        return os.path.join(DIRETORIO_FOTOS, resto.partition(os.sep)[2])
+    return caminho
+
+# Função para apagar as versões reduzidas de perfis anteriores de uma foto (as
+# do perfil atual já foram gravadas ou a foto é exibida pela original). Só o
+# banco dono da pasta apaga arquivos (pasta_fotos_do_banco).
+def _remover_rendicoes_antigas(caminho_foto):
+    atuais = {caminho_rendicao(caminho_foto, r) for r in RENDICOES}
+    antigas = [caminho for caminho in _rendicoes_no_disco(caminho_foto) if caminho not in atuais]
+    if not antigas or not pasta_fotos_do_banco():
+        return
+    for caminho in antigas:
+        try:
+            os.remove(caminho)
+        except OSError as e:
+            logger.error(f"Erro ao remover a versão reduzida antiga {caminho}: {str(e)}")
+
+# Função para conferir a tabela fotos contra as transações e o disco. Devolve
+# as divergências encontradas (lista vazia = tudo confere); não altera nada.
+def verificar_fotos():
+    with conexao_banco() as conn:
+        registros = {row["caminho"]: dict(row) for row in conn.execute("SELECT * FROM fotos").fetchall()}
+        referenciadas = {row[0] for row in conn.execute(
+            "SELECT DISTINCT caminho_foto FROM transacoes WHERE caminho_foto IS NOT NULL"
+        ).fetchall()}
+    divergencias = []
+    for caminho_foto in sorted(referenciadas - registros.keys()):
+        divergencias.append({"Foto": caminho_foto, "Problema": "transação aponta para foto sem registro"})
+    for caminho_foto, registro in sorted(registros.items()):
+        if caminho_foto not in referenciadas:
+            divergencias.append({"Foto": caminho_foto, "Problema": "registro sem transação"})
+        existe = os.path.exists(caminho_foto)
+        if registro["status"] == ARQUIVO_AUSENTE:
+            if existe:
+                divergencias.append({"Foto": caminho_foto, "Problema": "registrada como ausente, mas existe"})
+            continue
+        if not existe:
+            divergencias.append({"Foto": caminho_foto, "Problema": "arquivo ausente"})
+            continue
+        if os.path.getsize(caminho_foto) != registro["bytes"]:
+            divergencias.append({"Foto": caminho_foto, "Problema": "tamanho diferente do registro"})
+        no_disco = {r for r in RENDICOES if os.path.exists(caminho_rendicao(caminho_foto, r))}
+        registradas = {r for r in RENDICOES if registro[f"caminho_{r}"]}
+        if no_disco != registradas:
+            divergencias.append({"Foto": caminho_foto, "Problema": "versões reduzidas diferentes do registro"})
+    for caminho in _arquivos_no_disco():
+        caminho_foto = _foto_do_arquivo(caminho)
+        if caminho_foto not in registros and caminho_foto not in referenciadas:
+            divergencias.append({"Foto": caminho, "Problema": "arquivo sem registro"})
+        elif caminho != caminho_foto and caminho not in {caminho_rendicao(caminho_foto, r) for r in RENDICOES}:
+            divergencias.append({"Foto": caminho, "Problema": "versão reduzida de perfil anterior"})
+    return divergencias
+
+# Função para corrigir as divergências de verificar_fotos: arquivos e registros
+# sem transação são removidos, assim como versões reduzidas de perfis
+# anteriores; os demais registros são refeitos a partir do disco. Devolve
+# quantas fotos foram corrigidas.
+def corrigir_fotos():
+    # Versão reduzida solta: a correção vale para a foto original dela
+    caminhos = {_foto_do_arquivo(divergencia["Foto"]) for divergencia in verificar_fotos()}
+    for caminho_foto in caminhos:
+        # liberar_foto só remove o que nenhuma transação referencia
+        if not liberar_foto(caminho_foto):
+            with _trava_foto(caminho_foto):
+                _remover_rendicoes_antigas(caminho_foto)
+                _atualizar_registro_foto(caminho_foto)
+    if caminhos:
+        invalidar_cache_leituras()
+    return len(caminhos)
+
+# Função para dar um segundo nome a um arquivo (hard link, sem copiar os bytes;
+# cópia atômica se o sistema de arquivos não suportar). Destino existente é mantido.
+def _vincular_arquivo(origem, destino):
+    if os.path.exists(destino):
+        return
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    try:
+        os.link(origem, destino)
+    except OSError:
+        temporario = os.path.join(os.path.dirname(destino), f".{os.path.basename(destino)}.{uuid.uuid4().hex}.tmp")
+        shutil.copyfile(origem, temporario)
+        os.replace(temporario, destino)
+
+# Função para levar as fotos gravadas antes do endereçamento por conteúdo
+# (fotos/<id_transacao>.jpg) para fotos/ab/cd/<hash>, reescrevendo caminho_foto.
+# Executada pela migração, dentro da transação dela: os arquivos novos são
+# vínculos para os antigos, e cada arquivo antigo fica anotado em fotos_legadas
+# para ser apagado depois do commit (remover_fotos_legadas). Fotos repetidas
+# passam a ser um único arquivo.
+def migrar_fotos_para_conteudo(cursor):
+    caminhos = [row[0] for row in cursor.execute(
+        "SELECT DISTINCT caminho_foto FROM transacoes WHERE caminho_foto IS NOT NULL"
+    ).fetchall()]
+    for caminho_foto in caminhos:
+        if endereco_por_conteudo(caminho_foto) or not os.path.exists(caminho_foto):
+            continue
+        with open(caminho_foto, "rb") as f:
+            caminho_novo = caminho_por_conteudo(f.read(), os.path.splitext(caminho_foto)[1].lower())
+        # Versões reduzidas antes da original (no formato antigo, sem o perfil no
+        # caminho: fotos/previas/<id_transacao>.jpg); versões ausentes são geradas
+        # depois por gerar_rendicoes_faltantes
+        antigas = {rendicao: os.path.join(DIRETORIO_FOTOS, subdiretorio, os.path.basename(caminho_foto))
+                   for rendicao, (subdiretorio, _) in RENDICOES.items()}
+        vinculos = [
+            (antigas[rendicao], caminho_rendicao(caminho_novo, rendicao))
+            for rendicao in RENDICOES if os.path.exists(antigas[rendicao])
+        ] + [(caminho_foto, caminho_novo)]
+        for antigo, novo in vinculos:
+            _vincular_arquivo(antigo, novo)
+            cursor.execute(
+                "INSERT OR REPLACE INTO fotos_legadas (caminho, caminho_novo) VALUES (?, ?)", (antigo, novo)
+            )
+        cursor.execute("UPDATE transacoes SET caminho_foto = ? WHERE caminho_foto = ?", (caminho_novo, caminho_foto))
+
+# Função para apagar os arquivos do formato antigo anotados em fotos_legadas por
+# migrar_fotos_para_conteudo, depois do commit da migração. Só esses arquivos
+# são apagados, e só quando o vínculo novo existe: a pasta nunca é varrida.
+# Arquivos que não puderam ser apagados ficam anotados para a próxima execução.
+def remover_fotos_legadas():
+    with conexao_banco() as conn:
+        legadas = conn.execute("SELECT caminho, caminho_novo FROM fotos_legadas").fetchall()
+    if not legadas or not pasta_fotos_do_banco():
+        return 0
+    removidos = 0
+    for caminho, caminho_novo in legadas:
+        if not os.path.exists(caminho_novo):
+            logger.error(f"Foto antiga {caminho} mantida: o arquivo novo {caminho_novo} não existe")
+            continue
+        try:
+            os.remove(caminho)
+            removidos += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Erro ao remover a foto antiga {caminho}: {str(e)}")
+            continue
+        with conexao_banco() as conn:
+            conn.execute("DELETE FROM fotos_legadas WHERE caminho = ?", (caminho,))
+    return removidos
+
+# Função para gerar as versões reduzidas que faltam para as fotos já gravadas
+# (fotos anteriores às versões reduzidas ou a uma mudança de perfil, cujas
+# versões antigas são apagadas). Devolve quantas fotos foram atualizadas.
+def gerar_rendicoes_faltantes():
+    from PIL import Image
+    estado = _obter_processamento()
+    with conexao_banco() as conn:
+        fotos = [row[0] for row in conn.execute(
+            "SELECT DISTINCT caminho_foto FROM transacoes WHERE caminho_foto IS NOT NULL"
+        ).fetchall()]
+    atualizadas = 0
+    for caminho_foto in fotos:
+        # Trava do arquivo: não concorre com a remoção da foto
+        with _trava_foto(caminho_foto):
+            faltando = [r for r in RENDICOES if not os.path.exists(caminho_rendicao(caminho_foto, r))]
+            if not faltando or not os.path.exists(caminho_foto):
+                continue
+            try:
+                with Image.open(caminho_foto) as imagem:
+                    imagem.load()
+                    modo = "L" if imagem.mode == "L" else "RGB"
+                    _gravar_rendicoes(imagem.convert(modo), caminho_foto, imagem.format, faltando)
+                _atualizar_registro_foto(caminho_foto)
+                # O registro já aponta para o perfil atual
+                _remover_rendicoes_antigas(caminho_foto)
+                atualizadas += 1
+            except Exception as e:
+                logger.error(f"Erro ao gerar miniaturas de {caminho_foto}: {str(e)}")
+    with estado["lock"]:
+        estado["contagem"]["Miniaturas geradas"] += atualizadas
+    if atualizadas:
+        invalidar_cache_leituras()
+    return atualizadas
+
+# Função para executar gerar_rendicoes_faltantes no pool de fotos, sem bloquear
+# quem chama (um único trabalho percorre todas as fotos)
+def agendar_rendicoes_faltantes():
+    estado = _obter_processamento()
+    futuro = estado["executor"].submit(gerar_rendicoes_faltantes)
+    with estado["lock"]:
+        estado["futuros"].add(futuro)
+    futuro.add_done_callback(lambda concluido: _descartar_futuro(estado, concluido))
+    return futuro
+
+# Função para recodificar as fotos já gravadas com o perfil de comprovante
+# (PERFIL_COMPROVANTE por padrão). Fotos já no perfil são mantidas e as demais
+# só são substituídas quando o arquivo novo é menor; com aplicar=False apenas
+# mede. Devolve o relatório por arquivo (compartilhado por "Transações").
+def recodificar_fotos(perfil=None, aplicar=True):
+    from PIL import Image
+    perfil = perfil or PERFIL_COMPROVANTE
+    formato = formato_perfil(perfil)
+    with conexao_banco() as conn:
+        fotos = conn.execute("""
+            SELECT caminho_foto, COUNT(*) FROM transacoes
+            WHERE caminho_foto IS NOT NULL GROUP BY caminho_foto ORDER BY caminho_foto
+        """).fetchall()
+    relatorio = []
+    for caminho_foto, transacoes in fotos:
+        if not os.path.exists(caminho_foto):
+            continue
+        linha = {"Foto": caminho_foto, "Transações": transacoes, "Bytes antes": os.path.getsize(caminho_foto)}
+        linha["Bytes depois"] = linha["Bytes antes"]
+        try:
+            # Foto já gravada com o perfil: recodificar só acumularia perda
+            with Image.open(caminho_foto) as atual:
+                no_perfil = (
+                    atual.format == formato
+                    and max(atual.size) <= (perfil["lado_maximo"] or max(atual.size))
+                    and (atual.mode == "L") == perfil["tons_de_cinza"]
+                )
+            if no_perfil:
+                relatorio.append(dict(linha, Situação="mantida"))
+                continue
+            with open(caminho_foto, "rb") as f:
+                imagem, dados, formato_gravado = _preparar_foto(f.read(), perfil)
+        except Exception as e:
+            logger.error(f"Erro ao recodificar {caminho_foto}: {str(e)}")
+            relatorio.append(dict(linha, Situação="erro"))
+            continue
+
+        if len(dados) >= linha["Bytes antes"]:
+            relatorio.append(dict(linha, Situação="mantida"))
+            continue
+        linha["Bytes depois"] = len(dados)
+        if not aplicar:
+            relatorio.append(dict(linha, Situação="a recodificar"))
+            continue
+        with _foto_gravada(imagem, dados, formato_gravado) as caminho_novo:
+            with conexao_banco() as conn:
+                iniciar_escrita(conn)
+                conn.execute(
+                    "UPDATE transacoes SET caminho_foto = ? WHERE caminho_foto = ?", (caminho_novo, caminho_foto)
+                )
+                # Reenvios dos mesmos bytes passam a usar a foto recodificada
+                conn.execute("UPDATE envios_fotos SET caminho = ? WHERE caminho = ?", (caminho_novo, caminho_foto))
+        liberar_foto(caminho_foto)
+        relatorio.append(dict(linha, Foto=caminho_novo, Situação="recodificada"))
+    if aplicar:
+        invalidar_cache_leituras()
+    return relatorio
+
+# Função para resumir o relatório de recodificar_fotos (totais e economia)
+def resumir_recodificacao(relatorio):
+    antes = sum(linha["Bytes antes"] for linha in relatorio)
+    depois = sum(linha["Bytes depois"] for linha in relatorio)
+    return {
+        "Fotos": len(relatorio),
+        "Recodificadas": sum(linha["Situação"] in ("recodificada", "a recodificar") for linha in relatorio),
+        "Bytes antes": antes,
+        "Bytes depois": depois,
+        "Bytes economizados": antes - depois,
+        "Economia (%)": round(100 * (antes - depois) / antes, 1) if antes else 0.0,
+    }
+
+# Função para retirar um trabalho concluído da lista usada por aguardar_fotos
+def _descartar_futuro(estado, futuro):
+    with estado["lock"]:
+        estado["futuros"].discard(futuro)
+
+# Função para ler os bytes de um arquivo enviado (com read ou getvalue)
+def ler_bytes_foto(foto):
+    if hasattr(foto, 'getvalue'):
+        return foto.getvalue()
+    return foto.read()
+
+# Estado do processamento em segundo plano, um por processo
+@functools.cache
+def _obter_processamento():
+    return {
+        "executor": concurrent.futures.ThreadPoolExecutor(
+            max_workers=FOTOS_TRABALHADORES, thread_name_prefix="tripledger-fotos"
+        ),
+        "vagas": threading.BoundedSemaphore(FOTOS_FILA_MAXIMA),
+        "lock": threading.Lock(),
+        "travas": [threading.Lock() for _ in range(_TRAVAS_TRANSACOES)],
+        "travas_fotos": [threading.Lock() for _ in range(_TRAVAS_TRANSACOES)],
+        # Arquivo pendente mais recente de cada transação: um envio mais novo
+        # torna os anteriores obsoletos, mesmo que ainda estejam na fila
+        "ultimo": {},
+        "futuros": set(),
+        "contagem": Counter(),
+    }
+
+# Função para guardar os bytes da foto enviada como pendentes, sem decodificar a
+# imagem. Chamada antes do commit da transação; devolve o arquivo pendente (ou
+# None se não havia bytes ou não foi possível gravar).
+def preparar_foto_transacao(id_transacao, foto):
+    try:
+        foto_bytes = ler_bytes_foto(foto)
+        if not foto_bytes:
+            return None
+        arquivo = os.path.join(DIRETORIO_PENDENTES, f"{id_transacao}__{uuid.uuid4().hex}")
+        # Gravação atômica: a retomada nunca vê um arquivo pela metade
+        _gravar_atomicamente(arquivo, foto_bytes)
+        return arquivo
+    except Exception as e:
+        logger.error(f"Erro ao processar o upload da foto: {str(e)}")
+        return None
+
+# Função para agendar o processamento de uma foto pendente (após o commit da
+# transação). Com a fila cheia a foto é processada na própria chamada.
+def agendar_foto_transacao(id_transacao, arquivo_pendente):
+    estado = _obter_processamento()
+    with estado["lock"]:
+        estado["ultimo"][id_transacao] = arquivo_pendente
+    if not estado["vagas"].acquire(blocking=False):
+        _processar_foto_pendente(id_transacao, arquivo_pendente)
+        return None
+    futuro = estado["executor"].submit(_processar_foto_pendente, id_transacao, arquivo_pendente)
+    with estado["lock"]:
+        estado["futuros"].add(futuro)
+
+    def liberar(concluido):
+        estado["vagas"].release()
+        _descartar_futuro(estado, concluido)
+
+    futuro.add_done_callback(liberar)
+    return futuro
+
+# Função executada pelo pool: processa a foto pendente, grava caminho_foto e
+# status_foto da transação e remove o arquivo pendente
+def _processar_foto_pendente(id_transacao, arquivo_pendente):
+    estado = _obter_processamento()
+    with estado["travas"][hash(id_transacao) % _TRAVAS_TRANSACOES]:
+        try:
+            with estado["lock"]:
+                obsoleto = estado["ultimo"].get(id_transacao, arquivo_pendente) != arquivo_pendente
+            if obsoleto or not os.path.exists(arquivo_pendente):
+                with estado["lock"]:
+                    estado["contagem"]["Descartadas"] += 1
+                return
+
+            with conexao_banco() as conn:
+                existe = conn.execute(
+                    "SELECT 1 FROM transacoes WHERE id_transacao = ?", (id_transacao,)
+                ).fetchone()
+            if existe is None:
+                # Transação excluída antes do processamento
+                with estado["lock"]:
+                    estado["contagem"]["Descartadas"] += 1
+                return
+
+            with open(arquivo_pendente, "rb") as f:
+                foto_bytes = f.read()
+            # Foto inválida: ingerir_foto levanta exceção e a transação mantém a
+            # foto anterior (se houver), com status_foto "erro"
+            with ingerir_foto(foto_bytes) as caminho_foto:
+                with conexao_banco() as conn:
+                    iniciar_escrita(conn)
+                    # Foto anterior lida na mesma transação da escrita: é ela que
+                    # deixa de ser referenciada
+                    registro = conn.execute(
+                        "SELECT caminho_foto FROM transacoes WHERE id_transacao = ?", (id_transacao,)
+                    ).fetchone()
+                    if registro is not None:
+                        conn.execute(
+                            "UPDATE transacoes SET caminho_foto = ?, status_foto = ? WHERE id_transacao = ?",
+                            (caminho_foto, FOTO_PRONTA, id_transacao)
+                        )
+            invalidar_cache_leituras()
+            if registro is None:
+                # Transação excluída durante o processamento: a foto ficaria órfã
+                liberar_foto(caminho_foto)
+            elif registro["caminho_foto"] != caminho_foto:
+                liberar_foto(registro["caminho_foto"])
+            with estado["lock"]:
+                estado["contagem"]["Processadas"] += 1
+        except Exception as e:
+            logger.error(f"Erro ao processar a foto da transação {id_transacao}: {str(e)}")
+            with estado["lock"]:
+                estado["contagem"]["Com erro"] += 1
+            try:
+                with conexao_banco() as conn:
+                    conn.execute(
+                        "UPDATE transacoes SET status_foto = ? WHERE id_transacao = ?", (FOTO_ERRO, id_transacao)
+                    )
+                invalidar_cache_leituras()
+            except Exception:
+                pass
+        finally:
+            with estado["lock"]:
+                if estado["ultimo"].get(id_transacao) == arquivo_pendente:
+                    del estado["ultimo"][id_transacao]
+            try:
+                os.remove(arquivo_pendente)
+            except OSError:
+                pass
+
+# Função para agendar de novo as fotos que ficaram pendentes (processo encerrado
+# antes do processamento). Para cada transação vale o envio mais recente. Os
+# pendentes são do banco dono da pasta (pasta_fotos_do_banco): outro banco não
+# os encontraria e os descartaria.
+def retomar_fotos_pendentes():
+    if not os.path.isdir(DIRETORIO_PENDENTES) or not pasta_fotos_do_banco():
+        return 0
+    mais_recentes = {}
+    for nome in os.listdir(DIRETORIO_PENDENTES):
+        arquivo = os.path.join(DIRETORIO_PENDENTES, nome)
+        if nome.endswith(".tmp") or "__" not in nome:
+            # Gravação interrompida: a transação nunca foi confirmada com esta foto
+            os.remove(arquivo)
+            continue
+        id_transacao = nome.split("__", 1)[0]
+        anterior = mais_recentes.get(id_transacao)
+        if anterior is None or os.path.getmtime(arquivo) >= os.path.getmtime(anterior):
+            if anterior is not None:
+                os.remove(anterior)
+            mais_recentes[id_transacao] = arquivo
+        else:
+            os.remove(arquivo)
+    for id_transacao, arquivo in mais_recentes.items():
+        agendar_foto_transacao(id_transacao, arquivo)
+    return len(mais_recentes)
+
+# Função para esperar o fim das fotos agendadas (scripts de lote, encerramento).
+# Devolve True se a fila esvaziou dentro do prazo.
+def aguardar_fotos(timeout=None):
+    estado = _obter_processamento()
+    with estado["lock"]:
+        futuros = list(estado["futuros"])
+    _, pendentes = concurrent.futures.wait(futuros, timeout=timeout)
+    return not pendentes
+
+# Função para obter as estatísticas do processamento de fotos (exibidas na manutenção)
+def estatisticas_fotos():
+    estado = _obter_processamento()
+    with estado["lock"]:
+        return {
+            "Na fila": len(estado["futuros"]),
+            "Processadas": estado["contagem"]["Processadas"],
+            "Com erro": estado["contagem"]["Com erro"],
+            "Descartadas": estado["contagem"]["Descartadas"],
+            "Repetidas": estado["contagem"]["Repetidas"],
+            "Miniaturas geradas": estado["contagem"]["Miniaturas geradas"],
+        }
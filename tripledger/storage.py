@@ -0,0 +1,218 @@
+"""
+Armazenamento: conexões SQLite (pool por thread), cache de leituras validado
+pelo contador de alterações e backups do arquivo de banco.
+
+O caminho do banco é lido de DB_PATH a cada conexão nova; scripts de lote podem
+apontá-lo para outra cópia antes da primeira consulta (storage.DB_PATH = ...).
+"""
+import functools
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Configuração do banco de dados SQLite
+DB_PATH = "dados.db"
+
+# Ajustes aplicados a cada conexão do pool
+DB_TIMEOUT_SEGUNDOS = 30          # espera máxima do sqlite3 por um lock
+DB_BUSY_TIMEOUT_MS = 10000        # espera do próprio SQLite antes de "database is locked"
+DB_CACHE_KIB = 20000              # cache de páginas por conexão (~20 MB)
+DB_MMAP_BYTES = 256 * 1024 * 1024 # leitura via mmap de até 256 MB do arquivo
+DB_POOL_TAMANHO = 8               # conexões ociosas mantidas no pool
+
+# Cache de leituras (transações, saldos, DataFrames) compartilhado entre sessões
+CACHE_LEITURAS_TAMANHO = 64       # entradas mantidas (as menos usadas saem primeiro)
+
+# Estado do pool de conexões (fila de conexões livres + conexão emprestada por thread),
+# um por arquivo de banco e por processo. Fica no módulo, que é importado uma vez:
+# sobrevive aos reruns do Streamlit e serve igualmente a scripts de lote.
+@functools.cache
+def _obter_estado_conexoes(db_path):
+    return {"pool": queue.LifoQueue(maxsize=DB_POOL_TAMANHO), "local": threading.local()}
+
+# Função para abrir uma conexão nova já configurada (WAL, busy_timeout, cache, mmap)
+def _abrir_conexao(db_path):
+    conn = sqlite3.connect(db_path, timeout=DB_TIMEOUT_SEGUNDOS, check_same_thread=False)
+    # Resultados acessíveis por nome (row["coluna"]) e por índice (row[0])
+    conn.row_factory = sqlite3.Row
+    # WAL permite que o supervisor leia enquanto colaboradores gravam
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    # Em WAL, NORMAL continua seguro contra corrupção e evita um fsync por commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA cache_size=-{DB_CACHE_KIB}")
+    conn.execute(f"PRAGMA mmap_size={DB_MMAP_BYTES}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+@contextmanager
+def conexao_banco():
+    """
+    Empresta uma conexão do pool para a thread atual.
+
+    Uso: `with conexao_banco() as conn: ...`. Ao sair do bloco sem erro é feito
+    commit; com erro, rollback. Chamadas aninhadas na mesma thread reutilizam a
+    mesma conexão e a mesma transação: apenas o bloco mais externo faz commit e
+    devolve a conexão ao pool.
+    """
+    estado = _obter_estado_conexoes(DB_PATH)
+    local = estado["local"]
+    conn = getattr(local, "conn", None)
+    if conn is not None:
+        # Já existe uma conexão emprestada para esta thread: reutilizar
+        yield conn
+        return
+
+    try:
+        conn = estado["pool"].get_nowait()
+    except queue.Empty:
+        conn = _abrir_conexao(DB_PATH)
+    local.conn = conn
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        local.conn = None
+        # Devolver ao pool; se já estiver cheio, fechar a conexão excedente
+        try:
+            estado["pool"].put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+# Função para iniciar uma transação de escrita já com o lock reservado.
+# Sem isso a transação começa como leitura e pode falhar ao tentar virar escrita
+# quando outro processo grava ao mesmo tempo ("database is locked").
+def iniciar_escrita(conn):
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+# Cache de leituras do processo. Cada entrada guarda a versão dos dados em que foi
+# lida: o contador da tabela contador_alteracoes, incrementado por triggers a cada
+# escrita em transacoes/saldos/fotos, feita por este ou por qualquer outro processo.
+# Um rerun sem escritas só lê o contador; após uma escrita a entrada é recarregada.
+@functools.cache
+def _obter_cache_leituras():
+    return {
+        "lock": threading.Lock(),
+        "versao": None,
+        "entradas": OrderedDict(),
+        "acertos": 0,
+        "falhas": 0,
+    }
+
+# Função para ler a versão atual dos dados (consulta de uma linha)
+def versao_dados():
+    with conexao_banco() as conn:
+        return conn.execute("SELECT versao FROM contador_alteracoes WHERE id = 1").fetchone()[0]
+
+# Função para ler `chave` do cache ou, se ausente/desatualizada, executar
+# `carregar()` e guardar o resultado. O valor é compartilhado entre sessões e
+# não deve ser modificado por quem o recebe.
+def ler_com_cache(chave, carregar):
+    # A versão é lida ANTES da carga: se outra escrita ocorrer durante a leitura,
+    # a entrada fica marcada com a versão antiga e é recarregada na próxima chamada
+    versao = versao_dados()
+    cache = _obter_cache_leituras()
+    with cache["lock"]:
+        if cache["versao"] != versao:
+            # Os dados mudaram: nenhuma entrada guardada serve mais
+            cache["versao"] = versao
+            cache["entradas"].clear()
+        entrada = cache["entradas"].get(chave)
+        if entrada is not None and entrada[0] == versao:
+            cache["entradas"].move_to_end(chave)
+            cache["acertos"] += 1
+            return entrada[1]
+        cache["falhas"] += 1
+
+    valor = carregar()
+
+    with cache["lock"]:
+        if cache["versao"] == versao:
+            cache["entradas"][chave] = (versao, valor)
+            cache["entradas"].move_to_end(chave)
+            while len(cache["entradas"]) > CACHE_LEITURAS_TAMANHO:
+                cache["entradas"].popitem(last=False)
+    return valor
+
+# Função para descartar as entradas do cache de leituras. Chamada após cada escrita
+# confirmada, apenas para liberar memória: o contador já as tornou desatualizadas.
+def invalidar_cache_leituras():
+    cache = _obter_cache_leituras()
+    with cache["lock"]:
+        cache["entradas"].clear()
+
+# Função para obter as estatísticas do cache de leituras (exibidas na manutenção)
+def estatisticas_cache_leituras():
+    cache = _obter_cache_leituras()
+    with cache["lock"]:
+        total = cache["acertos"] + cache["falhas"]
+        return {
+            "Versão dos dados": cache["versao"],
+            "Entradas": len(cache["entradas"]),
+            "Acertos": cache["acertos"],
+            "Falhas": cache["falhas"],
+            "Taxa de acerto": f"{cache['acertos'] / total:.0%}" if total else "-",
+        }
+
+# Função para limpar backups antigos
+def limpar_backups_antigos():
+    try:
+        backup_dir = "backups"
+        if os.path.exists(backup_dir):
+            # Listar todos os arquivos de backup
+            backups = [f for f in os.listdir(backup_dir) if f.startswith("dados_backup_")]
+            # Ordenar por data (mais recentes primeiro)
+            backups.sort(reverse=True)
+            
+            # Manter apenas os últimos 14 backups (1 semana de backups duas vezes ao dia)
+            for backup in backups[14:]:
+                os.remove(os.path.join(backup_dir, backup))
+    except Exception as e:
+        logger.error(f"Erro ao limpar backups antigos: {str(e)}")
+
+# Função para criar backup do banco de dados
+def criar_backup_banco_dados():
+    try:
+        hora_atual = datetime.now().hour
+        minuto_atual = datetime.now().minute
+        
+        # Só fazer backup às 12h e 00h
+        if hora_atual in [0, 12] and minuto_atual < 5:  # Nos primeiros 5 minutos da hora
+            backup_dir = "backups"
+            if not os.path.exists(backup_dir):
+                os.makedirs(backup_dir)
+                
+            # Usar apenas data e hora no nome do arquivo
+            timestamp = datetime.now().strftime("%Y%m%d_%H00")
+            backup_path = os.path.join(backup_dir, f"dados_backup_{timestamp}.db")
+            
+            # Verificar se já existe backup dessa hora
+            if not os.path.exists(backup_path) and os.path.exists(DB_PATH):
+                # Criar uma cópia consistente do banco de dados. Em modo WAL o arquivo
+                # principal pode não conter os últimos commits, então uma cópia do
+                # arquivo não serve: usar a API de backup do SQLite.
+                destino = sqlite3.connect(backup_path)
+                try:
+                    with conexao_banco() as conn:
+                        conn.backup(destino)
+                finally:
+                    destino.close()
+                # Limpar backups antigos após criar um novo
+                limpar_backups_antigos()
+                return True
+                
+        return True  # Retorna True mesmo quando não faz backup para não gerar erros
+    except Exception as e:
+        logger.error(f"Erro ao criar backup: {str(e)}")
+        return False